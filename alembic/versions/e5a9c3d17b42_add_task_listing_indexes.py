@@ -0,0 +1,46 @@
+"""add task listing indexes
+
+Revision ID: e5a9c3d17b42
+Revises: c4f1a8e27d3b
+Create Date: 2026-10-16 15:40:18.227604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3d17b42'
+down_revision: Union[str, Sequence[str], None] = 'c4f1a8e27d3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('created_at', sa.DateTime(timezone=True), nullable=True))
+    # Existing tasks take their creation time from metadata; tasks without one sort as now.
+    op.execute(
+        "UPDATE tasks SET created_at = COALESCE("
+        "(SELECT task_metadata.created_at FROM task_metadata"
+        " WHERE task_metadata.task_id = tasks.id), CURRENT_TIMESTAMP)"
+    )
+    op.alter_column('tasks', 'created_at', nullable=False)
+    # The composite index starts with user_id, so the single-column index is redundant.
+    op.drop_index(op.f('ix_tasks_user_id'), table_name='tasks')
+    op.create_index(
+        'ix_tasks_user_id_created_at_id', 'tasks', ['user_id', 'created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_task_statuses_state_task_id', 'task_statuses', ['state', 'task_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_statuses_state_task_id', table_name='task_statuses')
+    op.drop_index('ix_tasks_user_id_created_at_id', table_name='tasks')
+    op.create_index(op.f('ix_tasks_user_id'), 'tasks', ['user_id'], unique=False)
+    op.drop_column('tasks', 'created_at')
@@ -0,0 +1,80 @@
+"""
+Measure API-side CPU per status event: stream decode plus TaskEventHandler.
+
+Compares the default validating path with trusted-producer mode. Events are
+handled in consumer batches of ``--batch`` events, and the handler's buffered
+status writes are flushed after each one, as the stream consumer does.
+Run from the repository root:
+
+    python -m benchmarks.status_handling [--events N] [--codec VERSION] [--batch N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from src.app.application.handlers import TaskEventHandler
+from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.infrastructure.streams.serializers import CODEC_JSON, decode_event, encode_event
+
+
+class _NullStorage:
+    async def update_task_status(self, task_id, status, metadata=None, seq=None) -> bool:
+        return True
+
+    async def update_task_statuses(self, updates) -> set[str]:
+        return {update.task_id for update in updates}
+
+
+class _NullBroadcaster:
+    async def broadcast_status(self, event: TaskEvent) -> None:
+        return None
+
+
+def _encoded_events(count: int, codec: int) -> list[dict]:
+    encoded = []
+    for index in range(count):
+        status = TaskStatus(
+            state=TaskState.RUNNING,
+            progress=TaskProgress(current=index, total=count, percentage=index / count),
+            message="computing digits",
+            metrics={"digits_per_second": 1234.5},
+        )
+        event = TaskEvent.status(f"task-{index % 64}", status, seq=index)
+        encoded.append(encode_event(event, codec))
+    return encoded
+
+
+async def _measure(encoded: list[dict], trusted: bool, batch: int) -> float:
+    handler = TaskEventHandler(
+        storage=_NullStorage(),  # type: ignore[arg-type]
+        broadcaster=_NullBroadcaster(),  # type: ignore[arg-type]
+        trusted_events=trusted,
+    )
+    start = time.process_time()
+    for offset in range(0, len(encoded), batch):
+        for fields in encoded[offset : offset + batch]:
+            await handler.handle_status_event(decode_event(fields, trusted=trusted))
+        await handler.end_batch()
+    return (time.process_time() - start) / len(encoded) * 1e6
+
+
+def run(count: int, codec: int, batch: int) -> None:
+    encoded = _encoded_events(count, codec)
+    print(f"{count} status events, codec version {codec}, batches of {batch}")
+    for label, trusted in (("validated", False), ("trusted", True)):
+        per_event_us = asyncio.run(_measure(encoded, trusted, batch))
+        print(f"{label:>10}: {per_event_us:8.2f} us/event")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--codec", type=int, default=CODEC_JSON)
+    parser.add_argument("--batch", type=int, default=10)
+    arguments = parser.parse_args()
+    run(arguments.events, arguments.codec, arguments.batch)
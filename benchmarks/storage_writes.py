@@ -0,0 +1,110 @@
+"""
+Measure status writes per second: ORM read-modify-write, single-statement and bulk upserts.
+
+The ORM path is the former implementation (task lookup, locked status read,
+merge); the upsert path is ``PostgresStorageRepository.update_task_status``
+and the bulk path writes one status per task with ``update_task_statuses``.
+Point it at a scratch database; tables are created if missing and the
+benchmark tasks are left behind. Run from the repository root:
+
+    python -m benchmarks.storage_writes --database-url postgresql+asyncpg://... [--writes N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+
+from src.app.domain.models.payloads import ComputePiPayload
+from src.app.domain.models.status_update import StatusUpdate
+from src.app.domain.models.task import Task
+from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.domain.models.task_type import TaskType
+from src.app.infrastructure.postgres.mappers import OrmMapper
+from src.app.infrastructure.postgres.orm import Base, PostgresOrm, TaskRow, TaskStatusRow
+from src.app.infrastructure.postgres.repositories import PostgresStorageRepository
+
+TASKS = 64
+
+
+async def _orm_update_task_status(
+    orm: PostgresOrm,
+    task_id: str,
+    status: TaskStatus,
+    seq: int,
+) -> bool:
+    async with orm.session_factory() as session:
+        async with session.begin():
+            if await session.get(TaskRow, task_id) is None:
+                raise LookupError(task_id)
+            current = await session.execute(
+                select(TaskStatusRow.seq).where(TaskStatusRow.task_id == task_id).with_for_update()
+            )
+            current_seq = current.scalar_one_or_none()
+            if current_seq is not None and seq <= current_seq:
+                return False
+            await session.merge(OrmMapper.to_status_row(task_id, status, seq))
+    return True
+
+
+async def _measure(database_url: str, writes: int) -> None:
+    orm = PostgresOrm(database_url)
+    async with orm.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    repository = PostgresStorageRepository(orm)
+    task_ids = [
+        await repository.create_task(
+            "benchmark",
+            Task(
+                task_type=TaskType.COMPUTE_PI,
+                payload=ComputePiPayload(digits=10),
+                status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+                metadata=TaskMetadata(created_at=datetime.now(tz=UTC)),
+            ),
+        )
+        for _ in range(TASKS)
+    ]
+
+    async def orm_write(task_id: str, status: TaskStatus, seq: int) -> bool:
+        return await _orm_update_task_status(orm, task_id, status, seq)
+
+    async def upsert_write(task_id: str, status: TaskStatus, seq: int) -> bool:
+        return await repository.update_task_status(task_id, status, seq=seq)
+
+    pending: list[StatusUpdate] = []
+
+    async def bulk_write(task_id: str, status: TaskStatus, seq: int) -> bool:
+        pending.append(StatusUpdate(task_id=task_id, status=status, seq=seq))
+        if len(pending) == TASKS:
+            await repository.update_task_statuses(pending)
+            pending.clear()
+        return True
+
+    seq = 0
+    print(f"{writes} status writes over {TASKS} tasks")
+    for label, write in (("orm", orm_write), ("upsert", upsert_write), ("bulk", bulk_write)):
+        start = time.perf_counter()
+        for index in range(writes):
+            seq += 1
+            status = TaskStatus(
+                state=TaskState.RUNNING,
+                progress=TaskProgress(current=index, total=writes, percentage=index / writes),
+            )
+            await write(task_ids[index % TASKS], status, seq)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>7}: {writes / elapsed:10.1f} writes/s")
+    await orm.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--writes", type=int, default=5000)
+    arguments = parser.parse_args()
+    asyncio.run(_measure(arguments.database_url, arguments.writes))
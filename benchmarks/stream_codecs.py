@@ -0,0 +1,76 @@
+"""
+Compare TaskEvent stream codecs: bytes per event and encode/decode CPU time.
+
+Run from the repository root:
+
+    python -m benchmarks.stream_codecs [--events N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.infrastructure.streams.serializers import (
+    CODEC_JSON,
+    CODEC_MSGPACK,
+    decode_event,
+    encode_event,
+)
+
+
+def _sample_events(count: int) -> list[TaskEvent]:
+    events: list[TaskEvent] = []
+    for index in range(count):
+        status = TaskStatus(
+            state=TaskState.RUNNING,
+            progress=TaskProgress(current=index, total=count, percentage=index / count),
+            message="computing digits",
+            metrics={"digits_per_second": 1234.5},
+        )
+        events.append(TaskEvent.status(f"task-{index % 64}", status, seq=index))
+        if index % 4 == 0:
+            events.append(TaskEvent.result_chunk(f"task-{index % 64}", str(index), "1415926535" * 8))
+    return events
+
+
+def _as_raw(fields: dict) -> dict[bytes, bytes]:
+    """Turn encoded fields into what XREADGROUP returns without response decoding."""
+    return {
+        key.encode(): value if isinstance(value, bytes) else str(value).encode()
+        for key, value in fields.items()
+    }
+
+
+def _entry_size(fields: dict[bytes, bytes]) -> int:
+    return sum(len(key) + len(value) for key, value in fields.items())
+
+
+def run(count: int) -> None:
+    events = _sample_events(count)
+    print(f"{len(events)} events")
+    print(f"{'codec':>8} {'bytes/event':>12} {'encode us':>10} {'decode us':>10}")
+    for name, version in (("json", CODEC_JSON), ("msgpack", CODEC_MSGPACK)):
+        start = time.process_time()
+        encoded = [encode_event(event, version) for event in events]
+        encode_s = time.process_time() - start
+
+        raw = [_as_raw(fields) for fields in encoded]
+        start = time.process_time()
+        for fields in raw:
+            decode_event(fields)
+        decode_s = time.process_time() - start
+
+        size = sum(_entry_size(fields) for fields in raw) / len(raw)
+        encode_us = encode_s / len(events) * 1e6
+        decode_us = decode_s / len(events) * 1e6
+        print(f"{name:>8} {size:>12.1f} {encode_us:>10.2f} {decode_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=20000)
+    run(parser.parse_args().events)
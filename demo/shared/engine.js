@@ -62,13 +62,15 @@ export class StreamingEngine {
     this.onError = onError;
     this.onClose = onClose;
     this.socket = null;
+    this._pendingChunk = null;
     this.startTime = performance.now();
   }
 
   start() {
     this.socket = this.wsClient.connect({
       taskId: this.taskId,
-      onMessage: (data) => this._handleMessage(data),
+      onMessage: (data, wireBytes) => this._handleMessage(data, wireBytes),
+      onBinary: (data, wireBytes) => this._handleBinary(data, wireBytes),
       onOpen: this.onOpen,
       onError: this.onError,
       onClose: this.onClose,
@@ -79,9 +81,9 @@ export class StreamingEngine {
     this.socket?.close();
   }
 
-  _handleMessage(raw) {
+  _handleMessage(raw, wireBytes = raw.length) {
     this.state.metrics.messages += 1;
-    this.state.metrics.bytes += raw.length;
+    this.state.metrics.bytes += wireBytes;
     if (!this.state.metrics.firstUpdateMs) {
       this.state.metrics.firstUpdateMs = performance.now() - this.startTime;
     }
@@ -95,14 +97,12 @@ export class StreamingEngine {
       applyStreamingStatus(this.state, message.payload?.status);
     }
     if (message.type === "task.result_chunk") {
-      const payload = message.payload;
-      if (this.onResultChunk) {
-        this.onResultChunk(payload, this.state);
-      }
-      if (payload?.is_last) {
-        this.state.completed = true;
-        this.state.metrics.totalMs = performance.now() - this.startTime;
+      if (message.payload?.encoding === "binary") {
+        // The chunk bytes arrive in the next binary frame.
+        this._pendingChunk = message.payload;
+        return;
       }
+      this._applyResultChunk(message.payload);
     }
     if (message.type === "task.result") {
       if (this.onResult) {
@@ -115,6 +115,26 @@ export class StreamingEngine {
       this.onUpdate();
     }
   }
+
+  _handleBinary(buffer, wireBytes) {
+    this.state.metrics.bytes += wireBytes;
+    const payload = { ...this._pendingChunk, data: buffer };
+    this._pendingChunk = null;
+    this._applyResultChunk(payload);
+    if (this.onUpdate) {
+      this.onUpdate();
+    }
+  }
+
+  _applyResultChunk(payload) {
+    if (this.onResultChunk) {
+      this.onResultChunk(payload, this.state);
+    }
+    if (payload?.is_last) {
+      this.state.completed = true;
+      this.state.metrics.totalMs = performance.now() - this.startTime;
+    }
+  }
 }
 
 export class PollingEngine {
@@ -55,14 +55,31 @@ export async function postJson(url, body, { onError } = {}) {
   }
 }
 
+// Leading byte of every binary frame sent by the API.
+const FRAME_COMPRESSED_JSON = 0x01;
+const FRAME_BINARY_CHUNK = 0x02;
+
+const inflate = async (buffer) => {
+  const stream = new Blob([buffer]).stream().pipeThrough(new DecompressionStream("deflate"));
+  return new Response(stream).text();
+};
+
 export class WsClient {
-  constructor(base = WS_BASE, { keepaliveMs = 1000 } = {}) {
+  constructor(
+    base = WS_BASE,
+    { keepaliveMs = 1000, compression = typeof DecompressionStream !== "undefined" } = {},
+  ) {
     this.base = base;
     this.keepaliveMs = keepaliveMs;
+    this.compression = compression;
   }
 
-  connect({ taskId, onMessage, onOpen, onError, onClose }) {
-    const ws = new WebSocket(`${this.base}/ws/tasks/${taskId}`);
+  connect({ taskId, onMessage, onBinary, onOpen, onError, onClose }) {
+    const query = this.compression ? "?compression=zlib" : "";
+    const ws = new WebSocket(`${this.base}/ws/tasks/${taskId}${query}`);
+    ws.binaryType = "arraybuffer";
+    // Compressed frames inflate asynchronously; chain them to keep message order.
+    let delivered = Promise.resolve();
     const keepalive = setInterval(() => {
       if (ws.readyState === WebSocket.OPEN) {
         ws.send("ping");
@@ -72,7 +89,24 @@ export class WsClient {
       ws.addEventListener("open", onOpen);
     }
     if (onMessage) {
-      ws.addEventListener("message", (event) => onMessage(event.data));
+      ws.addEventListener("message", (event) => {
+        const { data } = event;
+        delivered = delivered.then(async () => {
+          if (typeof data === "string") {
+            onMessage(data, data.length);
+            return;
+          }
+          const frameType = new Uint8Array(data, 0, 1)[0];
+          const body = data.slice(1);
+          if (frameType === FRAME_BINARY_CHUNK) {
+            onBinary?.(body, data.byteLength);
+          } else if (frameType === FRAME_COMPRESSED_JSON) {
+            onMessage(await inflate(body), data.byteLength);
+          } else {
+            throw new Error(`Unknown WebSocket frame type ${frameType}`);
+          }
+        }).catch((error) => onError?.(error));
+      });
     }
     if (onError) {
       ws.addEventListener("error", onError);
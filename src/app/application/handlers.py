@@ -1,12 +1,16 @@
 import logging
 import time
+from dataclasses import dataclass
 from functools import wraps
 
 import inject
 from typing import cast
 
 from src.app.application.broadcaster import TaskStatusBroadcaster
+from src.app.application.state_table import TaskStateTable
+from src.app.application.status_buffer import StatusWriteBuffer
 from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.models.status_update import StatusUpdate
 from src.app.domain.models.task_result import TaskResult
 from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
@@ -25,18 +29,31 @@ def ws_cpu_meter(func):
             return await func(self, event)
         finally:
             elapsed_ms = (time.process_time() - start) * 1000
-            total_ms = self._cpu_ws_total_ms.get(event.task_id, 0.0) + elapsed_ms
-            self._cpu_ws_total_ms[event.task_id] = total_ms
-            if event.type == event.type.TASK_STATUS:
-                status_payload = event.payload.get("status")
-                if isinstance(status_payload, dict):
-                    state = status_payload.get("state")
-                    if state in _TERMINAL_STATES:
-                        self._cpu_ws_total_ms.pop(event.task_id, None)
+            status_payload = event.payload.get("status")
+            if (
+                event.type == event.type.TASK_STATUS
+                and isinstance(status_payload, dict)
+                and status_payload.get("state") in _TERMINAL_STATES
+            ):
+                # Finished tasks keep only their last seq as a tombstone, so late or
+                # reclaimed statuses are not broadcast again after completion.
+                tracking = self._task_state.pop(event.task_id)
+                if tracking is not None and tracking.seq is not None:
+                    self._task_state.set(event.task_id, _TaskTracking(seq=tracking.seq))
+            else:
+                self._task_state.get_or_create(event.task_id, _TaskTracking).cpu_ms += elapsed_ms
 
     return wrapper
 
 
+@dataclass(slots=True)
+class _TaskTracking:
+    """What the handler remembers about a running task."""
+    persisted_pct: float | None = None
+    seq: int | None = None
+    cpu_ms: float = 0.0
+
+
 class TaskEventHandler:
     """Apply task events to storage and broadcast to clients."""
     def __init__(
@@ -44,41 +61,92 @@ class TaskEventHandler:
         storage: StorageRepository | None = None,
         broadcaster: TaskStatusBroadcaster | None = None,
         status_delta: float = 0.02,
+        trusted_events: bool = False,
+        status_flush_interval_s: float = 0.0,
+        task_state_capacity: int = 100_000,
+        task_state_ttl_s: float | None = 3600.0,
     ) -> None:
         self._storage = storage or cast(StorageRepository, inject.instance(StorageRepository))
         self._broadcaster = broadcaster or cast(
             TaskStatusBroadcaster, inject.instance(TaskStatusBroadcaster)
         )
         self._status_delta = status_delta
-        self._status_cache: dict[str, float] = {}
-        self._cpu_ws_total_ms: dict[str, float] = {}
+        # Trusted events come from our own workers; their payloads are validated only on write.
+        self._trusted_events = trusted_events
+        # Statuses are written behind; terminal ones are written before they are broadcast.
+        self._status_writes = StatusWriteBuffer(
+            self._storage, flush_interval_s=status_flush_interval_s
+        )
+        # Bounded so tasks that never send a terminal status are eventually forgotten.
+        self._task_state: TaskStateTable[_TaskTracking] = TaskStateTable(
+            capacity=task_state_capacity, ttl_s=task_state_ttl_s
+        )
 
     @ws_cpu_meter
     async def handle_status_event(self, event: TaskEvent) -> None:
-        """Persist status updates and broadcast them."""
+        """Persist status updates and broadcast them, skipping out-of-order events."""
         status_payload = event.payload.get("status")
         if not isinstance(status_payload, dict):
             raise ValueError("Status payload is missing or invalid")
-        status = TaskStatus.model_validate(status_payload)
-        if status.metadata is None:
-            status.metadata = {}
-        status.metadata["server_cpu_ms_ws"] = self._cpu_ws_total_ms.get(event.task_id, 0.0)
-        status.metadata["server_sent_ts"] = time.time()
-        event.payload["status"] = status.model_dump(mode="json")
-        pct = status.progress.percentage or 0.0
-        last_pct = self._status_cache.get(event.task_id)
-        is_terminal = status.state in {
-            TaskState.COMPLETED,
-            TaskState.FAILED,
-            TaskState.CANCELLED,
+        tracking = self._task_state.get(event.task_id)
+        last_seq = tracking.seq if tracking is not None else None
+        if event.seq is not None and last_seq is not None and event.seq <= last_seq:
+            logger.debug(
+                "Skipping stale status event",
+                extra={"task_id": event.task_id, "seq": event.seq, "last_seq": last_seq},
+            )
+            return
+        server_metadata = {
+            "server_cpu_ms_ws": tracking.cpu_ms if tracking is not None else 0.0,
+            "server_sent_ts": time.time(),
         }
+        status: TaskStatus | None = None
+        if self._trusted_events:
+            # Stamp the decoded payload in place instead of rebuilding the model.
+            status_payload["metadata"] = {**(status_payload.get("metadata") or {}), **server_metadata}
+            pct = (status_payload.get("progress") or {}).get("percentage") or 0.0
+            is_terminal = status_payload.get("state") in _TERMINAL_STATES
+        else:
+            status = TaskStatus.model_validate(status_payload)
+            if status.metadata is None:
+                status.metadata = {}
+            status.metadata.update(server_metadata)
+            event.payload["status"] = status.model_dump(mode="json")
+            pct = status.progress.percentage or 0.0
+            is_terminal = status.state.value in _TERMINAL_STATES
+        last_pct = tracking.persisted_pct if tracking is not None else None
         if last_pct is None or abs(pct - last_pct) >= self._status_delta or is_terminal:
-            await self._storage.update_task_status(event.task_id, status)
-            self._status_cache[event.task_id] = pct
-            if is_terminal:
-                self._status_cache.pop(event.task_id, None)
+            if status is None:
+                status = TaskStatus.model_validate(status_payload)
+            update = StatusUpdate(task_id=event.task_id, status=status, seq=event.seq)
+            if not is_terminal:
+                await self._status_writes.add(update)
+            elif not await self._status_writes.write_now(update):
+                # Storage already holds a newer status, e.g. written by another replica.
+                return
+            self._task_state.get_or_create(event.task_id, _TaskTracking).persisted_pct = pct
+        if event.seq is not None:
+            self._task_state.get_or_create(event.task_id, _TaskTracking).seq = event.seq
         await self._broadcaster.broadcast_status(event)
 
+    @property
+    def task_state(self) -> TaskStateTable[_TaskTracking]:
+        """Return the bounded table of per-task handler state."""
+        return self._task_state
+
+    @property
+    def status_writes(self) -> StatusWriteBuffer:
+        """Return the write-behind buffer of task statuses."""
+        return self._status_writes
+
+    async def end_batch(self) -> None:
+        """Persist buffered statuses at the end of a consumer batch, if due."""
+        await self._status_writes.end_batch()
+
+    async def close(self) -> None:
+        """Persist every buffered status; called on shutdown."""
+        await self._status_writes.close()
+
     async def handle_result_event(self, event: TaskEvent) -> None:
         """Persist the final task result."""
         result_payload = event.payload.get("result")
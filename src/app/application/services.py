@@ -6,6 +6,7 @@ from typing import cast
 from src.app.domain.models import (
     Task,
     TaskMetadata,
+    TaskPage,
     TaskPayload,
     TaskProgress,
     TaskResult,
@@ -63,3 +64,17 @@ class TaskService:
     async def get_result(self, task_id: str, user_id: str = "anonymous") -> TaskResult:
         """Return the current result payload for the task identified by ``task_id``."""
         return await self._storage.get_result(user_id, task_id)
+
+    async def list_tasks(
+        self,
+        user_id: str = "anonymous",
+        *,
+        task_type: TaskType | None = None,
+        state: TaskState | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> TaskPage:
+        """Return one page of the user's tasks, newest first."""
+        return await self._storage.list_tasks(
+            user_id, task_type=task_type, state=state, limit=limit, cursor=cursor
+        )
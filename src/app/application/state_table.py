@@ -0,0 +1,94 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class TaskStateTable(Generic[V]):
+    """
+    Bounded in-process state keyed by task id.
+
+    Entries are kept in least-recently-used order. Once more than ``capacity``
+    tasks are tracked the least recently used one is evicted, and entries not
+    touched for ``ttl_s`` seconds expire, so tasks that never report a terminal
+    state do not accumulate forever.
+    """
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        ttl_s: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+        self._capacity = capacity
+        self._ttl_s = ttl_s
+        self._clock = clock
+        # Task id -> (last touched, value), oldest first.
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def metrics(self) -> dict[str, float]:
+        """Return table size and eviction counters."""
+        return {
+            "size": len(self._entries),
+            "capacity": self._capacity,
+            "evictions_lru_total": self._evicted_lru,
+            "evictions_ttl_total": self._evicted_ttl,
+        }
+
+    def get(self, task_id: str) -> V | None:
+        """Return the live value for ``task_id`` and mark it recently used."""
+        now = self._clock()
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return None
+        if self._expired(entry[0], now):
+            del self._entries[task_id]
+            self._evicted_ttl += 1
+            return None
+        self._entries[task_id] = (now, entry[1])
+        self._entries.move_to_end(task_id)
+        return entry[1]
+
+    def get_or_create(self, task_id: str, factory: Callable[[], V]) -> V:
+        """Return the value for ``task_id``, storing a new one from ``factory`` if absent."""
+        value = self.get(task_id)
+        if value is None:
+            value = factory()
+            self.set(task_id, value)
+        return value
+
+    def set(self, task_id: str, value: V) -> None:
+        """Store ``value`` for ``task_id``, evicting expired and excess entries."""
+        now = self._clock()
+        self._entries[task_id] = (now, value)
+        self._entries.move_to_end(task_id)
+        self._evict(now)
+
+    def pop(self, task_id: str) -> V | None:
+        """Remove and return the value for ``task_id``, if tracked."""
+        entry = self._entries.pop(task_id, None)
+        return entry[1] if entry is not None else None
+
+    def _expired(self, touched: float, now: float) -> bool:
+        return self._ttl_s is not None and now - touched >= self._ttl_s
+
+    def _evict(self, now: float) -> None:
+        # The oldest entries come first, so expired ones are found without a full scan.
+        while self._entries:
+            task_id, (touched, _value) = next(iter(self._entries.items()))
+            if self._expired(touched, now):
+                self._evicted_ttl += 1
+            elif len(self._entries) > self._capacity:
+                self._evicted_lru += 1
+            else:
+                return
+            del self._entries[task_id]
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+
+from src.app.domain.models.status_update import StatusUpdate
+from src.app.domain.repositories import StorageRepository
+
+logger = logging.getLogger(__name__)
+
+
+class StatusWriteBuffer:
+    """
+    Write-behind buffer keeping the latest unsaved status of each task.
+
+    All buffered statuses are written with one ``update_task_statuses`` call.
+    With ``flush_interval_s`` at 0 that happens at the end of every consumer
+    batch, before its entries are acknowledged. Otherwise a timer flushes the
+    buffer that long after it stopped being empty, so one transaction covers
+    several batches. A status buffered at that point is lost if the process
+    crashes, but a later status of the task replaces it anyway.
+    """
+    def __init__(
+        self,
+        storage: StorageRepository,
+        *,
+        flush_interval_s: float = 0.0,
+        max_pending: int = 1000,
+    ) -> None:
+        if flush_interval_s < 0 or max_pending <= 0:
+            raise ValueError("flush_interval_s must be >= 0 and max_pending positive")
+        self._storage = storage
+        self._flush_interval_s = flush_interval_s
+        self._max_pending = max_pending
+        self._pending: dict[str, StatusUpdate] = {}
+        # One flush at a time, so writes of the same task reach storage in order.
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task[None] | None = None
+        self._flushes = 0
+        self._written = 0
+        self._rejected = 0
+
+    def metrics(self) -> dict[str, float]:
+        """Return buffer depth and write counters."""
+        return {
+            "pending": len(self._pending),
+            "flushes_total": self._flushes,
+            "statuses_written_total": self._written,
+            "statuses_rejected_total": self._rejected,
+        }
+
+    async def add(self, update: StatusUpdate) -> None:
+        """Buffer a status, replacing the one still pending for its task."""
+        self._pending[update.task_id] = update
+        if len(self._pending) >= self._max_pending:
+            await self.flush()
+        elif self._flush_interval_s and self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later(), name="status-write-buffer")
+
+    async def write_now(self, update: StatusUpdate) -> bool:
+        """Write a status immediately together with everything pending; False if it was stale."""
+        async with self._lock:
+            self._pending[update.task_id] = update
+            return update.task_id in await self._write()
+
+    async def flush(self) -> None:
+        """Write every pending status."""
+        async with self._lock:
+            await self._write()
+
+    async def end_batch(self) -> None:
+        """Flush at the end of a consumer batch unless a flush interval is configured."""
+        if not self._flush_interval_s and self._pending:
+            await self.flush()
+
+    async def close(self) -> None:
+        """Stop the flush timer and write what is still pending."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            await self.flush()
+
+    async def _write(self) -> set[str]:
+        """Hand pending statuses to storage; called with the lock held."""
+        if not self._pending:
+            return set()
+        batch, self._pending = self._pending, {}
+        try:
+            applied = await self._storage.update_task_statuses(list(batch.values()))
+        except BaseException:
+            # Keep the statuses for the next flush unless newer ones arrived meanwhile.
+            for task_id, update in batch.items():
+                self._pending.setdefault(task_id, update)
+            raise
+        self._flushes += 1
+        self._written += len(applied)
+        self._rejected += len(batch) - len(applied)
+        return applied
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self._flush_interval_s)
+            await self.flush()
+        except asyncio.CancelledError:
+            return
+        except Exception as exc:
+            logger.exception("Failed to flush task statuses", extra={"error": str(exc)})
+        self._timer = None
+        if self._pending:
+            self._timer = asyncio.create_task(self._flush_later(), name="status-write-buffer")
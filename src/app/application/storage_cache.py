@@ -0,0 +1,286 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from src.app.application.state_table import TaskStateTable
+from src.app.domain.exceptions import TaskAccessDeniedError
+from src.app.domain.models.result_update import ResultUpdate
+from src.app.domain.models.status_update import StatusUpdate
+from src.app.domain.models.task import Task
+from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_page import TaskPage
+from src.app.domain.models.task_result import TaskResult
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.domain.models.task_type import TaskType
+from src.app.domain.repositories import StorageRepository
+
+V = TypeVar("V")
+_FINAL_STATES = {TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELLED}
+
+
+@dataclass(slots=True)
+class _CacheEntry(Generic[V]):
+    value: V
+    # None marks an entry that never goes stale.
+    expires_at: float | None
+
+
+class CachedStorageRepository(StorageRepository):
+    """
+    Read-through cache of task statuses and results in front of another repository.
+
+    Statuses and results are cached per task for ``ttl_s`` seconds, in tables
+    bounded to ``capacity`` tasks. Terminal statuses and completed results
+    never change and stay until evicted. Writes made through this repository
+    replace the cached status and drop the cached result. Writes made by other
+    processes become visible once the entry expires. Concurrent misses for the
+    same task and user share a single storage read.
+    """
+    def __init__(
+        self,
+        storage: StorageRepository,
+        *,
+        capacity: int = 10_000,
+        ttl_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._storage = storage
+        self._ttl_s = ttl_s
+        self._clock = clock
+        # Owners are learnt from creates and successful reads and never change.
+        self._owners: TaskStateTable[str] = TaskStateTable(capacity=capacity, clock=clock)
+        self._statuses: TaskStateTable[_CacheEntry[TaskStatus]] = TaskStateTable(
+            capacity=capacity, clock=clock
+        )
+        self._results: TaskStateTable[_CacheEntry[TaskResult]] = TaskStateTable(
+            capacity=capacity, clock=clock
+        )
+        self._loads: dict[tuple[str, str, str], asyncio.Task] = {}
+        # Per-task write generations, kept only while a read of the task is in flight;
+        # a read that overlapped a write of its task does not fill the cache.
+        self._fill_generations: dict[str, int] = {}
+        self._fill_readers: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    def metrics(self) -> dict[str, float]:
+        """Return hit, miss and table size counters."""
+        lookups = self._hits + self._misses + self._coalesced
+        return {
+            "hits_total": self._hits,
+            "misses_total": self._misses,
+            "coalesced_total": self._coalesced,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+            "statuses": len(self._statuses),
+            "results": len(self._results),
+            "evictions_total": (
+                self._statuses.metrics()["evictions_lru_total"]
+                + self._results.metrics()["evictions_lru_total"]
+            ),
+        }
+
+    async def create_task(self, user_id: str, task: Task) -> str:
+        """Persist a new task and cache its owner and initial status."""
+        task_id = await self._storage.create_task(user_id, task)
+        self._invalidate_fills([task_id])
+        self._owners.set(task_id, user_id)
+        self._statuses.set(task_id, self._status_entry(task.status))
+        return task_id
+
+    async def get_task(self, user_id: str, task_id: str) -> Task:
+        """Fetch a task from storage; full tasks are not cached."""
+        return await self._storage.get_task(user_id, task_id)
+
+    async def get_status(self, user_id: str, task_id: str) -> TaskStatus:
+        """Return the cached status, reading it from storage when missing or stale."""
+        entry = self._lookup(self._statuses, user_id, task_id)
+        if entry is not None:
+            return entry.value
+        return await self._load("status", user_id, task_id, self._load_status)
+
+    async def get_result(self, user_id: str, task_id: str) -> TaskResult:
+        """Return the cached result, reading it from storage when missing or stale."""
+        entry = self._lookup(self._results, user_id, task_id)
+        if entry is not None:
+            return entry.value
+        return await self._load("result", user_id, task_id, self._load_result)
+
+    async def list_tasks(
+        self,
+        user_id: str,
+        *,
+        task_type: TaskType | None = None,
+        state: TaskState | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> TaskPage:
+        """List tasks from storage; listings are not cached."""
+        return await self._storage.list_tasks(
+            user_id, task_type=task_type, state=state, limit=limit, cursor=cursor
+        )
+
+    async def update_task_status(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        metadata: TaskMetadata | None = None,
+        seq: int | None = None,
+    ) -> bool:
+        """Write the status through to storage and cache it if it was applied."""
+        self._invalidate_fills([task_id])
+        try:
+            applied = await self._storage.update_task_status(task_id, status, metadata, seq)
+        except BaseException:
+            self._statuses.pop(task_id)
+            raise
+        self._store_written_status(task_id, status if applied else None)
+        return applied
+
+    async def update_task_statuses(self, updates: Sequence[StatusUpdate]) -> set[str]:
+        """Write statuses through to storage and cache the applied ones."""
+        self._invalidate_fills(update.task_id for update in updates)
+        try:
+            applied = await self._storage.update_task_statuses(updates)
+        except BaseException:
+            for update in updates:
+                self._statuses.pop(update.task_id)
+            raise
+        latest: dict[str, StatusUpdate] = {}
+        for update in updates:
+            # Storage keeps the newest update of each task, so the cache does too.
+            current = latest.get(update.task_id)
+            if (
+                current is not None
+                and current.seq is not None
+                and update.seq is not None
+                and update.seq <= current.seq
+            ):
+                continue
+            latest[update.task_id] = update
+        for task_id, update in latest.items():
+            self._store_written_status(task_id, update.status if task_id in applied else None)
+        return applied
+
+    async def set_task_result(
+        self,
+        task_id: str,
+        result: TaskResult,
+        finished_at: datetime | None = None,
+    ) -> None:
+        """Write the result through to storage and drop the cached one."""
+        self._invalidate_fills([task_id])
+        try:
+            await self._storage.set_task_result(task_id, result, finished_at)
+        finally:
+            # Reads merge the stored metadata, so the next read reloads the result.
+            self._results.pop(task_id)
+
+    async def set_task_results(self, updates: Sequence[ResultUpdate]) -> set[str]:
+        """Write results through to storage and drop the cached ones."""
+        self._invalidate_fills(update.task_id for update in updates)
+        try:
+            return await self._storage.set_task_results(updates)
+        finally:
+            for update in updates:
+                self._results.pop(update.task_id)
+
+    def _lookup(
+        self,
+        table: TaskStateTable[_CacheEntry[V]],
+        user_id: str,
+        task_id: str,
+    ) -> _CacheEntry[V] | None:
+        """Return a fresh cached entry, enforcing ownership; None on a miss."""
+        entry = table.get(task_id)
+        owner = self._owners.get(task_id)
+        if entry is None or owner is None:
+            return None
+        if entry.expires_at is not None and self._clock() >= entry.expires_at:
+            table.pop(task_id)
+            return None
+        if owner != user_id:
+            raise TaskAccessDeniedError(task_id, user_id)
+        self._hits += 1
+        return entry
+
+    async def _load(
+        self,
+        kind: str,
+        user_id: str,
+        task_id: str,
+        loader: Callable[[str, str], Awaitable[V]],
+    ) -> V:
+        """Run ``loader`` once for concurrent misses of the same key."""
+        key = (kind, user_id, task_id)
+        load = self._loads.get(key)
+        if load is None:
+            self._misses += 1
+            load = asyncio.ensure_future(loader(user_id, task_id))
+            self._loads[key] = load
+            load.add_done_callback(lambda _done: self._loads.pop(key, None))
+        else:
+            self._coalesced += 1
+        # Shielded so a cancelled caller does not cancel the read other callers wait on.
+        return await asyncio.shield(load)
+
+    async def _load_status(self, user_id: str, task_id: str) -> TaskStatus:
+        generation = self._begin_fill(task_id)
+        try:
+            status = await self._storage.get_status(user_id, task_id)
+            self._owners.set(task_id, user_id)
+            if generation == self._fill_generations[task_id]:
+                self._statuses.set(task_id, self._status_entry(status))
+        finally:
+            self._end_fill(task_id)
+        return status
+
+    async def _load_result(self, user_id: str, task_id: str) -> TaskResult:
+        generation = self._begin_fill(task_id)
+        try:
+            result = await self._storage.get_result(user_id, task_id)
+            self._owners.set(task_id, user_id)
+            if generation == self._fill_generations[task_id]:
+                # A stored result payload is final; until then the result is re-read after ttl_s.
+                final = result.data is not None
+                self._results.set(
+                    task_id, _CacheEntry(result, None if final else self._clock() + self._ttl_s)
+                )
+        finally:
+            self._end_fill(task_id)
+        return result
+
+    def _begin_fill(self, task_id: str) -> int:
+        """Register a storage read of ``task_id`` and return its current write generation."""
+        self._fill_readers[task_id] = self._fill_readers.get(task_id, 0) + 1
+        return self._fill_generations.setdefault(task_id, 0)
+
+    def _end_fill(self, task_id: str) -> None:
+        """Forget the generation of ``task_id`` once no read of it is in flight."""
+        self._fill_readers[task_id] -= 1
+        if not self._fill_readers[task_id]:
+            del self._fill_readers[task_id]
+            del self._fill_generations[task_id]
+
+    def _invalidate_fills(self, task_ids: Iterable[str]) -> None:
+        """Keep reads of ``task_ids`` that are in flight from filling the cache."""
+        for task_id in task_ids:
+            if task_id in self._fill_generations:
+                self._fill_generations[task_id] += 1
+
+    def _store_written_status(self, task_id: str, status: TaskStatus | None) -> None:
+        """Cache a status written to storage, or drop the entry if the write was rejected."""
+        if status is None or self._owners.get(task_id) is None:
+            self._statuses.pop(task_id)
+            return
+        # Server metadata is not persisted, so the cached copy matches what a read returns.
+        stored = status.model_copy(update={"metadata": None})
+        self._statuses.set(task_id, self._status_entry(stored))
+
+    def _status_entry(self, status: TaskStatus) -> _CacheEntry[TaskStatus]:
+        final = status.state in _FINAL_STATES
+        return _CacheEntry(status, None if final else self._clock() + self._ttl_s)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import base64
 from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
@@ -10,6 +9,8 @@ from pydantic import BaseModel
 
 from src.app.domain.models.task_status import TaskStatus
 
+CHUNK_ENCODING_BINARY = "binary"
+
 
 class EventType(str, Enum):
     """Event types emitted over the task event stream."""
@@ -25,16 +26,25 @@ class TaskEvent(BaseModel):
     task_id: str
     ts: datetime
     version: int = 1
+    seq: int | None = None
     payload: dict[str, Any]
+    # Raw bytes of a binary result chunk, carried next to the payload instead of inside it.
+    binary: bytes | None = None
 
     @classmethod
-    def status(cls, task_id: str, status_snapshot: TaskStatus) -> TaskEvent:
+    def status(
+        cls,
+        task_id: str,
+        status_snapshot: TaskStatus,
+        seq: int | None = None,
+    ) -> TaskEvent:
         """Create a status event from a TaskStatus snapshot."""
         return cls(
             event_id=str(uuid4()),
             type=EventType.TASK_STATUS,
             task_id=task_id,
             ts=datetime.now(tz=UTC),
+            seq=seq,
             payload={"status": status_snapshot.model_dump(mode="json")},
         )
 
@@ -45,26 +55,42 @@ class TaskEvent(BaseModel):
         chunk_id: str,
         data: Any,
         is_last: bool = False,
+        seq: int | None = None,
     ) -> TaskEvent:
-        """Create a chunk event for incremental result streaming."""
-        safe_data = data
+        """
+        Create a chunk event for incremental result streaming.
+
+        Bytes data is kept out of the JSON payload: it travels as ``binary``
+        and the payload announces it with ``encoding`` and ``size``.
+        """
+        payload: dict[str, Any] = {"chunk_id": chunk_id, "data": data, "is_last": is_last}
+        binary: bytes | None = None
         if isinstance(data, (bytes, bytearray, memoryview)):
-            safe_data = base64.b64encode(bytes(data)).decode("ascii")
+            binary = bytes(data)
+            payload.update(data=None, encoding=CHUNK_ENCODING_BINARY, size=len(binary))
         return cls(
             event_id=str(uuid4()),
             type=EventType.TASK_RESULT_CHUNK,
             task_id=task_id,
             ts=datetime.now(tz=UTC),
-            payload={"chunk_id": chunk_id, "data": safe_data, "is_last": is_last},
+            seq=seq,
+            payload=payload,
+            binary=binary,
         )
 
     @classmethod
-    def result(cls, task_id: str, result_snapshot: dict[str, Any]) -> TaskEvent:
+    def result(
+        cls,
+        task_id: str,
+        result_snapshot: dict[str, Any],
+        seq: int | None = None,
+    ) -> TaskEvent:
         """Create a final result event."""
         return cls(
             event_id=str(uuid4()),
             type=EventType.TASK_RESULT,
             task_id=task_id,
             ts=datetime.now(tz=UTC),
+            seq=seq,
             payload={"result": result_snapshot},
         )
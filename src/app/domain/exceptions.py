@@ -12,3 +12,11 @@ class TaskAccessDeniedError(Exception):
         super().__init__(f"User '{user_id}' has no access to task '{task_id}'.")
         self.task_id = task_id
         self.user_id = user_id
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor: str) -> None:
+        super().__init__(f"Invalid pagination cursor '{cursor}'.")
+        self.cursor = cursor
@@ -1,7 +1,10 @@
 from src.app.domain.models.execution_config import ExecutionConfig
 from src.app.domain.models.payloads import ComputePiPayload, DocumentAnalysisPayload, TaskPayload
+from src.app.domain.models.result_update import ResultUpdate
+from src.app.domain.models.status_update import StatusUpdate
 from src.app.domain.models.task import Task
 from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_page import TaskPage
 from src.app.domain.models.task_progress import TaskProgress
 from src.app.domain.models.task_result import TaskResult
 from src.app.domain.models.task_state import TaskState
@@ -22,4 +25,7 @@ __all__ = [
     "TaskMetadata",
     "TaskResult",
     "TaskView",
+    "TaskPage",
+    "StatusUpdate",
+    "ResultUpdate",
 ]
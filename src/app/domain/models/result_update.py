@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from src.app.domain.models.task_result import TaskResult
+
+
+class ResultUpdate(BaseModel):
+    """One task result write of a bulk result update."""
+
+    task_id: str = Field(description="Task whose result is written.")
+    result: TaskResult = Field(description="Result payload to store.")
+    finished_at: datetime | None = Field(
+        default=None,
+        description="Finish time stored with the result and in the task metadata.",
+    )
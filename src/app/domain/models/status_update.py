@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+from src.app.domain.models.task_status import TaskStatus
+
+
+class StatusUpdate(BaseModel):
+    """One task status write of a bulk status update."""
+
+    task_id: str = Field(description="Task whose status is written.")
+    status: TaskStatus = Field(description="Status snapshot to store.")
+    seq: int | None = Field(
+        default=None,
+        description="Worker sequence number; older than the stored one means stale.",
+    )
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+from src.app.domain.models.task_view import TaskView
+
+
+class TaskPage(BaseModel):
+    """One page of a task listing, newest tasks first."""
+
+    items: list[TaskView] = Field(description="Tasks on this page.")
+    next_cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor for the next page; absent on the last page.",
+    )
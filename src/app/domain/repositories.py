@@ -5,13 +5,15 @@ from datetime import datetime
 from typing import Protocol
 
 from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.models.result_update import ResultUpdate
+from src.app.domain.models.status_update import StatusUpdate
 from src.app.domain.models.task import Task
 from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_page import TaskPage
 from src.app.domain.models.task_result import TaskResult
 from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
 from src.app.domain.models.task_type import TaskType
-from src.app.domain.models.task_view import TaskView
 
 
 class TaskManagerRepository(Protocol):
@@ -50,17 +52,31 @@ class StorageRepository(Protocol):
         task_type: TaskType | None = None,
         state: TaskState | None = None,
         limit: int = 50,
-        offset: int = 0,
-    ) -> list[TaskView]:
-        """List tasks owned by ``user_id`` with optional filters."""
+        cursor: str | None = None,
+    ) -> TaskPage:
+        """List tasks owned by ``user_id``, newest first, from ``cursor`` onwards."""
 
     async def update_task_status(
         self,
         task_id: str,
         status: TaskStatus,
         metadata: TaskMetadata | None = None,
-    ) -> None:
-        """Persist status changes and optional metadata updates."""
+        seq: int | None = None,
+    ) -> bool:
+        """
+        Persist status changes and optional metadata updates.
+
+        When ``seq`` is given the update is applied only if it is newer than the
+        sequence of the stored status; returns False when it was rejected as stale.
+        """
+
+    async def update_task_statuses(self, updates: Sequence[StatusUpdate]) -> set[str]:
+        """
+        Persist several status updates in one transaction.
+
+        Stale updates (see ``update_task_status``) and updates of unknown tasks
+        are skipped; returns the ids of the tasks whose status was written.
+        """
 
     async def set_task_result(
         self,
@@ -70,9 +86,20 @@ class StorageRepository(Protocol):
     ) -> None:
         """Persist the task result payload and finalization timestamp."""
 
+    async def set_task_results(self, updates: Sequence[ResultUpdate]) -> set[str]:
+        """
+        Persist several task results in one transaction.
+
+        Results of unknown tasks are skipped; returns the ids of the tasks whose
+        result was written.
+        """
+
 
 class TaskEventPublisherRepository(Protocol):
     """Repository contract for publishing task events to a stream."""
 
     def publish(self, events: TaskEvent | Sequence[TaskEvent]) -> None:
         """Publish task event(s) to the stream."""
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until published events reached the stream; False on timeout."""
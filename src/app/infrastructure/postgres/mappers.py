@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from typing import Any
+
 from src.app.domain.models.payloads import (
     ComputePiPayload,
     DocumentAnalysisPayload,
@@ -21,6 +25,9 @@ from src.app.infrastructure.postgres.orm import (
     TaskStatusRow,
 )
 
+# Column values of a projection row, keyed by column name (e.g. a SQLAlchemy RowMapping).
+ColumnValues = Mapping[Any, Any]
+
 
 class OrmMapper:
     """Map between ORM rows and domain models."""
@@ -33,6 +40,7 @@ class OrmMapper:
             id=task.id,
             user_id=user_id,
             task_type=task.task_type,
+            created_at=task.metadata.created_at or datetime.now(UTC),
         )
 
     @staticmethod
@@ -46,40 +54,64 @@ class OrmMapper:
     @staticmethod
     def to_metadata_row(task_id: str, metadata: TaskMetadata) -> TaskMetadataRow:
         """Create a metadata row from task metadata."""
-        return TaskMetadataRow(
-            task_id=task_id,
-            created_at=metadata.created_at,
-            updated_at=metadata.updated_at,
-            started_at=metadata.started_at,
-            finished_at=metadata.finished_at,
-            custom=metadata.custom,
-        )
+        return TaskMetadataRow(**OrmMapper.to_metadata_values(task_id, metadata))
 
     @staticmethod
-    def to_status_row(task_id: str, status: TaskStatus) -> TaskStatusRow:
+    def to_metadata_values(task_id: str, metadata: TaskMetadata) -> dict[str, Any]:
+        """Return task metadata as column values for Core statements."""
+        return {
+            "task_id": task_id,
+            "created_at": metadata.created_at,
+            "updated_at": metadata.updated_at,
+            "started_at": metadata.started_at,
+            "finished_at": metadata.finished_at,
+            "custom": metadata.custom,
+        }
+
+    @staticmethod
+    def to_status_row(
+        task_id: str,
+        status: TaskStatus,
+        seq: int | None = None,
+    ) -> TaskStatusRow:
         """Create a status row from task status."""
+        return TaskStatusRow(**OrmMapper.to_status_values(task_id, status, seq))
+
+    @staticmethod
+    def to_status_values(
+        task_id: str,
+        status: TaskStatus,
+        seq: int | None = None,
+    ) -> dict[str, Any]:
+        """Return task status as column values for Core statements."""
         progress = status.progress
-        return TaskStatusRow(
-            task_id=task_id,
-            state=status.state,
-            progress_current=progress.current,
-            progress_total=progress.total,
-            progress_percentage=progress.percentage,
-            progress_phase=progress.phase,
-            message=status.message,
-            metrics=status.metrics,
-        )
+        return {
+            "task_id": task_id,
+            "state": status.state,
+            "progress_current": progress.current,
+            "progress_total": progress.total,
+            "progress_percentage": progress.percentage,
+            "progress_phase": progress.phase,
+            "message": status.message,
+            "metrics": status.metrics,
+            "seq": seq,
+        }
 
     @staticmethod
     def to_result_row(task_id: str, result: TaskResult) -> TaskResultRow:
         """Create a result row from task result."""
-        return TaskResultRow(
-            task_id=task_id,
-            data=result.data,
-            finished_at=result.task_metadata.finished_at if result.task_metadata else None,
-            expires_at=result.expires_at,
-            ttl_seconds=result.ttl_seconds,
-        )
+        return TaskResultRow(**OrmMapper.to_result_values(task_id, result))
+
+    @staticmethod
+    def to_result_values(task_id: str, result: TaskResult) -> dict[str, Any]:
+        """Return a task result as column values for Core statements."""
+        return {
+            "task_id": task_id,
+            "data": result.data,
+            "finished_at": result.task_metadata.finished_at if result.task_metadata else None,
+            "expires_at": result.expires_at,
+            "ttl_seconds": result.ttl_seconds,
+        }
 
     @staticmethod
     def to_domain_task(row: TaskRow) -> Task:
@@ -131,25 +163,52 @@ class OrmMapper:
         )
 
     @staticmethod
-    def to_task_view(row: TaskRow) -> TaskView:
-        """Create a TaskView from ORM rows."""
-        return TaskView(
-            id=row.id,
-            task_type=row.task_type,
-            status=OrmMapper.to_domain_status(row),
-            metadata=OrmMapper.to_domain_metadata(row),
+    def status_from_values(values: ColumnValues) -> TaskStatus:
+        """Create TaskStatus from status column values; a missing status row means queued."""
+        if values["state"] is None:
+            return TaskStatus(state=TaskState.QUEUED, progress=TaskProgress())
+        return TaskStatus(
+            state=values["state"],
+            progress=TaskProgress(
+                current=values["progress_current"],
+                total=values["progress_total"],
+                percentage=values["progress_percentage"],
+                phase=values["progress_phase"],
+            ),
+            message=values["message"],
+            metrics=values["metrics"],
+        )
+
+    @staticmethod
+    def metadata_from_values(values: ColumnValues) -> TaskMetadata:
+        """Create TaskMetadata from metadata column values."""
+        return TaskMetadata(
+            created_at=values["created_at"],
+            updated_at=values["updated_at"],
+            started_at=values["started_at"],
+            finished_at=values["finished_at"],
+            custom=values["custom"],
         )
 
     @staticmethod
-    def to_domain_result(row: TaskRow) -> TaskResult:
-        """Create TaskResult from ORM rows."""
-        result_row = row.result
+    def result_from_values(task_id: str, values: ColumnValues) -> TaskResult:
+        """Create TaskResult from result and metadata column values."""
         return TaskResult(
-            task_id=row.id,
-            task_metadata=OrmMapper.to_domain_metadata(row),
-            data=result_row.data if result_row else None,
-            expires_at=result_row.expires_at if result_row else None,
-            ttl_seconds=result_row.ttl_seconds if result_row else None,
+            task_id=task_id,
+            task_metadata=OrmMapper.metadata_from_values(values),
+            data=values["data"],
+            expires_at=values["expires_at"],
+            ttl_seconds=values["ttl_seconds"],
+        )
+
+    @staticmethod
+    def task_view_from_values(values: ColumnValues) -> TaskView:
+        """Create a TaskView from task, status and metadata column values."""
+        return TaskView(
+            id=values["id"],
+            task_type=values["task_type"],
+            status=OrmMapper.status_from_values(values),
+            metadata=OrmMapper.metadata_from_values(values),
         )
 
     @staticmethod
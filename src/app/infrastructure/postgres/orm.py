@@ -2,7 +2,19 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, Enum, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -24,11 +36,18 @@ class TaskRow(Base):
     """ORM row for the tasks table."""
     __tablename__ = "tasks"
 
+    __table_args__ = (
+        # Serves the keyset-paginated listing of a user's tasks, newest first.
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
-    user_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(128), nullable=False)
     task_type: Mapped[TaskType] = mapped_column(
         Enum(TaskType, name="task_type"), nullable=False
     )
+    # Copy of task_metadata.created_at kept on tasks so listings sort by an index.
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     payload: Mapped[TaskPayloadRow] = relationship(
         back_populates="task", uselist=False, cascade="all, delete-orphan"
@@ -75,6 +94,7 @@ class TaskMetadataRow(Base):
 class TaskStatusRow(Base):
     """ORM row for task status storage."""
     __tablename__ = "task_statuses"
+    __table_args__ = (Index("ix_task_statuses_state_task_id", "state", "task_id"),)
 
     task_id: Mapped[str] = mapped_column(
         String(64), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
@@ -88,6 +108,8 @@ class TaskStatusRow(Base):
     progress_phase: Mapped[str | None] = mapped_column(String(128))
     message: Mapped[str | None] = mapped_column(Text)
     metrics: Mapped[dict | None] = mapped_column(JSON)
+    # Sequence of the event that produced this status; older events are rejected.
+    seq: Mapped[int | None] = mapped_column(BigInteger)
 
     task: Mapped[TaskRow] = relationship(back_populates="status")
 
@@ -114,6 +136,9 @@ class PostgresOrm:
 
     def __init__(self, database_url: str, *, echo: bool = False) -> None:
         self._engine: AsyncEngine = create_async_engine(database_url, echo=echo)
+        if self._engine.dialect.name == "sqlite":
+            # Upserts rely on foreign keys to reject unknown tasks; SQLite needs them enabled.
+            event.listen(self._engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
         self._session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
             self._engine, expire_on_commit=False
         )
@@ -127,3 +152,9 @@ class PostgresOrm:
     def session_factory(self) -> async_sessionmaker[AsyncSession]:
         """Return the async session factory."""
         return self._session_factory
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
@@ -1,28 +1,60 @@
 from __future__ import annotations
 
+import base64
+import json
+from collections.abc import Callable, Sequence
 from datetime import datetime
+from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import select
+from sqlalchemy import Insert, RowMapping, Select, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
-from src.app.domain.exceptions import TaskAccessDeniedError, TaskNotFoundError
+from src.app.domain.exceptions import (
+    InvalidCursorError,
+    TaskAccessDeniedError,
+    TaskNotFoundError,
+)
+from src.app.domain.models.result_update import ResultUpdate
+from src.app.domain.models.status_update import StatusUpdate
 from src.app.domain.models.task import Task
 from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_page import TaskPage
 from src.app.domain.models.task_result import TaskResult
 from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
 from src.app.domain.models.task_type import TaskType
-from src.app.domain.models.task_view import TaskView
 from src.app.domain.repositories import StorageRepository
 from src.app.infrastructure.postgres.mappers import OrmMapper
 from src.app.infrastructure.postgres.orm import (
+    Base,
     PostgresOrm,
     TaskMetadataRow,
+    TaskResultRow,
     TaskRow,
     TaskStatusRow,
 )
 
+# Columns read by the status and result projections; seq and the result's own
+# finished_at are not part of the domain models.
+_STATUS_COLUMNS = tuple(
+    column for column in TaskStatusRow.__table__.c if column.name not in ("task_id", "seq")
+)
+_METADATA_COLUMNS = tuple(
+    column for column in TaskMetadataRow.__table__.c if column.name != "task_id"
+)
+_RESULT_COLUMNS = (
+    TaskResultRow.data,
+    TaskResultRow.expires_at,
+    TaskResultRow.ttl_seconds,
+    *_METADATA_COLUMNS,
+)
+
 
 class PostgresStorageRepository(StorageRepository):
     """Postgres-backed task storage using SQLAlchemy async sessions."""
@@ -68,25 +100,44 @@ class PostgresStorageRepository(StorageRepository):
         return OrmMapper.to_domain_task(task_row)
 
     async def get_status(self, user_id: str, task_id: str) -> TaskStatus:
-        """Fetch task status by id."""
-        task = await self.get_task(user_id, task_id)
-        return task.status
+        """Fetch task status by id with a single query."""
+        row = await self._fetch_owned(
+            user_id,
+            task_id,
+            select(TaskRow.user_id, *_STATUS_COLUMNS).outerjoin(
+                TaskStatusRow, TaskStatusRow.task_id == TaskRow.id
+            ),
+        )
+        return OrmMapper.status_from_values(row)
 
     async def get_result(self, user_id: str, task_id: str) -> TaskResult:
-        """Fetch task result by id."""
+        """Fetch task result and metadata by id with a single query."""
+        row = await self._fetch_owned(
+            user_id,
+            task_id,
+            select(TaskRow.user_id, *_RESULT_COLUMNS)
+            .outerjoin(TaskResultRow, TaskResultRow.task_id == TaskRow.id)
+            .outerjoin(TaskMetadataRow, TaskMetadataRow.task_id == TaskRow.id),
+        )
+        return OrmMapper.result_from_values(task_id, row)
+
+    async def _fetch_owned(
+        self,
+        user_id: str,
+        task_id: str,
+        statement: Select,
+    ) -> RowMapping:
+        """Return the column values of one task row and enforce ownership."""
+        # Plain column rows bypass entity loading and the session identity map.
         async with self._orm.session_factory() as session:
-            result = await session.execute(
-                select(TaskRow)
-                .options(selectinload(TaskRow.task_metadata), selectinload(TaskRow.result))
-                .where(TaskRow.id == task_id)
-            )
-            task_row = result.scalar_one_or_none()
+            result = await session.execute(statement.where(TaskRow.id == task_id))
+            row = result.mappings().first()
 
-        if task_row is None:
+        if row is None:
             raise TaskNotFoundError(task_id)
-        if task_row.user_id != user_id:
+        if row["user_id"] != user_id:
             raise TaskAccessDeniedError(task_id, user_id)
-        return OrmMapper.to_domain_result(task_row)
+        return row
 
     async def list_tasks(
         self,
@@ -95,51 +146,97 @@ class PostgresStorageRepository(StorageRepository):
         task_type: TaskType | None = None,
         state: TaskState | None = None,
         limit: int = 50,
-        offset: int = 0,
-    ) -> list[TaskView]:
-        """List tasks for a user with optional filters."""
+        cursor: str | None = None,
+    ) -> TaskPage:
+        """List tasks for a user, newest first, continuing after ``cursor``."""
         statement = (
-            select(TaskRow)
-            .options(selectinload(TaskRow.task_metadata), selectinload(TaskRow.status))
+            select(
+                TaskRow.id,
+                TaskRow.task_type,
+                TaskRow.created_at.label("sort_created_at"),
+                *_STATUS_COLUMNS,
+                *_METADATA_COLUMNS,
+            )
+            .outerjoin(TaskStatusRow, TaskStatusRow.task_id == TaskRow.id)
+            .outerjoin(TaskMetadataRow, TaskMetadataRow.task_id == TaskRow.id)
             .where(TaskRow.user_id == user_id)
         )
         if task_type is not None:
             statement = statement.where(TaskRow.task_type == task_type)
         if state is not None:
-            statement = statement.join(TaskRow.status).where(TaskStatusRow.state == state)
-
-        statement = statement.order_by(TaskRow.id).limit(limit).offset(offset)
+            statement = statement.where(TaskStatusRow.state == state)
+        if cursor is not None:
+            # Seeking past the last row keeps deep pages as cheap as the first one.
+            statement = statement.where(
+                tuple_(TaskRow.created_at, TaskRow.id) < _decode_cursor(cursor)
+            )
+        # One extra row tells whether another page follows.
+        statement = statement.order_by(TaskRow.created_at.desc(), TaskRow.id.desc()).limit(
+            limit + 1
+        )
 
         async with self._orm.session_factory() as session:
             result = await session.execute(statement)
-            rows = result.scalars().all()
+            rows = result.mappings().all()
 
-        return [OrmMapper.to_task_view(row) for row in rows]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1]["sort_created_at"], rows[-1]["id"])
+        return TaskPage(
+            items=[OrmMapper.task_view_from_values(row) for row in rows],
+            next_cursor=next_cursor,
+        )
 
     async def update_task_status(
         self,
         task_id: str,
         status: TaskStatus,
         metadata: TaskMetadata | None = None,
-    ) -> None:
-        """Update task status and optional metadata."""
-        async with self._orm.session_factory() as session:
-            async with session.begin():
-                # Ensure the task exists before mutating status/metadata.
-                task_row = await session.get(TaskRow, task_id)
-                if task_row is None:
-                    raise TaskNotFoundError(task_id)
-
-                status_row = OrmMapper.to_status_row(task_id, status)
-                await session.merge(status_row)
-
-                if metadata is not None:
-                    metadata_row = await session.get(TaskMetadataRow, task_id)
-                    if metadata_row is None:
-                        metadata_row = OrmMapper.to_metadata_row(task_id, metadata)
-                        session.add(metadata_row)
-                    else:
-                        self._merge_metadata(metadata_row, metadata)
+        seq: int | None = None,
+    ) -> bool:
+        """Upsert task status and optional metadata unless ``seq`` is stale."""
+        statement = self._status_upsert([OrmMapper.to_status_values(task_id, status, seq)])
+        try:
+            async with self._orm.session_factory() as session:
+                async with session.begin():
+                    applied = (await session.execute(statement)).first() is not None
+                    if applied and metadata is not None:
+                        values = {
+                            name: value
+                            for name, value in OrmMapper.to_metadata_values(
+                                task_id, metadata
+                            ).items()
+                            if value is not None
+                        }
+                        if len(values) > 1:
+                            await session.execute(self._metadata_upsert([values]))
+        except IntegrityError as exc:
+            # The foreign key on tasks.id stands in for an existence check.
+            if _is_foreign_key_violation(exc):
+                raise TaskNotFoundError(task_id) from exc
+            raise
+        return applied
+
+    async def update_task_statuses(self, updates: Sequence[StatusUpdate]) -> set[str]:
+        """Upsert several task statuses in one statement, skipping stale and unknown tasks."""
+        latest: dict[str, StatusUpdate] = {}
+        for update in updates:
+            # One statement may touch a row only once, so keep the newest update per task.
+            current = latest.get(update.task_id)
+            if (
+                current is not None
+                and current.seq is not None
+                and update.seq is not None
+                and update.seq <= current.seq
+            ):
+                continue
+            latest[update.task_id] = update
+        rows = [
+            OrmMapper.to_status_values(update.task_id, update.status, update.seq)
+            for update in latest.values()
+        ]
+        return await self._upsert_known(rows, lambda known: [self._status_upsert(known)])
 
     async def set_task_result(
         self,
@@ -147,33 +244,132 @@ class PostgresStorageRepository(StorageRepository):
         result: TaskResult,
         finished_at: datetime | None = None,
     ) -> None:
-        """Persist the task result and finished timestamp."""
+        """Upsert the task result and finished timestamp."""
+        written = await self.set_task_results(
+            [ResultUpdate(task_id=task_id, result=result, finished_at=finished_at)]
+        )
+        if not written:
+            raise TaskNotFoundError(task_id)
+
+    async def set_task_results(self, updates: Sequence[ResultUpdate]) -> set[str]:
+        """Upsert several task results in one statement, skipping unknown tasks."""
+        rows: dict[str, dict[str, Any]] = {}
+        for update in updates:
+            values = OrmMapper.to_result_values(update.task_id, update.result)
+            if update.finished_at is not None:
+                values["finished_at"] = update.finished_at
+            rows[update.task_id] = values
+        return await self._upsert_known(list(rows.values()), self._result_upsert)
+
+    async def _upsert_known(
+        self,
+        rows: list[dict[str, Any]],
+        build: Callable[[list[dict[str, Any]]], list[Insert]],
+    ) -> set[str]:
+        """
+        Run the statements ``build(rows)`` in one transaction.
+
+        The first statement returns the task ids it wrote. A foreign-key
+        violation means some tasks do not exist; the statements are then
+        rebuilt once from the rows of existing tasks only.
+        """
+        # Rows in task id order so concurrent writers lock them in the same order.
+        rows = sorted(rows, key=lambda row: row["task_id"])
+        if not rows:
+            return set()
+        try:
+            return await self._execute_upsert(build(rows))
+        except IntegrityError as exc:
+            if not _is_foreign_key_violation(exc):
+                raise
+        async with self._orm.session_factory() as session:
+            known = set(
+                await session.scalars(
+                    select(TaskRow.id).where(TaskRow.id.in_([row["task_id"] for row in rows]))
+                )
+            )
+        rows = [row for row in rows if row["task_id"] in known]
+        return await self._execute_upsert(build(rows)) if rows else set()
+
+    async def _execute_upsert(self, statements: list[Insert]) -> set[str]:
         async with self._orm.session_factory() as session:
             async with session.begin():
-                # Enforce task existence; results are keyed to the task id.
-                task_row = await session.get(TaskRow, task_id)
-                if task_row is None:
-                    raise TaskNotFoundError(task_id)
-
-                result_row = OrmMapper.to_result_row(task_id, result)
-                if finished_at is not None:
-                    result_row.finished_at = finished_at
-                await session.merge(result_row)
-
-                if finished_at is not None:
-                    metadata_row = await session.get(TaskMetadataRow, task_id)
-                    if metadata_row is None:
-                        metadata_row = OrmMapper.to_metadata_row(
-                            task_id,
-                            TaskMetadata(finished_at=finished_at),
-                        )
-                        session.add(metadata_row)
-                    else:
-                        self._merge_metadata(metadata_row, TaskMetadata(finished_at=finished_at))
-
-    @staticmethod
-    def _merge_metadata(target: TaskMetadataRow, updates: TaskMetadata) -> None:
-        for field in ("created_at", "updated_at", "started_at", "finished_at", "custom"):
-            value = getattr(updates, field)
-            if value is not None:
-                setattr(target, field, value)
+                written = set((await session.execute(statements[0])).scalars())
+                for statement in statements[1:]:
+                    await session.execute(statement)
+        return written
+
+    def _insert(self, row_type: type[Base]) -> PostgresqlInsert | SqliteInsert:
+        """Return an INSERT supporting ON CONFLICT for the configured database."""
+        if self._orm.engine.dialect.name == "sqlite":
+            return sqlite_insert(row_type)
+        return postgresql_insert(row_type)
+
+    def _status_upsert(self, rows: list[dict[str, Any]]) -> Insert:
+        """Upsert status rows unless their sequence is older than the stored one."""
+        table = TaskStatusRow.__table__
+        statement = self._insert(TaskStatusRow).values(rows)
+        excluded = statement.excluded
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.task_id],
+            set_={
+                **{name: excluded[name] for name in rows[0] if name not in ("task_id", "seq")},
+                # Writes without a sequence keep the stored one.
+                "seq": func.coalesce(excluded.seq, table.c.seq),
+            },
+            where=or_(
+                excluded.seq.is_(None),
+                table.c.seq.is_(None),
+                excluded.seq > table.c.seq,
+            ),
+        ).returning(table.c.task_id)
+
+    def _result_upsert(self, rows: list[dict[str, Any]]) -> list[Insert]:
+        """Upsert result rows, then the finish time of those that have one."""
+        table = TaskResultRow.__table__
+        statement = self._insert(TaskResultRow).values(rows)
+        statements: list[Insert] = [
+            statement.on_conflict_do_update(
+                index_elements=[table.c.task_id],
+                set_={name: statement.excluded[name] for name in rows[0] if name != "task_id"},
+            ).returning(table.c.task_id)
+        ]
+        finished = [
+            {"task_id": row["task_id"], "finished_at": row["finished_at"]}
+            for row in rows
+            if row["finished_at"] is not None
+        ]
+        if finished:
+            statements.append(self._metadata_upsert(finished))
+        return statements
+
+    def _metadata_upsert(self, rows: list[dict[str, Any]]) -> Insert:
+        """Insert metadata rows or overwrite the columns present in them."""
+        statement = self._insert(TaskMetadataRow).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[TaskMetadataRow.__table__.c.task_id],
+            set_={name: statement.excluded[name] for name in rows[0] if name != "task_id"},
+        )
+
+
+def _is_foreign_key_violation(exc: IntegrityError) -> bool:
+    # asyncpg reports SQLSTATE 23503; SQLite only has the message.
+    return (
+        getattr(exc.orig, "sqlstate", None) == "23503"
+        or "FOREIGN KEY constraint failed" in str(exc.orig)
+    )
+
+
+def _encode_cursor(created_at: datetime, task_id: str) -> str:
+    """Return an opaque cursor pointing after the given listing position."""
+    raw = json.dumps([created_at.isoformat(), task_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, task_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(task_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError(cursor) from exc
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+
+from src.app.domain.events.task_event import TaskEvent
+from src.app.infrastructure.streams.publisher import StreamsSyncPublisher
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundStreamsPublisher:
+    """
+    Hand task events to a background thread that publishes them in batches.
+
+    ``publish`` only appends to a bounded in-memory queue (blocking while it is
+    full); the thread sends a batch once ``batch_size`` events are waiting or
+    the oldest has lingered for ``linger_ms``. Events keep their publish order.
+    A failed batch is retried ``max_retries`` times with exponential backoff
+    from ``retry_ms``; only then are its events dropped, which is counted and
+    makes the next ``flush`` return False. The thread starts on first use in
+    each process, so an instance created before Celery forks its pool is safe
+    to use in the children.
+    """
+    def __init__(
+        self,
+        publisher: StreamsSyncPublisher,
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        linger_ms: int = 10,
+        max_retries: int = 5,
+        retry_ms: int = 200,
+    ) -> None:
+        if max_queue <= 0 or batch_size <= 0:
+            raise ValueError("max_queue and batch_size must be positive integers")
+        if max_retries < 0:
+            raise ValueError("max_retries must be a non-negative integer")
+        self._publisher = publisher
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._linger_s = linger_ms / 1000
+        self._max_retries = max_retries
+        self._retry_s = retry_ms / 1000
+        self._dropped = 0
+        self._retries = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        """Create per-process state; locks and threads do not survive a fork."""
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        self._queue: deque[TaskEvent] = deque()
+        self._in_flight = 0
+        self._flush_waiters = 0
+        # Events dropped since the last flush; reported through its return value.
+        self._unflushed_drops = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def publish(self, events: TaskEvent | Sequence[TaskEvent]) -> None:
+        """Queue task event(s) for publishing, waiting while the queue is full."""
+        batch = [events] if isinstance(events, TaskEvent) else list(events)
+        self._ensure_thread()
+        with self._cond:
+            for event in batch:
+                while len(self._queue) >= self._max_queue:
+                    self._cond.wait()
+                self._queue.append(event)
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Block until every queued event was handled by the thread.
+
+        Returns False if ``timeout`` expired first or if events were dropped
+        since the previous flush.
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return True
+        with self._cond:
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                drained = self._cond.wait_for(
+                    lambda: not self._queue and not self._in_flight, timeout
+                )
+            finally:
+                self._flush_waiters -= 1
+            lost, self._unflushed_drops = self._unflushed_drops, 0
+            return drained and not lost
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flush queued events, stop the thread and close the underlying client."""
+        self.flush(timeout)
+        thread = self._thread if self._pid == os.getpid() else None
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        self._publisher.close()
+
+    @property
+    def dropped(self) -> int:
+        """Return how many events were lost because publishing failed."""
+        return self._dropped
+
+    def metrics(self) -> dict[str, float]:
+        """Return a snapshot of publish queue metrics."""
+        return {
+            "queue_depth": len(self._queue),
+            "events_dropped_total": self._dropped,
+            "publish_retries_total": self._retries,
+        }
+
+    def _ensure_thread(self) -> None:
+        if self._pid != os.getpid():
+            self._reset()
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="stream-publisher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Send queued events in order until closed."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            sent = self._publish_with_retries(batch)
+            with self._cond:
+                if not sent:
+                    self._dropped += len(batch)
+                    self._unflushed_drops += len(batch)
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _publish_with_retries(self, batch: list[TaskEvent]) -> bool:
+        """Publish one batch, backing off between attempts; False once retries ran out."""
+        delay = self._retry_s
+        for attempt in range(self._max_retries + 1):
+            try:
+                self._publisher.publish(batch)
+                return True
+            except Exception as exc:
+                if attempt == self._max_retries:
+                    logger.exception(
+                        "Failed to publish task events; dropping batch",
+                        extra={"count": len(batch), "error": str(exc)},
+                    )
+                    return False
+                logger.warning(
+                    "Failed to publish task events; retrying",
+                    extra={"count": len(batch), "attempt": attempt + 1, "error": str(exc)},
+                )
+            self._retries += 1
+            time.sleep(delay)
+            delay = min(delay * 2.0, 30.0)
+        return False
+
+    def _next_batch(self) -> list[TaskEvent] | None:
+        """Wait for a full batch, the linger deadline or a flush; None once closed and drained."""
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            deadline = time.monotonic() + self._linger_s
+            while (
+                len(self._queue) < self._batch_size
+                and not self._flush_waiters
+                and not self._closed
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            size = min(self._batch_size, len(self._queue))
+            batch = [self._queue.popleft() for _ in range(size)]
+            self._in_flight = size
+            # Wake producers waiting for queue space.
+            self._cond.notify_all()
+            return batch
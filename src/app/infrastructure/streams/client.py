@@ -21,21 +21,28 @@ class StreamsClient:
         socket_connect_timeout: float = 5.0,
         retry_on_timeout: bool = True,
     ) -> None:
-        pool = ConnectionPool.from_url(
-            url,
-            max_connections=max_connections,
-            socket_timeout=socket_timeout,
-            socket_connect_timeout=socket_connect_timeout,
-            retry_on_timeout=retry_on_timeout,
-            decode_responses=True,
-        )
+        pool_options = {
+            "max_connections": max_connections,
+            "socket_timeout": socket_timeout,
+            "socket_connect_timeout": socket_connect_timeout,
+            "retry_on_timeout": retry_on_timeout,
+        }
+        pool = ConnectionPool.from_url(url, decode_responses=True, **pool_options)
         self._redis = Redis(connection_pool=pool)
+        # Stream entries may carry binary codec fields, so they are read without decoding.
+        raw_pool = ConnectionPool.from_url(url, decode_responses=False, **pool_options)
+        self._raw_redis = Redis(connection_pool=raw_pool)
 
     @property
     def redis(self) -> Redis:
         """Expose the underlying async Redis client."""
         return self._redis
 
+    @property
+    def raw_redis(self) -> Redis:
+        """Expose an async Redis client that returns undecoded bytes."""
+        return self._raw_redis
+
     async def ensure_consumer_group(
         self,
         *,
@@ -63,8 +70,9 @@ class StreamsClient:
             raise
 
     async def close(self) -> None:
-        """Close the underlying Redis connection."""
+        """Close the underlying Redis connections."""
         await self._redis.aclose()
+        await self._raw_redis.aclose()
 
 
 class SyncStreamsClient:
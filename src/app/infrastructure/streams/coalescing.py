@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TypeVar
+
+from src.app.application.handlers import _TERMINAL_STATES
+from src.app.domain.events.task_event import EventType, TaskEvent
+from src.app.domain.models.task_state import TaskState
+
+MessageId = TypeVar("MessageId")
+
+
+def _status_state(event: TaskEvent) -> str | None:
+    """Return the state carried by a status event, if readable."""
+    status = event.payload.get("status")
+    if not isinstance(status, dict):
+        return None
+    state = status.get("state")
+    return state.value if isinstance(state, TaskState) else state
+
+
+def coalesce_status_events(
+    entries: Sequence[tuple[MessageId, TaskEvent]],
+) -> tuple[list[tuple[MessageId, TaskEvent]], list[tuple[MessageId, TaskEvent]]]:
+    """
+    Collapse runs of same-state status events per task down to the latest one.
+
+    A status event replaces the previous status of its task when both carry
+    the same non-terminal state; state transitions, terminal statuses and
+    all other event types are kept. Returns the kept entries in their original
+    order and the collapsed ones, whose message ids still need acking.
+    """
+    dropped: set[int] = set()
+    last_status: dict[str, tuple[int, str]] = {}
+    for index, (_message_id, event) in enumerate(entries):
+        if event.type != EventType.TASK_STATUS:
+            continue
+        state = _status_state(event)
+        if state is None:
+            last_status.pop(event.task_id, None)
+            continue
+        previous = last_status.get(event.task_id)
+        if previous is not None and previous[1] == state and state not in _TERMINAL_STATES:
+            dropped.add(previous[0])
+        last_status[event.task_id] = (index, state)
+
+    kept = [entry for index, entry in enumerate(entries) if index not in dropped]
+    collapsed = [entries[index] for index in sorted(dropped)]
+    return kept, collapsed
@@ -4,19 +4,35 @@ import asyncio
 import logging
 import os
 import socket
-from collections.abc import Iterable, Mapping
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any, cast
 
 from redis.exceptions import ConnectionError, RedisError, TimeoutError
 
+from src.app.domain.events.task_event import TaskEvent
 from src.app.infrastructure.streams.client import StreamsClient
+from src.app.infrastructure.streams.coalescing import coalesce_status_events
+from src.app.infrastructure.streams.dedup import EventDeduplicator
 from src.app.infrastructure.streams.router import EventRouter
-from src.app.infrastructure.streams.serializers import decode_event
+from src.app.infrastructure.streams.serializers import decode_events
+from src.app.infrastructure.streams.sharding import ShardLeaseManager
 
 logger = logging.getLogger(__name__)
 
 STREAM_TASK_EVENTS = "tasks:events"
+STREAM_TASK_EVENTS_DLQ = "tasks:events:dlq"
 GROUP_API = "api"
 
+# Stream key and message id of a consumed entry.
+EntryRef = tuple[str, bytes]
+# XREADGROUP reply: entries per stream key.
+StreamResponse = Iterable[tuple[bytes | str, list[tuple[bytes, Mapping[bytes, bytes]]]]]
+# One XPENDING row: message_id, consumer, time_since_delivered, times_delivered.
+PendingEntry = dict[str, Any]
+
 
 def consumer_name() -> str:
     """Generate a unique consumer name for this process."""
@@ -37,9 +53,29 @@ class StreamsConsumer:
         count: int,
         reclaim_pending: bool,
         reclaim_idle_ms: int,
+        dispatch_concurrency: int = 1,
+        reclaim_interval_ms: int = 30000,
+        reclaim_count: int = 100,
+        max_deliveries: int = 5,
+        dead_letter_stream: str = STREAM_TASK_EVENTS_DLQ,
+        buffer_high_watermark: int = 1000,
+        buffer_low_watermark: int = 250,
+        coalesce_status: bool = False,
+        lease_manager: ShardLeaseManager | None = None,
+        deduplicator: EventDeduplicator | None = None,
+        trusted_events: bool = False,
     ) -> None:
+        if dispatch_concurrency <= 0:
+            raise ValueError("dispatch_concurrency must be a positive integer")
+        if max_deliveries <= 0:
+            raise ValueError("max_deliveries must be a positive integer")
+        if not 0 <= buffer_low_watermark < buffer_high_watermark:
+            raise ValueError("buffer watermarks must satisfy 0 <= low < high")
         self._client = client
         self._stream = stream
+        self._lease_manager = lease_manager
+        # Without shard leases the consumer always reads the single configured stream.
+        self._streams: list[str] = [] if lease_manager else [stream]
         self._group = group
         self._consumer_name = consumer_name
         self._router = router
@@ -47,46 +83,162 @@ class StreamsConsumer:
         self._count = count
         self._reclaim_pending = reclaim_pending
         self._reclaim_idle_ms = reclaim_idle_ms
+        self._reclaim_interval_ms = reclaim_interval_ms
+        self._reclaim_count = reclaim_count
+        self._max_deliveries = max_deliveries
+        self._dead_letter_stream = dead_letter_stream
+        self._dispatch_concurrency = dispatch_concurrency
+        self._lane_semaphore = asyncio.Semaphore(dispatch_concurrency)
+        self._deduplicator = deduplicator
+        self._trusted_events = trusted_events
+        self._coalesce_status = coalesce_status
+        self._coalesced_total = 0
+        self._high_watermark = buffer_high_watermark
+        self._low_watermark = buffer_low_watermark
+        # Unbounded on purpose: an envelope entry expands into many events, so the
+        # watermarks, not the queue size, keep the buffer bounded.
+        self._buffer: asyncio.Queue[tuple[EntryRef, TaskEvent]] = asyncio.Queue()
+        # Events per entry that are buffered or being dispatched by this process.
+        self._local_refs: Counter[EntryRef] = Counter()
+        # Held entries with a failed event; they are left pending once fully dispatched.
+        self._failed_refs: set[EntryRef] = set()
+        # Streams with an XREADGROUP or a reclaim pass in progress.
+        self._busy_streams: Counter[str] = Counter()
+        self._resume_event = asyncio.Event()
+        self._paused_since: float | None = None
+        self._paused_seconds_total = 0.0
+        self._pause_count = 0
         self._stop_event = asyncio.Event()
         self._task: asyncio.Task[None] | None = None
+        self._dispatch_task: asyncio.Task[None] | None = None
+        self._reclaim_task: asyncio.Task[None] | None = None
+        self._lease_task: asyncio.Task[None] | None = None
 
     async def start(self) -> None:
         """Start the consumer loop."""
-        await self._client.ensure_consumer_group(
-            stream=self._stream,
-            group=self._group,
+        streams = self._lease_manager.all_streams if self._lease_manager else [self._stream]
+        for stream in streams:
+            await self._client.ensure_consumer_group(
+                stream=stream,
+                group=self._group,
+            )
+        if self._lease_manager is not None:
+            self._streams = await self._lease_manager.refresh()
+            self._lease_task = asyncio.create_task(
+                self._lease_loop(), name="redis-stream-shard-leases"
+            )
+        self._task = asyncio.create_task(self._run(), name="redis-stream-consumer")
+        self._dispatch_task = asyncio.create_task(
+            self._dispatch_buffered(), name="redis-stream-dispatcher"
         )
         if self._reclaim_pending:
-            await self._reclaim()
-        self._task = asyncio.create_task(self._run(), name="redis-stream-consumer")
+            self._reclaim_task = asyncio.create_task(
+                self._reclaim_loop(), name="redis-stream-reclaimer"
+            )
 
     async def stop(self) -> None:
         """Stop the consumer loop and close connections."""
         self._stop_event.set()
         if self._task is None:
             return
-        self._task.cancel()
-        try:
-            await self._task
-        except asyncio.CancelledError:
-            pass
+        for task in (self._task, self._dispatch_task, self._reclaim_task, self._lease_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._router.close()
+        if self._lease_manager is not None:
+            try:
+                await self._lease_manager.release_all()
+            except RedisError as exc:
+                logger.warning("Failed to release shard leases", extra={"error": str(exc)})
         await self._client.close()
 
+    @property
+    def deduplicator(self) -> EventDeduplicator | None:
+        """Return the event deduplicator, if one is configured."""
+        return self._deduplicator
+
+    def metrics(self) -> dict[str, float]:
+        """Return a snapshot of ingest buffer metrics."""
+        paused_seconds = self._paused_seconds_total
+        if self._paused_since is not None:
+            paused_seconds += time.monotonic() - self._paused_since
+        return {
+            "buffer_depth": self._buffer.qsize(),
+            "buffer_high_watermark": self._high_watermark,
+            "buffer_low_watermark": self._low_watermark,
+            "paused": 1 if self._paused_since is not None else 0,
+            "pause_count": self._pause_count,
+            "paused_seconds_total": paused_seconds,
+            "status_events_coalesced_total": self._coalesced_total,
+            "owned_streams": len(self._streams),
+            "draining_streams": (
+                len(self._lease_manager.draining_streams) if self._lease_manager else 0
+            ),
+        }
+
+    async def _lease_loop(self) -> None:
+        """Keep shard leases alive and follow ownership changes."""
+        assert self._lease_manager is not None
+        interval = self._lease_manager.lease_ms / 3000
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.sleep(interval)
+                self._streams = await self._lease_manager.refresh()
+                await self._release_drained()
+            except asyncio.CancelledError:
+                break
+            except RedisError as exc:
+                # Leases that cannot be renewed expire and are taken over by other replicas.
+                logger.warning("Failed to refresh shard leases", extra={"error": str(exc)})
+
+    async def _release_drained(self) -> None:
+        """Release shards given up by the lease manager once nothing of theirs is left here."""
+        assert self._lease_manager is not None
+        in_use = set(self._busy_streams) | {stream for stream, _message_id in self._local_refs}
+        drained = [
+            stream for stream in self._lease_manager.draining_streams if stream not in in_use
+        ]
+        if drained:
+            await self._lease_manager.release(drained)
+
+    @contextmanager
+    def _using_streams(self, streams: list[str]) -> Iterator[None]:
+        """Keep ``streams`` from being released while a read or reclaim pass runs."""
+        self._busy_streams.update(streams)
+        try:
+            yield
+        finally:
+            for stream in streams:
+                self._busy_streams[stream] -= 1
+                if self._busy_streams[stream] <= 0:
+                    del self._busy_streams[stream]
+
     async def _run(self) -> None:
-        """Read from the stream and dispatch events with retries."""
+        """Read from the stream into the ingest buffer with retries."""
         backoff = 1.0
         while not self._stop_event.is_set():
             try:
-                response = await self._client.redis.xreadgroup(
-                    groupname=self._group,
-                    consumername=self._consumer_name,
-                    streams={self._stream: ">"},
-                    count=self._count,
-                    block=self._block_ms,
-                )
-                if not response:
+                await self._wait_for_capacity()
+                if not self._streams:
+                    # No shard leased yet; wait for the lease loop to acquire one.
+                    await asyncio.sleep(self._block_ms / 1000)
                     continue
-                await self._handle_response(response)
+                streams = list(self._streams)
+                with self._using_streams(streams):
+                    response = await self._client.raw_redis.xreadgroup(
+                        groupname=self._group,
+                        consumername=self._consumer_name,
+                        streams={stream: ">" for stream in streams},
+                        count=self._count,
+                        block=self._block_ms,
+                    )
+                    if response:
+                        self._buffer_response(cast(StreamResponse, response))
                 backoff = 1.0
             except (ConnectionError, TimeoutError, RedisError) as exc:
                 if self._stop_event.is_set():
@@ -96,36 +248,305 @@ class StreamsConsumer:
                 backoff = min(backoff * 2.0, 30.0)
             except asyncio.CancelledError:
                 break
+            except Exception as exc:
+                # Entries read but not buffered stay pending and are picked up by the reclaimer.
+                logger.exception("Unexpected stream consumer error", extra={"error": str(exc)})
+                try:
+                    await asyncio.sleep(backoff)
+                except asyncio.CancelledError:
+                    break
+                backoff = min(backoff * 2.0, 30.0)
+
+    async def _wait_for_capacity(self) -> None:
+        """Hold off XREADGROUP while the buffer sits above the high watermark."""
+        if self._buffer.qsize() < self._high_watermark:
+            return
+        # Backlog stays in Redis until the dispatcher drains to the low watermark.
+        self._resume_event.clear()
+        self._paused_since = time.monotonic()
+        self._pause_count += 1
+        try:
+            await self._resume_event.wait()
+        finally:
+            self._paused_seconds_total += time.monotonic() - self._paused_since
+            self._paused_since = None
+
+    def _buffer_response(self, response: StreamResponse) -> None:
+        """Decode stream entries into the ingest buffer."""
+        for stream, entries in response:
+            stream_key = stream.decode() if isinstance(stream, bytes) else stream
+            decoded = self._decode_entries(stream_key, entries)
+            self._hold_local(decoded)
+            for item in decoded:
+                self._buffer.put_nowait(item)
+
+    async def _dispatch_buffered(self) -> None:
+        """Drain the ingest buffer in batches of up to ``count`` events."""
+        while not self._stop_event.is_set():
+            try:
+                batch = [await self._buffer.get()]
+                while len(batch) < self._count and not self._buffer.empty():
+                    batch.append(self._buffer.get_nowait())
+                if self._paused_since is not None and self._buffer.qsize() <= self._low_watermark:
+                    self._resume_event.set()
+                await self._dispatch_decoded(batch)
+            except asyncio.CancelledError:
+                break
+            except RedisError as exc:
+                # Unacknowledged entries stay pending and are picked up by the reclaimer.
+                logger.exception("Failed to acknowledge stream events", extra={"error": str(exc)})
+
+    def _hold_local(self, decoded: list[tuple[EntryRef, TaskEvent]]) -> None:
+        """Count decoded events per entry until they were dispatched."""
+        for ref, _event in decoded:
+            self._local_refs[ref] += 1
+
+    def _release_local(self, batch: list[tuple[EntryRef, TaskEvent]]) -> None:
+        """Forget dispatched events so their entries count as pending elsewhere again."""
+        for ref, _event in batch:
+            self._local_refs[ref] -= 1
+            if self._local_refs[ref] <= 0:
+                del self._local_refs[ref]
 
-    async def _handle_response(
+    async def _handle_entries(
         self,
-        response: Iterable[
-            tuple[bytes, list[tuple[bytes, Mapping[bytes, bytes]]]]
-        ],
+        stream: str,
+        entries: Iterable[tuple[bytes, Mapping[bytes, bytes]]],
     ) -> None:
-        """Decode and dispatch events, then acknowledge messages."""
-        for _stream, entries in response:
-            for message_id, fields in entries:
-                try:
-                    event = decode_event(fields)
-                    await self._router.dispatch(event)
-                except Exception as exc:
-                    logger.exception(
-                        "Failed to handle stream event",
-                        extra={"message_id": message_id, "error": str(exc)},
-                    )
-                    continue
-                await self._client.redis.xack(self._stream, self._group, message_id)
+        """Dispatch one batch of stream entries and acknowledge the handled ones."""
+        decoded = self._decode_entries(stream, entries)
+        self._hold_local(decoded)
+        await self._dispatch_decoded(decoded)
+
+    def _decode_entries(
+        self,
+        stream: str,
+        entries: Iterable[tuple[bytes, Mapping[bytes, bytes]]],
+    ) -> list[tuple[EntryRef, TaskEvent]]:
+        """Decode stream entries; undecodable ones are logged and left pending."""
+        decoded: list[tuple[EntryRef, TaskEvent]] = []
+        for message_id, fields in entries:
+            try:
+                # Envelope entries yield several events that share one entry ref.
+                events = decode_events(fields, trusted=self._trusted_events)
+                decoded.extend(((stream, message_id), event) for event in events)
+            except Exception as exc:
+                logger.exception(
+                    "Failed to decode stream event",
+                    extra={"message_id": message_id, "error": str(exc)},
+                )
+        return decoded
+
+    async def _dispatch_decoded(self, decoded: list[tuple[EntryRef, TaskEvent]]) -> None:
+        """
+        Dispatch decoded events and acknowledge the entries they completed.
+
+        Events of one envelope entry may be spread over several batches, so an
+        entry is acknowledged only after its last held event was dispatched and
+        none of its events failed in any batch; duplicates and coalesced events
+        count as done. Entries with a failed event stay pending.
+        """
+        refs = list(dict.fromkeys(ref for ref, _event in decoded))
+        # Pessimistic until the batch finished, so an unexpected error acks nothing.
+        failed: set[EntryRef] = set(refs)
+        try:
+            failed = await self._dispatch_batch(decoded)
+        finally:
+            self._failed_refs.update(failed)
+            self._release_local(decoded)
+            done = [ref for ref in refs if ref not in self._local_refs]
+            completed = [ref for ref in done if ref not in self._failed_refs]
+            self._failed_refs.difference_update(done)
+        await self._ack(completed)
+
+    async def _dispatch_batch(
+        self,
+        decoded: list[tuple[EntryRef, TaskEvent]],
+    ) -> set[EntryRef]:
+        """Dispatch events in per-task lanes and return the entries with a failed event."""
+        refs = {ref for ref, _event in decoded}
+        collapsed: list[tuple[EntryRef, TaskEvent]] = []
+        if self._deduplicator is not None:
+            decoded = await self._drop_duplicates(decoded)
+        if self._coalesce_status:
+            decoded, collapsed = coalesce_status_events(decoded)
+            self._coalesced_total += len(collapsed)
+        if self._dispatch_concurrency == 1:
+            handled = await self._dispatch_lane(decoded)
+        else:
+            # Events of one task share a lane so they keep their stream order,
+            # while lanes of different tasks run concurrently.
+            lanes: dict[str, list[tuple[EntryRef, TaskEvent]]] = {}
+            for ref, event in decoded:
+                lanes.setdefault(event.task_id, []).append((ref, event))
+            results = await asyncio.gather(
+                *(self._run_lane(lane) for lane in lanes.values())
+            )
+            handled = [item for lane_handled in results for item in lane_handled]
+        try:
+            await self._router.end_batch()
+        except Exception as exc:
+            # Nothing is acknowledged, so the whole batch is delivered again later.
+            logger.exception("Failed to finish event batch", extra={"error": str(exc)})
+            return refs
+        handled_events = {id(event) for _ref, event in handled}
+        if self._deduplicator is not None:
+            # Collapsed events were superseded by a later status, so a redelivery skips them too.
+            await self._deduplicator.mark(
+                event.event_id for _ref, event in [*handled, *collapsed] if event.event_id
+            )
+        return {ref for ref, event in decoded if id(event) not in handled_events}
+
+    async def _drop_duplicates(
+        self,
+        decoded: list[tuple[EntryRef, TaskEvent]],
+    ) -> list[tuple[EntryRef, TaskEvent]]:
+        """Drop events whose id was already handled, here or within the batch."""
+        assert self._deduplicator is not None
+        seen = await self._deduplicator.seen(
+            [event.event_id for _ref, event in decoded if event.event_id]
+        )
+        kept: list[tuple[EntryRef, TaskEvent]] = []
+        for ref, event in decoded:
+            if event.event_id and event.event_id in seen:
+                continue
+            if event.event_id:
+                seen.add(event.event_id)
+            kept.append((ref, event))
+        return kept
+
+    async def _run_lane(
+        self,
+        lane: list[tuple[EntryRef, TaskEvent]],
+    ) -> list[tuple[EntryRef, TaskEvent]]:
+        """Dispatch one task lane while holding a concurrency slot."""
+        async with self._lane_semaphore:
+            return await self._dispatch_lane(lane)
+
+    async def _dispatch_lane(
+        self,
+        lane: list[tuple[EntryRef, TaskEvent]],
+    ) -> list[tuple[EntryRef, TaskEvent]]:
+        """Dispatch events in order and return the ones that were handled."""
+        handled: list[tuple[EntryRef, TaskEvent]] = []
+        for ref, event in lane:
+            try:
+                await self._router.dispatch(event)
+            except Exception as exc:
+                logger.exception(
+                    "Failed to handle stream event",
+                    extra={"stream": ref[0], "message_id": ref[1], "error": str(exc)},
+                )
+                continue
+            handled.append((ref, event))
+        return handled
+
+    async def _ack(self, refs: list[EntryRef]) -> None:
+        """Acknowledge handled messages with one XACK per stream; failures stay pending."""
+        by_stream: dict[str, list[bytes]] = {}
+        for stream, message_id in refs:
+            by_stream.setdefault(stream, []).append(message_id)
+        for stream, message_ids in by_stream.items():
+            await self._client.redis.xack(stream, self._group, *message_ids)
+
+    async def _reclaim_loop(self) -> None:
+        """Periodically recover idle pending entries until the consumer stops."""
+        while not self._stop_event.is_set():
+            try:
+                await self._reclaim()
+            except asyncio.CancelledError:
+                break
+            except Exception as exc:
+                logger.exception("Pending entry recovery failed", extra={"error": str(exc)})
+            try:
+                await asyncio.sleep(self._reclaim_interval_ms / 1000)
+            except asyncio.CancelledError:
+                break
 
     async def _reclaim(self) -> None:
-        """Reclaim pending messages idle past the configured threshold."""
+        """Recover idle pending entries of every stream this consumer reads."""
+        for stream in list(self._streams):
+            with self._using_streams([stream]):
+                await self._reclaim_stream(stream)
+
+    async def _reclaim_stream(self, stream: str) -> None:
+        """Claim idle pending entries, re-dispatch them, and dead-letter exhausted ones."""
+        redis = self._client.raw_redis
         try:
-            await self._client.redis.xautoclaim(
-                self._stream,
-                self._group,
-                self._consumer_name,
-                min_idle_time=self._reclaim_idle_ms,
-                start_id="0-0",
+            pending = cast(
+                list[PendingEntry],
+                await redis.xpending_range(
+                    stream,
+                    self._group,
+                    min="-",
+                    max="+",
+                    count=self._reclaim_count,
+                    idle=self._reclaim_idle_ms,
+                ),
+            )
+            # Entries still buffered or in flight here are slow, not lost; claiming them
+            # would dispatch them twice and spend their delivery budget.
+            pending = [
+                item for item in pending
+                if (stream, item["message_id"]) not in self._local_refs
+            ]
+            if not pending:
+                return
+            # Delivery counts are read before claiming; XCLAIM increments them again.
+            deliveries: dict[bytes, int] = {
+                item["message_id"]: item["times_delivered"] for item in pending
+            }
+            claimed = cast(
+                list[tuple[bytes | None, Mapping[bytes, bytes] | None]],
+                await redis.xclaim(
+                    stream,
+                    self._group,
+                    self._consumer_name,
+                    min_idle_time=self._reclaim_idle_ms,
+                    message_ids=list(deliveries),
+                ),
             )
         except RedisError as exc:
             logger.warning("Failed to reclaim pending messages", extra={"error": str(exc)})
+            return
+
+        retry: list[tuple[bytes, Mapping[bytes, bytes]]] = []
+        exhausted: list[tuple[bytes, Mapping[bytes, bytes] | None]] = []
+        for message_id, fields in claimed:
+            if message_id is None:
+                continue
+            if fields is None or deliveries.get(message_id, 0) >= self._max_deliveries:
+                exhausted.append((message_id, fields))
+            else:
+                retry.append((message_id, fields))
+        if exhausted:
+            await self._dead_letter(stream, exhausted, deliveries)
+        if retry:
+            # Reclaimed entries join the ingest buffer so they run in their task's lane.
+            self._buffer_response([(stream, retry)])
+
+    async def _dead_letter(
+        self,
+        stream: str,
+        entries: list[tuple[bytes, Mapping[bytes, bytes] | None]],
+        deliveries: Mapping[bytes, int],
+    ) -> None:
+        """Move exhausted entries to the dead-letter stream and drop them from the PEL."""
+        async with self._client.redis.pipeline(transaction=True) as pipe:
+            for message_id, fields in entries:
+                # Entries trimmed from the stream while pending have no fields left to keep.
+                if fields is not None:
+                    dead: dict[Any, Any] = {
+                        **fields,
+                        "dlq_stream": stream,
+                        "dlq_group": self._group,
+                        "dlq_message_id": message_id,
+                        "dlq_deliveries": deliveries.get(message_id, 0),
+                    }
+                    pipe.xadd(self._dead_letter_stream, dead)
+            pipe.xack(stream, self._group, *(message_id for message_id, _ in entries))
+            await pipe.execute()
+        logger.warning(
+            "Moved stream entries to dead-letter stream",
+            extra={"count": len(entries), "dead_letter_stream": self._dead_letter_stream},
+        )
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+DEDUP_KEY_PREFIX = "tasks:events:seen:"
+
+
+class EventDeduplicator:
+    """
+    Remember handled event ids so redelivered stream entries are skipped.
+
+    Ids live in a bounded in-process LRU; when a Redis client is given they
+    are also written as expiring keys so replicas share what was handled.
+    Ids are recorded only after their handler succeeded.
+    """
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        redis: Redis | None = None,
+        ttl_seconds: int = 3600,
+        key_prefix: str = DEDUP_KEY_PREFIX,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+        self._capacity = capacity
+        self._redis = redis
+        self._ttl_seconds = ttl_seconds
+        self._key_prefix = key_prefix
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def metrics(self) -> dict[str, float]:
+        """Return dedup hit/miss counters and the local window size."""
+        return {
+            "hits_total": self._hits,
+            "misses_total": self._misses,
+            "window_size": len(self._seen),
+            "window_capacity": self._capacity,
+        }
+
+    async def seen(self, event_ids: Sequence[str]) -> set[str]:
+        """Return the ids among ``event_ids`` that were already handled."""
+        seen: set[str] = set()
+        unknown: list[str] = []
+        for event_id in event_ids:
+            if event_id in self._seen:
+                self._seen.move_to_end(event_id)
+                seen.add(event_id)
+            else:
+                unknown.append(event_id)
+        if unknown and self._redis is not None:
+            try:
+                values = await self._redis.mget([self._key_prefix + event_id for event_id in unknown])
+            except RedisError as exc:
+                logger.warning("Shared dedup lookup failed", extra={"error": str(exc)})
+            else:
+                seen.update(
+                    event_id
+                    for event_id, value in zip(unknown, values, strict=True)
+                    if value is not None
+                )
+        self._hits += len(seen)
+        self._misses += len(event_ids) - len(seen)
+        return seen
+
+    async def mark(self, event_ids: Iterable[str]) -> None:
+        """Record ids as handled locally and, if configured, in Redis."""
+        marked = list(event_ids)
+        for event_id in marked:
+            self._seen[event_id] = None
+            self._seen.move_to_end(event_id)
+        while len(self._seen) > self._capacity:
+            self._seen.popitem(last=False)
+        if not marked or self._redis is None:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for event_id in marked:
+                    pipe.set(self._key_prefix + event_id, 1, ex=self._ttl_seconds)
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("Shared dedup update failed", extra={"error": str(exc)})
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from typing import BinaryIO
+
+from src.app.domain.events.task_event import TaskEvent
+from src.app.infrastructure.streams.publisher import StreamsSyncPublisher
+from src.app.infrastructure.streams.serializers import CODEC_MSGPACK, decode_event, encode_event
+
+logger = logging.getLogger(__name__)
+
+# Every record is a 4-byte big-endian length followed by a msgpack-encoded event.
+_RECORD_HEADER = struct.Struct(">I")
+_SEGMENT_SUFFIX = ".seg"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _encode_record(event: TaskEvent) -> bytes:
+    """Return the length-prefixed outbox record of one event."""
+    data = encode_event(event, CODEC_MSGPACK)["data"]
+    # The msgpack codec always stores the event body as bytes.
+    assert isinstance(data, bytes)
+    return _RECORD_HEADER.pack(len(data)) + data
+
+
+def _segment_owner(name: str) -> int | None:
+    """Return the pid encoded in a segment file name, if it is one."""
+    if not name.endswith(_SEGMENT_SUFFIX):
+        return None
+    pid, _, _index = name[: -len(_SEGMENT_SUFFIX)].partition("-")
+    return int(pid) if pid.isdigit() else None
+
+
+class OutboxStreamsPublisher:
+    """
+    Write task events to a local append-only outbox and drain it to Redis.
+
+    ``publish`` appends length-prefixed records to segment files under
+    ``directory`` and returns; a background thread publishes them in order,
+    retrying while Redis is unavailable. Drained segments are deleted, and
+    ``publish`` waits while the outbox holds ``max_bytes``. Segments left by
+    processes that died are adopted and drained first. Events may be sent
+    twice after a crash; consumers skip them by event id.
+    """
+    def __init__(
+        self,
+        publisher: StreamsSyncPublisher,
+        *,
+        directory: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        segment_bytes: int = 8 * 1024 * 1024,
+        batch_size: int = 100,
+        linger_ms: int = 10,
+        retry_ms: int = 1000,
+    ) -> None:
+        if segment_bytes <= 0 or max_bytes < segment_bytes:
+            raise ValueError("outbox sizes must satisfy 0 < segment_bytes <= max_bytes")
+        self._publisher = publisher
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._segment_bytes = segment_bytes
+        self._batch_size = batch_size
+        self._linger_s = linger_ms / 1000
+        self._retry_s = retry_ms / 1000
+        self._pid: int | None = None
+
+    def _reset(self) -> None:
+        """Create per-process state and adopt segments of dead processes."""
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        self._segments: deque[str] = deque()
+        self._next_index = 0
+        self._writer: BinaryIO | None = None
+        self._writer_size = 0
+        self._reader: BinaryIO | None = None
+        self._read_offset = 0
+        self._disk_bytes = 0
+        self._unsent_bytes = 0
+        self._pending_records = 0
+        self._flush_waiters = 0
+        self._closed = False
+        os.makedirs(self._directory, exist_ok=True)
+        self._adopt_orphans()
+        self._thread = threading.Thread(target=self._run, name="stream-outbox", daemon=True)
+        self._thread.start()
+
+    def _ensure_started(self) -> None:
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _adopt_orphans(self) -> None:
+        for name in sorted(os.listdir(self._directory)):
+            owner = _segment_owner(name)
+            # Segments carrying our own pid were left by an earlier process that had it.
+            if owner is None or (owner != self._pid and _pid_alive(owner)):
+                continue
+            target = self._new_segment_path()
+            try:
+                # Renaming claims the segment atomically when several processes start together.
+                os.rename(os.path.join(self._directory, name), target)
+            except FileNotFoundError:
+                continue
+            size = os.path.getsize(target)
+            self._segments.append(target)
+            self._disk_bytes += size
+            self._unsent_bytes += size
+            logger.info("Adopted outbox segment", extra={"segment": name, "bytes": size})
+
+    def _new_segment_path(self) -> str:
+        """Return the next unused segment path of this process."""
+        while True:
+            name = f"{self._pid}-{self._next_index:08d}{_SEGMENT_SUFFIX}"
+            self._next_index += 1
+            path = os.path.join(self._directory, name)
+            if not os.path.exists(path):
+                return path
+
+    def publish(self, events: TaskEvent | Sequence[TaskEvent]) -> None:
+        """Append task event(s) to the outbox, waiting while it is full."""
+        batch = [events] if isinstance(events, TaskEvent) else events
+        self._ensure_started()
+        records = b"".join(_encode_record(event) for event in batch)
+        if not records:
+            return
+        with self._cond:
+            if self._writer is None or (
+                self._writer_size and self._writer_size + len(records) > self._segment_bytes
+            ):
+                # Rotating first lets the drain thread delete the old segment while we wait.
+                self._rotate()
+                self._cond.notify_all()
+            while self._disk_bytes and self._disk_bytes + len(records) > self._max_bytes:
+                self._cond.wait()
+            assert self._writer is not None
+            self._writer.write(records)
+            # Hand the bytes to the OS so the drain thread and a successor process can read them.
+            self._writer.flush()
+            self._writer_size += len(records)
+            self._disk_bytes += len(records)
+            self._unsent_bytes += len(records)
+            self._pending_records += len(batch)
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until the outbox was drained to Redis; False if ``timeout`` expired first."""
+        if self._pid != os.getpid():
+            return True
+        with self._cond:
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: not self._unsent_bytes, timeout)
+            finally:
+                self._flush_waiters -= 1
+
+    def sync(self) -> None:
+        """Make every event appended so far durable on disk, without waiting for the drain."""
+        if self._pid != os.getpid():
+            return
+        with self._cond:
+            if self._writer is not None:
+                self._writer.flush()
+                os.fsync(self._writer.fileno())
+
+    def close(self, timeout: float | None = None) -> None:
+        """Drain what Redis accepts within ``timeout``, then stop; undrained segments stay on disk."""
+        if self._pid == os.getpid():
+            self.flush(timeout)
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            self._thread.join(timeout)
+            for handle in (self._writer, self._reader):
+                if handle is not None:
+                    handle.close()
+        self._publisher.close()
+
+    def _rotate(self) -> None:
+        """Start a new write segment; called with the lock held."""
+        if self._writer is not None:
+            # A finished segment is made durable before writes move on to the next one.
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+            self._writer.close()
+        path = self._new_segment_path()
+        self._writer = open(path, "ab")
+        self._writer_size = 0
+        self._segments.append(path)
+
+    def _run(self) -> None:
+        """Drain segments in order until closed."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            events, end_offset = batch
+            try:
+                if events:
+                    self._publisher.publish(events)
+            except Exception as exc:
+                logger.warning(
+                    "Outbox drain failed; retrying",
+                    extra={"count": len(events), "error": str(exc)},
+                )
+                with self._cond:
+                    if not self._closed:
+                        self._cond.wait(self._retry_s)
+                continue
+            self._commit(end_offset, len(events))
+
+    def _next_batch(self) -> tuple[list[TaskEvent], int] | None:
+        """Read up to ``batch_size`` records past the committed offset; None once closed."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                # A finished segment at the head may still need deleting.
+                if self._unsent_bytes or len(self._segments) > 1:
+                    break
+                self._cond.wait()
+            deadline = time.monotonic() + self._linger_s
+            while (
+                self._pending_records < self._batch_size
+                and not self._flush_waiters
+                and not self._closed
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            segment = self._segments[0]
+            is_active = self._writer is not None and segment == self._segments[-1]
+        if self._reader is None:
+            self._reader = open(segment, "rb")
+            self._read_offset = 0
+        self._reader.seek(self._read_offset)
+        events: list[TaskEvent] = []
+        offset = self._read_offset
+        while len(events) < self._batch_size:
+            header = self._reader.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                break
+            (length,) = _RECORD_HEADER.unpack(header)
+            data = self._reader.read(length)
+            if len(data) < length:
+                break
+            offset += _RECORD_HEADER.size + length
+            try:
+                events.append(decode_event({"version": CODEC_MSGPACK, "data": data}, trusted=True))
+            except ValueError as exc:
+                logger.error("Skipping unreadable outbox record", extra={"error": str(exc)})
+        if not events and offset == self._read_offset and not is_active:
+            # A finished segment ends here, possibly with a torn record from a crash.
+            offset = os.path.getsize(segment)
+        return events, offset
+
+    def _commit(self, end_offset: int, count: int) -> None:
+        """Record drained bytes and delete the oldest segment once fully drained."""
+        with self._cond:
+            self._unsent_bytes -= end_offset - self._read_offset
+            # Records of adopted segments were never counted as pending.
+            self._pending_records = max(self._pending_records - count, 0)
+            self._read_offset = end_offset
+            segment = self._segments[0]
+            is_active = self._writer is not None and segment == self._segments[-1]
+            if not is_active and end_offset >= os.path.getsize(segment):
+                assert self._reader is not None
+                self._reader.close()
+                self._reader = None
+                self._segments.popleft()
+                self._disk_bytes -= end_offset
+                os.remove(segment)
+            self._cond.notify_all()
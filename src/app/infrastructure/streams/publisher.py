@@ -7,14 +7,67 @@ from redis.typing import EncodableT
 
 from src.app.domain.events.task_event import TaskEvent
 from src.app.infrastructure.streams.client import StreamsClient, SyncStreamsClient
-from src.app.infrastructure.streams.serializers import encode_event
+from src.app.infrastructure.streams.serializers import StreamFields, encode_event, encode_events
+from src.app.infrastructure.streams.sharding import stream_for_task
+
+
+def _stream_entries(
+    events: Iterable[TaskEvent],
+    *,
+    stream: str,
+    shards: int,
+    envelope_size: int,
+    codec_version: int | None,
+    compress_threshold: int | None,
+) -> list[tuple[str, dict[EncodableT, EncodableT]]]:
+    """Encode events into (stream key, fields) entries, packing envelopes per stream."""
+    by_stream: dict[str, list[TaskEvent]] = {}
+    for event in events:
+        by_stream.setdefault(stream_for_task(stream, event.task_id, shards), []).append(event)
+
+    entries: list[tuple[str, dict[EncodableT, EncodableT]]] = []
+    for key, stream_events in by_stream.items():
+        # Events keep their relative order within each stream, which is all consumers rely on.
+        for start in range(0, len(stream_events), envelope_size):
+            group = stream_events[start : start + envelope_size]
+            fields: StreamFields
+            if len(group) == 1:
+                fields = encode_event(
+                    group[0], codec_version, compress_threshold=compress_threshold
+                )
+            else:
+                fields = encode_events(
+                    group, codec_version, compress_threshold=compress_threshold
+                )
+            entries.append((key, cast(dict[EncodableT, EncodableT], fields)))
+    return entries
 
 
 class StreamsPublisher:
     """Async publisher for Redis streams."""
-    def __init__(self, client: StreamsClient, stream: str) -> None:
+    def __init__(
+        self,
+        client: StreamsClient,
+        stream: str,
+        *,
+        shards: int = 1,
+        maxlen: int | None = None,
+        codec_version: int | None = None,
+        compress_threshold: int | None = None,
+        envelope_size: int = 1,
+    ) -> None:
+        if envelope_size <= 0:
+            raise ValueError("envelope_size must be a positive integer")
         self._client = client
         self._stream = stream
+        self._shards = shards
+        # Safety cap applied when callers do not pass their own maxlen.
+        self._maxlen = maxlen
+        # None keeps the codec named by each event's own version.
+        self._codec_version = codec_version
+        self._compress_threshold = compress_threshold
+        # Up to this many events of one publish call share a stream entry.
+        self._envelope_size = envelope_size
 
     async def publish(
         self,
@@ -24,27 +77,59 @@ class StreamsPublisher:
         approximate: bool = True,
     ) -> None:
         """Publish one or more task events."""
-        batch: Iterable[TaskEvent]
-        if isinstance(events, TaskEvent):
-            batch = [events]
-        else:
-            batch = events
-
-        for event in batch:
-            fields = cast(dict[EncodableT, EncodableT], encode_event(event))
-            await self._client.redis.xadd(
-                self._stream,
-                fields,
-                maxlen=maxlen,
-                approximate=approximate,
-            )
+        entries = self._entries(events)
+        if not entries:
+            return
+        # One round-trip for the whole batch instead of one XADD each.
+        async with self._client.redis.pipeline(transaction=False) as pipe:
+            for stream, fields in entries:
+                pipe.xadd(
+                    stream,
+                    fields,
+                    maxlen=maxlen if maxlen is not None else self._maxlen,
+                    approximate=approximate,
+                )
+            await pipe.execute()
+
+    def _entries(
+        self,
+        events: TaskEvent | Sequence[TaskEvent],
+    ) -> list[tuple[str, dict[EncodableT, EncodableT]]]:
+        return _stream_entries(
+            [events] if isinstance(events, TaskEvent) else events,
+            stream=self._stream,
+            shards=self._shards,
+            envelope_size=self._envelope_size,
+            codec_version=self._codec_version,
+            compress_threshold=self._compress_threshold,
+        )
 
 
 class StreamsSyncPublisher:
     """Sync publisher for Redis streams."""
-    def __init__(self, client: SyncStreamsClient, stream: str) -> None:
+    def __init__(
+        self,
+        client: SyncStreamsClient,
+        stream: str,
+        *,
+        shards: int = 1,
+        maxlen: int | None = None,
+        codec_version: int | None = None,
+        compress_threshold: int | None = None,
+        envelope_size: int = 1,
+    ) -> None:
+        if envelope_size <= 0:
+            raise ValueError("envelope_size must be a positive integer")
         self._client = client
         self._stream = stream
+        self._shards = shards
+        # Safety cap applied when callers do not pass their own maxlen.
+        self._maxlen = maxlen
+        # None keeps the codec named by each event's own version.
+        self._codec_version = codec_version
+        self._compress_threshold = compress_threshold
+        # Up to this many events of one publish call share a stream entry.
+        self._envelope_size = envelope_size
 
     def publish(
         self,
@@ -54,20 +139,36 @@ class StreamsSyncPublisher:
         approximate: bool = True,
     ) -> None:
         """Publish one or more task events."""
-        batch: Iterable[TaskEvent]
-        if isinstance(events, TaskEvent):
-            batch = [events]
-        else:
-            batch = events
-
-        for event in batch:
-            fields = cast(dict[EncodableT, EncodableT], encode_event(event))
-            self._client.redis.xadd(
-                self._stream,
-                fields,
-                maxlen=maxlen,
-                approximate=approximate,
-            )
+        entries = self._entries(events)
+        if not entries:
+            return
+        # One round-trip for the whole batch instead of one XADD each.
+        with self._client.redis.pipeline(transaction=False) as pipe:
+            for stream, fields in entries:
+                pipe.xadd(
+                    stream,
+                    fields,
+                    maxlen=maxlen if maxlen is not None else self._maxlen,
+                    approximate=approximate,
+                )
+            pipe.execute()
+
+    def _entries(
+        self,
+        events: TaskEvent | Sequence[TaskEvent],
+    ) -> list[tuple[str, dict[EncodableT, EncodableT]]]:
+        return _stream_entries(
+            [events] if isinstance(events, TaskEvent) else events,
+            stream=self._stream,
+            shards=self._shards,
+            envelope_size=self._envelope_size,
+            codec_version=self._codec_version,
+            compress_threshold=self._compress_threshold,
+        )
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Return immediately; events are sent before ``publish`` returns."""
+        return True
 
     def close(self) -> None:
         """Close the underlying client connection."""
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from redis.exceptions import RedisError, ResponseError
+
+from src.app.infrastructure.streams.client import StreamsClient
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_id(stream_id: str) -> tuple[int, int]:
+    """Split a stream id into comparable (milliseconds, sequence) parts."""
+    millis, _, sequence = stream_id.partition("-")
+    return int(millis), int(sequence or 0)
+
+
+class StreamRetention:
+    """
+    Trim task event streams up to the oldest entry any consumer group still needs.
+
+    For each group the safe bound is its oldest pending entry, or its last
+    delivered id when nothing is pending; entries before the lowest bound
+    across groups were acknowledged everywhere and are removed with XTRIM MINID.
+    """
+    def __init__(
+        self,
+        client: StreamsClient,
+        *,
+        streams: list[str],
+        interval_ms: int,
+    ) -> None:
+        self._client = client
+        self._streams = streams
+        self._interval_ms = interval_ms
+        self._stop_event = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._trimmed_total = 0
+        self._stream_length = 0
+        self._stream_memory_bytes = 0
+        self._last_run_ts = 0.0
+
+    async def start(self) -> None:
+        """Start the periodic trimming loop."""
+        self._task = asyncio.create_task(self._run(), name="redis-stream-retention")
+
+    async def stop(self) -> None:
+        """Stop the trimming loop and close connections."""
+        self._stop_event.set()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        await self._client.close()
+
+    def metrics(self) -> dict[str, float]:
+        """Return stream size metrics gathered by the last trimming pass."""
+        return {
+            "stream_length": self._stream_length,
+            "stream_memory_bytes": self._stream_memory_bytes,
+            "trimmed_entries_total": self._trimmed_total,
+            "last_run_ts": self._last_run_ts,
+        }
+
+    async def _run(self) -> None:
+        """Trim and measure streams until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                await self.trim_once()
+            except asyncio.CancelledError:
+                break
+            except RedisError as exc:
+                logger.warning("Stream retention pass failed", extra={"error": str(exc)})
+            try:
+                await asyncio.sleep(self._interval_ms / 1000)
+            except asyncio.CancelledError:
+                break
+
+    async def trim_once(self) -> None:
+        """Trim every stream to its acknowledged position and refresh metrics."""
+        redis = self._client.redis
+        length = 0
+        memory = 0
+        for stream in self._streams:
+            min_id = await self._min_retained_id(stream)
+            if min_id is not None:
+                self._trimmed_total += await redis.xtrim(
+                    stream, minid=min_id, approximate=True
+                )
+            length += await redis.xlen(stream)
+            memory += await redis.memory_usage(stream) or 0
+        self._stream_length = length
+        self._stream_memory_bytes = memory
+        self._last_run_ts = time.time()
+
+    async def _min_retained_id(self, stream: str) -> str | None:
+        """Return the lowest id still needed by any group, or None to keep everything."""
+        redis = self._client.redis
+        try:
+            groups = await redis.xinfo_groups(stream)
+        except ResponseError:
+            # The stream does not exist yet.
+            return None
+        if not groups:
+            return None
+        bounds: list[str] = []
+        for group in groups:
+            if group["pending"]:
+                summary = await redis.xpending(stream, group["name"])
+                bounds.append(summary["min"])
+            else:
+                bounds.append(group["last-delivered-id"])
+        return min(bounds, key=_parse_id)
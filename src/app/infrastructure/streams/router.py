@@ -8,17 +8,41 @@ from src.app.domain.events.task_event import EventType, TaskEvent
 logger = logging.getLogger(__name__)
 
 EventHandler = Callable[[TaskEvent], Awaitable[None]]
+LifecycleHook = Callable[[], Awaitable[None]]
 
 
 class EventRouter:
     """Dispatch events to registered async handlers."""
     def __init__(self) -> None:
         self._handlers: dict[EventType, EventHandler] = {}
+        self._batch_hooks: list[LifecycleHook] = []
+        self._close_hooks: list[LifecycleHook] = []
 
     def register(self, event_type: EventType, handler: EventHandler) -> None:
         """Register a handler for an event type."""
         self._handlers[event_type] = handler
 
+    def on_batch_end(self, hook: LifecycleHook) -> None:
+        """Register a hook run after each dispatched batch, before it is acknowledged."""
+        self._batch_hooks.append(hook)
+
+    def on_close(self, hook: LifecycleHook) -> None:
+        """Register a hook run when the consumer stops."""
+        self._close_hooks.append(hook)
+
+    async def end_batch(self) -> None:
+        """Run the batch-end hooks."""
+        for hook in self._batch_hooks:
+            await hook()
+
+    async def close(self) -> None:
+        """Run the close hooks, logging failures so every hook gets its turn."""
+        for hook in self._close_hooks:
+            try:
+                await hook()
+            except Exception as exc:
+                logger.exception("Event router close hook failed", extra={"error": str(exc)})
+
     def get_handler(self, event_type: EventType) -> EventHandler | None:
         """Return the handler for an event type if registered."""
         return self._handlers.get(event_type)
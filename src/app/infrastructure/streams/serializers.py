@@ -1,47 +1,253 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
-from typing import Any, Mapping
+import zlib
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime
+from typing import Any, Protocol
 
+import msgpack
 from pydantic import ValidationError
 
 from src.app.domain.events.task_event import EventType, TaskEvent
 
+CODEC_JSON = 1
+CODEC_MSGPACK = 2
+COMPRESSION_ZLIB = "zlib"
+
+StreamFields = dict[str, str | int | float | bytes]
+
+
+class EventCodec(Protocol):
+    """Wire format for TaskEvent stream entries, identified by its version."""
+    version: int
+
+    def encode(self, event: TaskEvent, compress_threshold: int | None = None) -> StreamFields:
+        """Serialize an event; bodies over ``compress_threshold`` bytes are compressed."""
+
+    def decode(self, fields: Mapping[str, Any], trusted: bool = False) -> TaskEvent:
+        """Deserialize stream fields produced by ``encode``."""
+
 
 def _as_str(value: Any) -> str:
     """Normalize a value into a string."""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode("utf-8")
     return str(value)
 
 
-def encode_event(event: TaskEvent) -> dict[str, str | int | float | bytes]:
-    """Serialize a TaskEvent for Redis streams."""
-    return {
-        "event_id": event.event_id,
-        "type": event.type.value,
-        "task_id": event.task_id,
-        "ts": event.ts.isoformat(),
-        "payload": json.dumps(event.payload),
-    }
+def _as_bytes(value: Any) -> bytes:
+    """Return binary field data, which only a client without response decoding preserves."""
+    if not isinstance(value, (bytes, bytearray)):
+        raise ValueError("Binary event data must be read as bytes")
+    return bytes(value)
 
 
-def decode_event(fields: Mapping[bytes, Any] | Mapping[str, Any]) -> TaskEvent:
-    """Deserialize a TaskEvent from Redis stream fields."""
-    raw_payload = fields.get("payload")  # type: ignore[arg-type]
-    payload_str = _as_str(raw_payload)
+def _compress(body: bytes, fields: StreamFields, compress_threshold: int | None) -> bytes:
+    """Compress ``body`` when it exceeds the threshold and flag it in ``fields``."""
+    if compress_threshold is None or len(body) <= compress_threshold:
+        return body
+    fields["compression"] = COMPRESSION_ZLIB
+    return zlib.compress(body)
+
+
+def _decompress(body: Any, fields: Mapping[str, Any]) -> Any:
+    """Undo ``_compress`` for entries carrying the compression flag."""
+    compression = fields.get("compression")
+    if compression is None:
+        return body
+    if _as_str(compression) != COMPRESSION_ZLIB or not isinstance(body, (bytes, bytearray)):
+        raise ValueError(f"Unsupported event compression: {_as_str(compression)}")
     try:
-        payload = json.loads(payload_str)
-    except json.JSONDecodeError as exc:
-        raise ValueError("Invalid payload JSON") from exc
-
-    event_data = {
-        "event_id": _as_str(fields.get("event_id", "")),  # type: ignore[arg-type]
-        "type": EventType(_as_str(fields.get("type", ""))),  # type: ignore[arg-type]
-        "task_id": _as_str(fields.get("task_id", "")),  # type: ignore[arg-type]
-        "ts": datetime.fromisoformat(_as_str(fields.get("ts", ""))),  # type: ignore[arg-type]
-        "payload": payload,
-    }
+        return zlib.decompress(body)
+    except zlib.error as exc:
+        raise ValueError("Invalid compressed event body") from exc
+
+
+def _build(event_data: dict[str, Any], trusted: bool) -> TaskEvent:
+    if trusted:
+        # Fields were produced by our own encoder; skip pydantic validation.
+        return TaskEvent.model_construct(**event_data)
     try:
         return TaskEvent.model_validate(event_data)
     except ValidationError as exc:
         raise ValueError("Invalid event schema") from exc
+
+
+class JsonEventCodec:
+    """One stream field per envelope attribute with a JSON payload."""
+    version = CODEC_JSON
+
+    def encode(self, event: TaskEvent, compress_threshold: int | None = None) -> StreamFields:
+        fields: StreamFields = {
+            "version": self.version,
+            "event_id": event.event_id,
+            "type": event.type.value,
+            "task_id": event.task_id,
+            "ts": event.ts.isoformat(),
+        }
+        if event.seq is not None:
+            fields["seq"] = event.seq
+        payload = json.dumps(event.payload).encode("utf-8")
+        fields["payload"] = _compress(payload, fields, compress_threshold)
+        if event.binary is not None:
+            fields["binary"] = event.binary
+        return fields
+
+    def decode(self, fields: Mapping[str, Any], trusted: bool = False) -> TaskEvent:
+        payload_str = _as_str(_decompress(fields.get("payload"), fields))
+        try:
+            payload = json.loads(payload_str)
+        except json.JSONDecodeError as exc:
+            raise ValueError("Invalid payload JSON") from exc
+
+        event_data = {
+            "event_id": _as_str(fields.get("event_id", "")),
+            "type": EventType(_as_str(fields.get("type", ""))),
+            "task_id": _as_str(fields.get("task_id", "")),
+            "ts": datetime.fromisoformat(_as_str(fields.get("ts", ""))),
+            "version": self.version,
+            "payload": payload,
+        }
+        raw_seq = fields.get("seq")
+        if raw_seq is not None:
+            try:
+                event_data["seq"] = int(_as_str(raw_seq))
+            except ValueError as exc:
+                raise ValueError("Invalid event sequence") from exc
+        binary = fields.get("binary")
+        if binary is not None:
+            event_data["binary"] = _as_bytes(binary)
+        return _build(event_data, trusted)
+
+
+class MsgpackEventCodec:
+    """Whole envelope packed into a single msgpack field, timestamps as epoch microseconds."""
+    version = CODEC_MSGPACK
+
+    def encode(self, event: TaskEvent, compress_threshold: int | None = None) -> StreamFields:
+        ts_us = int(event.ts.timestamp() * 1_000_000)
+        values = [event.event_id, event.type.value, event.task_id, ts_us, event.seq, event.payload]
+        if event.binary is not None:
+            values.append(event.binary)
+        data = msgpack.packb(values, use_bin_type=True)
+        fields: StreamFields = {"version": self.version}
+        fields["data"] = _compress(data, fields, compress_threshold)
+        return fields
+
+    def decode(self, fields: Mapping[str, Any], trusted: bool = False) -> TaskEvent:
+        raw = _decompress(fields.get("data"), fields)
+        if not isinstance(raw, (bytes, bytearray)):
+            raise ValueError("Binary event data is missing")
+        try:
+            event_id, event_type, task_id, ts_us, seq, payload, *binary = msgpack.unpackb(
+                raw, raw=False
+            )
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ValueError("Invalid msgpack event") from exc
+        return _build(
+            {
+                "event_id": event_id,
+                "type": EventType(event_type),
+                "task_id": task_id,
+                "ts": datetime.fromtimestamp(ts_us / 1_000_000, tz=UTC),
+                "version": self.version,
+                "seq": seq,
+                "payload": payload,
+                "binary": _as_bytes(binary[0]) if binary else None,
+            },
+            trusted,
+        )
+
+
+_CODECS: dict[int, EventCodec] = {}
+
+
+def register_codec(codec: EventCodec) -> None:
+    """Make a codec available for its version on both encode and decode."""
+    _CODECS[codec.version] = codec
+
+
+def get_codec(version: int) -> EventCodec:
+    """Return the codec registered for ``version``."""
+    try:
+        return _CODECS[version]
+    except KeyError:
+        raise ValueError(f"Unsupported event codec version: {version}") from None
+
+
+register_codec(JsonEventCodec())
+register_codec(MsgpackEventCodec())
+
+
+def encode_event(
+    event: TaskEvent,
+    version: int | None = None,
+    *,
+    compress_threshold: int | None = None,
+) -> StreamFields:
+    """Serialize a TaskEvent for Redis streams with the codec for ``version``."""
+    codec = get_codec(version if version is not None else event.version)
+    return codec.encode(event, compress_threshold)
+
+
+def encode_events(
+    events: Sequence[TaskEvent],
+    version: int | None = None,
+    *,
+    compress_threshold: int | None = None,
+) -> StreamFields:
+    """
+    Pack several events into one stream entry (a multi-event envelope).
+
+    Each event is encoded with its codec as usual; the list of field maps is
+    stored as one msgpack ``events`` field, compressed as a whole when large.
+    """
+    inner = [encode_event(event, version) for event in events]
+    fields: StreamFields = {"batch": len(inner)}
+    fields["events"] = _compress(msgpack.packb(inner, use_bin_type=True), fields, compress_threshold)
+    return fields
+
+
+def decode_events(
+    fields: Mapping[bytes, Any] | Mapping[str, Any],
+    *,
+    trusted: bool = False,
+) -> list[TaskEvent]:
+    """Deserialize every event of a stream entry, single events and envelopes alike."""
+    normalized = {_as_str(key): value for key, value in fields.items()}
+    if "events" not in normalized:
+        return [_decode_normalized(normalized, trusted)]
+    body = _decompress(normalized["events"], normalized)
+    try:
+        inner = msgpack.unpackb(body, raw=False)
+    except (ValueError, TypeError, msgpack.UnpackException) as exc:
+        raise ValueError("Invalid event envelope") from exc
+    if not isinstance(inner, list):
+        raise ValueError("Invalid event envelope")
+    return [_decode_normalized(item, trusted) for item in inner]
+
+
+def decode_event(
+    fields: Mapping[bytes, Any] | Mapping[str, Any],
+    *,
+    trusted: bool = False,
+) -> TaskEvent:
+    """
+    Deserialize a TaskEvent from Redis stream fields, whatever codec wrote them.
+
+    ``trusted`` skips model validation for entries known to come from our own
+    publishers; malformed entries then surface later, in the handlers.
+    """
+    return _decode_normalized({_as_str(key): value for key, value in fields.items()}, trusted)
+
+
+def _decode_normalized(normalized: Mapping[str, Any], trusted: bool) -> TaskEvent:
+    """Decode one event whose field names are already strings."""
+    raw_version = normalized.get("version")
+    # Entries written before codecs were versioned carry no version field.
+    try:
+        version = int(_as_str(raw_version)) if raw_version is not None else CODEC_JSON
+    except ValueError as exc:
+        raise ValueError("Invalid event codec version") from exc
+    return get_codec(version).decode(normalized, trusted)
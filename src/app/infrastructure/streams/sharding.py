@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+import zlib
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+# Renew/release only while the lease still belongs to the caller.
+_RENEW_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def shard_index(task_id: str, shards: int) -> int:
+    """Return the shard a task id maps to; stable across processes."""
+    return zlib.crc32(task_id.encode("utf-8")) % shards
+
+
+def shard_stream(stream: str, index: int) -> str:
+    """Return the stream key of one shard."""
+    return f"{stream}:{index}"
+
+
+def shard_streams(stream: str, shards: int) -> list[str]:
+    """Return every stream key that carries events for ``stream``."""
+    if shards <= 1:
+        return [stream]
+    return [shard_stream(stream, index) for index in range(shards)]
+
+
+def stream_for_task(stream: str, task_id: str, shards: int) -> str:
+    """Return the stream a task's events are published to."""
+    if shards <= 1:
+        return stream
+    return shard_stream(stream, shard_index(task_id, shards))
+
+
+class ShardLeaseManager:
+    """
+    Hand out shard streams to API replicas through expiring Redis leases.
+
+    Each replica heartbeats into a membership set and holds at most its fair
+    share of shards, so a shard is read by one replica at a time and shards
+    of a replica that stops heartbeating are picked up once its leases expire.
+    Surplus shards are not released right away: they move to a draining set
+    whose leases stay renewed until the caller reports them drained through
+    ``release``, so a new owner never reads a shard whose earlier events are
+    still being handled here.
+    """
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        stream: str,
+        shards: int,
+        owner: str,
+        lease_ms: int,
+    ) -> None:
+        if shards <= 1:
+            raise ValueError("shard leases require at least two shards")
+        self._redis = redis
+        self._stream = stream
+        self._shards = shards
+        self._owner = owner
+        self._lease_ms = lease_ms
+        self._members_key = f"{stream}:consumers"
+        self._owned: set[int] = set()
+        self._draining: set[int] = set()
+
+    @property
+    def lease_ms(self) -> int:
+        """Return the lease duration in milliseconds."""
+        return self._lease_ms
+
+    @property
+    def all_streams(self) -> list[str]:
+        """Return every shard stream, leased or not."""
+        return shard_streams(self._stream, self._shards)
+
+    @property
+    def owned_streams(self) -> list[str]:
+        """Return the shard streams currently leased by this replica."""
+        return [shard_stream(self._stream, index) for index in sorted(self._owned)]
+
+    @property
+    def draining_streams(self) -> list[str]:
+        """Return the shard streams given up but not yet released by this replica."""
+        return [shard_stream(self._stream, index) for index in sorted(self._draining)]
+
+    def _lease_key(self, index: int) -> str:
+        return f"{self._stream}:lease:{index}"
+
+    async def refresh(self) -> list[str]:
+        """Heartbeat, renew held leases, and rebalance towards a fair share."""
+        now_ms = int(time.time() * 1000)
+        await self._redis.zadd(self._members_key, {self._owner: now_ms + self._lease_ms})
+        await self._redis.zremrangebyscore(self._members_key, "-inf", now_ms)
+        members = max(await self._redis.zcard(self._members_key), 1)
+        fair_share = math.ceil(self._shards / members)
+
+        for index in sorted(self._owned | self._draining):
+            renewed = await self._redis.eval(
+                _RENEW_LEASE, 1, self._lease_key(index), self._owner, self._lease_ms
+            )
+            if not renewed:
+                logger.warning("Lost shard lease", extra={"stream": self._stream, "shard": index})
+                self._owned.discard(index)
+                self._draining.discard(index)
+
+        # Stop reading surplus shards; they are released once drained so replicas
+        # that joined later can take them.
+        while len(self._owned) > fair_share:
+            index = max(self._owned)
+            self._owned.discard(index)
+            self._draining.add(index)
+
+        for index in range(self._shards):
+            if len(self._owned) >= fair_share:
+                break
+            if index in self._owned:
+                continue
+            if index in self._draining:
+                # Still leased here, so it can be read again without a new lease.
+                self._draining.discard(index)
+                self._owned.add(index)
+                continue
+            acquired = await self._redis.set(
+                self._lease_key(index), self._owner, nx=True, px=self._lease_ms
+            )
+            if acquired:
+                self._owned.add(index)
+        return self.owned_streams
+
+    async def release(self, streams: list[str]) -> None:
+        """Release the leases of draining shards whose events were all handled."""
+        for index in sorted(self._draining):
+            if shard_stream(self._stream, index) not in streams:
+                continue
+            await self._redis.eval(_RELEASE_LEASE, 1, self._lease_key(index), self._owner)
+            self._draining.discard(index)
+
+    async def release_all(self) -> None:
+        """Release every held lease and leave the membership set."""
+        for index in sorted(self._owned | self._draining):
+            await self._redis.eval(_RELEASE_LEASE, 1, self._lease_key(index), self._owner)
+        self._owned.clear()
+        self._draining.clear()
+        await self._redis.zrem(self._members_key, self._owner)
@@ -1,16 +1,18 @@
 from fastapi import FastAPI
 
+from src.app.presentation.metrics import router as metrics_router
 from src.app.presentation.naive_worker_routes import router as naive_router
 from src.app.presentation.routes import router as api_router
 from src.app.presentation.websockets import router as ws_router
 from src.setup.api_config import ApiSettings
 from src.setup.app_config import configure_di
-from src.setup.stream_config import configure_stream_consumer
+from src.setup.stream_config import configure_stream_consumer, configure_stream_retention
 
 settings = ApiSettings()
 configure_di()
 
 consumer = configure_stream_consumer()
+retention = configure_stream_retention()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -19,11 +21,13 @@ app = FastAPI(
 )
 
 async def _start_consumer() -> None:
-    # Start the Redis streams consumer alongside the API process.
+    # Start the Redis streams consumer and stream trimming alongside the API process.
     await consumer.start()
+    await retention.start()
 
 async def _stop_consumer() -> None:
     # Ensure the consumer stops cleanly on shutdown to release Redis connections.
+    await retention.stop()
     await consumer.stop()
 
 app.add_event_handler("startup", _start_consumer)
@@ -32,3 +36,4 @@ app.add_event_handler("shutdown", _stop_consumer)
 app.include_router(api_router, prefix="")
 app.include_router(naive_router, prefix="")
 app.include_router(ws_router, prefix="")
+app.include_router(metrics_router, prefix="")
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+
+from fastapi import APIRouter
+
+router = APIRouter(tags=["metrics"])
+
+MetricsProvider = Callable[[], Mapping[str, float]]
+
+
+class MetricsRegistry:
+    """Collect metric snapshots from runtime components under a name."""
+    def __init__(self) -> None:
+        self._providers: dict[str, MetricsProvider] = {}
+
+    def register(self, name: str, provider: MetricsProvider) -> None:
+        """Register (or replace) the snapshot provider for a component."""
+        self._providers[name] = provider
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Return the current metrics of every registered component."""
+        return {name: dict(provider()) for name, provider in self._providers.items()}
+
+
+metrics_registry = MetricsRegistry()
+
+
+@router.get("/metrics", summary="Runtime metrics")
+async def get_metrics() -> dict[str, dict[str, float]]:
+    """
+    Return metric snapshots of the streaming pipeline components.
+    """
+    return metrics_registry.snapshot()
@@ -7,12 +7,16 @@ from uuid import uuid4
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from src.app.application.state_table import TaskStateTable
+from src.app.presentation.metrics import metrics_registry
 from src.naive_worker.compute_pi.storage import ComputePiStore
 from src.naive_worker.document_analysis.storage import DocumentAnalysisStore
 
 router = APIRouter(prefix="/naive", tags=["naive"])
 logger = logging.getLogger(__name__)
-_CPU_MS_NAIVE: dict[str, float] = {}
+# Polled tasks report no terminal event here, so entries are only ever evicted.
+_CPU_MS_NAIVE: TaskStateTable[float] = TaskStateTable(capacity=10_000, ttl_s=3600.0)
+metrics_registry.register("naive_cpu_state", _CPU_MS_NAIVE.metrics)
 
 
 class NaivePiRequest(BaseModel):
@@ -73,8 +77,8 @@ def naive_check_progress(task_id: str = Query(..., description="Naive task id"))
     if task.progress_total:
         percent = task.progress_current / task.progress_total
     elapsed_ms = (time.process_time() - start_cpu) * 1000
-    total_ms = _CPU_MS_NAIVE.get(task_id, 0.0) + elapsed_ms
-    _CPU_MS_NAIVE[task_id] = total_ms
+    total_ms = (_CPU_MS_NAIVE.get(task_id) or 0.0) + elapsed_ms
+    _CPU_MS_NAIVE.set(task_id, total_ms)
     return {
         "state": task.status,
         "progress": {
@@ -98,8 +102,8 @@ def naive_task_result(task_id: str = Query(..., description="Naive task id")):
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     elapsed_ms = (time.process_time() - start_cpu) * 1000
-    total_ms = _CPU_MS_NAIVE.get(task_id, 0.0) + elapsed_ms
-    _CPU_MS_NAIVE[task_id] = total_ms
+    total_ms = (_CPU_MS_NAIVE.get(task_id) or 0.0) + elapsed_ms
+    _CPU_MS_NAIVE.set(task_id, total_ms)
     response = {
         "task_id": task.task_id,
         "partial_result": task.result,
@@ -145,8 +149,8 @@ def naive_document_status(task_id: str = Query(..., description="Naive task id")
     if task.progress_total:
         percent = task.progress_current / task.progress_total
     elapsed_ms = (time.process_time() - start_cpu) * 1000
-    total_ms = _CPU_MS_NAIVE.get(task_id, 0.0) + elapsed_ms
-    _CPU_MS_NAIVE[task_id] = total_ms
+    total_ms = (_CPU_MS_NAIVE.get(task_id) or 0.0) + elapsed_ms
+    _CPU_MS_NAIVE.set(task_id, total_ms)
     return {
         "state": task.status,
         "progress": {
@@ -180,8 +184,8 @@ def naive_document_snippets(task_id: str = Query(...), after: int | None = None)
     if snippets:
         store.mark_doc_snippets_delivered(task_id, snippets[-1]["id"])
     elapsed_ms = (time.process_time() - start_cpu) * 1000
-    total_ms = _CPU_MS_NAIVE.get(task_id, 0.0) + elapsed_ms
-    _CPU_MS_NAIVE[task_id] = total_ms
+    total_ms = (_CPU_MS_NAIVE.get(task_id) or 0.0) + elapsed_ms
+    _CPU_MS_NAIVE.set(task_id, total_ms)
     last_seen_id: int = snippets[-1]["id"] if snippets else last_id
     response = {
         "snippets": snippets,
@@ -6,11 +6,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from src.app.application.services import TaskService
-from src.app.domain.exceptions import TaskNotFoundError
+from src.app.domain.exceptions import InvalidCursorError, TaskNotFoundError
 from src.app.domain.models import (
     ComputePiPayload,
     DocumentAnalysisPayload,
+    TaskPage,
     TaskResult,
+    TaskState,
     TaskType,
 )
 from src.app.domain.models.task import Task
@@ -139,3 +141,41 @@ async def get_task_result(
     except Exception as exc:
         logger.exception("Failed to get result for task %s: %s", task_id, exc)
         raise HTTPException(status_code=500)  # noqa: B904
+
+
+@router.get(
+    "/tasks",
+    response_model=TaskPage,
+    summary="List tasks",
+    description=(
+        "List tasks newest first, optionally filtered by type and state. "
+        "Pass `next_cursor` of a page as `cursor` to fetch the following page."
+    ),
+    responses={
+        400: {
+            "description": "Invalid cursor.",
+        },
+        500: {
+            "description": "Internal server error.",
+        },
+    },
+)
+async def list_tasks(
+    svc: Annotated[TaskService, Depends(get_task_service)],
+    task_type: Annotated[TaskType | None, Query(description="Only tasks of this type")] = None,
+    state: Annotated[TaskState | None, Query(description="Only tasks in this state")] = None,
+    limit: Annotated[int, Query(ge=1, le=200, description="Page size")] = 50,
+    cursor: Annotated[
+        str | None, Query(description="Cursor returned with the previous page")
+    ] = None,
+):
+    """
+    Reads one page of tasks from storage.
+    """
+    try:
+        return await svc.list_tasks(task_type=task_type, state=state, limit=limit, cursor=cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Failed to list tasks: %s", exc)
+        raise HTTPException(status_code=500)  # noqa: B904
@@ -1,22 +1,45 @@
 from __future__ import annotations
 
+import json
+import zlib
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from src.app.application.broadcaster import TaskStatusBroadcaster
 from src.app.domain.events.task_event import TaskEvent
+from src.setup.api_config import ApiSettings
 
 router = APIRouter(tags=["ws"])
 
+_settings = ApiSettings()
+
+WS_COMPRESSION_ZLIB = "zlib"
+
+# Every binary frame starts with one of these bytes so clients can tell its content apart.
+WS_FRAME_COMPRESSED_JSON = b"\x01"
+WS_FRAME_BINARY_CHUNK = b"\x02"
+
 
 class TaskConnectionManager:
-    def __init__(self) -> None:
+    def __init__(self, compress_threshold: int = 1024) -> None:
         self._connections: dict[str, set[WebSocket]] = {}
-
-    async def create_task_session(self, task_id: str, websocket: WebSocket) -> None:
+        # Sockets that asked for zlib-compressed binary frames.
+        self._compressed: set[WebSocket] = set()
+        self._compress_threshold = compress_threshold
+
+    async def create_task_session(
+        self,
+        task_id: str,
+        websocket: WebSocket,
+        compression: str | None = None,
+    ) -> None:
         await websocket.accept()
         self._connections.setdefault(task_id, set()).add(websocket)
+        if compression == WS_COMPRESSION_ZLIB:
+            self._compressed.add(websocket)
 
     def disconnect(self, task_id: str, websocket: WebSocket) -> None:
+        self._compressed.discard(websocket)
         connections = self._connections.get(task_id)
         if not connections:
             return
@@ -24,11 +47,37 @@ class TaskConnectionManager:
         if not connections:
             self._connections.pop(task_id, None)
 
-    async def broadcast(self, task_id: str, payload: dict[str, object]) -> None:
+    async def broadcast(
+        self,
+        task_id: str,
+        payload: dict[str, object],
+        binary: bytes | None = None,
+    ) -> None:
+        """
+        Send a JSON message, followed by ``binary`` as a binary chunk frame when given.
+
+        Binary frames carry a leading frame-type byte: ``WS_FRAME_COMPRESSED_JSON``
+        before a zlib-compressed JSON message, ``WS_FRAME_BINARY_CHUNK`` before
+        the raw bytes of a result chunk.
+        """
         connections = list(self._connections.get(task_id, set()))
+        if not connections:
+            return
+        chunk_frame = WS_FRAME_BINARY_CHUNK + binary if binary is not None else None
+        # Serialize once for all subscribers and compress at most once.
+        text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        compress = len(text) > self._compress_threshold
+        compressed: bytes | None = None
         for websocket in connections:
             try:
-                await websocket.send_json(payload)
+                if compress and websocket in self._compressed:
+                    if compressed is None:
+                        compressed = WS_FRAME_COMPRESSED_JSON + zlib.compress(text.encode("utf-8"))
+                    await websocket.send_bytes(compressed)
+                else:
+                    await websocket.send_text(text)
+                if chunk_frame is not None:
+                    await websocket.send_bytes(chunk_frame)
             except RuntimeError:
                 self.disconnect(task_id, websocket)
 
@@ -48,6 +97,7 @@ class WebSocketStatusBroadcaster(TaskStatusBroadcaster):
         )
 
     async def broadcast_result_chunk(self, event: TaskEvent) -> None:
+        # Binary chunks go out as a JSON header frame followed by the raw bytes.
         await self._manager.broadcast(
             event.task_id,
             {
@@ -55,15 +105,21 @@ class WebSocketStatusBroadcaster(TaskStatusBroadcaster):
                 "task_id": event.task_id,
                 "payload": event.payload,
             },
+            event.binary,
         )
 
 
-connection_manager = TaskConnectionManager()
+connection_manager = TaskConnectionManager(compress_threshold=_settings.WS_COMPRESS_THRESHOLD)
 
 
 @router.websocket("/ws/tasks/{task_id}")
-async def task_updates(websocket: WebSocket, task_id: str) -> None:
-    await connection_manager.create_task_session(task_id, websocket)
+async def task_updates(
+    websocket: WebSocket,
+    task_id: str,
+    compression: str | None = None,
+) -> None:
+    # Clients opting in with ?compression=zlib get large messages as compressed binary frames.
+    await connection_manager.create_task_session(task_id, websocket, compression)
     try:
         while True:
             await websocket.receive_text()
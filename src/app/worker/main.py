@@ -1,7 +1,29 @@
 import os
 
+from celery.signals import task_postrun, worker_process_shutdown, worker_shutdown
+
 from src.app.infrastructure.celery.app import celery_app
-from src.setup.stream_config import configure_stream_publisher
+from src.setup.stream_config import (
+    close_stream_publisher,
+    configure_stream_publisher,
+    sync_stream_publisher,
+)
+
+# Upper bound for waiting on queued events when a task ends or the worker stops.
+PUBLISH_FLUSH_TIMEOUT_SEC = 30.0
+
+
+@task_postrun.connect
+def flush_task_events(**kwargs) -> None:
+    """Secure every event a task reported before its worker takes the next one."""
+    sync_stream_publisher(PUBLISH_FLUSH_TIMEOUT_SEC)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_task_events(**kwargs) -> None:
+    """Drain queued events before a pool process or the worker exits."""
+    close_stream_publisher(PUBLISH_FLUSH_TIMEOUT_SEC)
 
 
 def main() -> None:
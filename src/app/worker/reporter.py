@@ -1,78 +1,265 @@
 from __future__ import annotations
 
+import json
+import logging
+import threading
+import time
 from collections.abc import Iterable
 from typing import Any, cast
 
 import inject
 
 from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
 from src.app.domain.repositories import TaskEventPublisherRepository
 
+logger = logging.getLogger(__name__)
+
+_TERMINAL_STATES = {TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELLED}
+
 
 class TaskReporter:
-    """Publish task events to the stream."""
+    """
+    Publish task events to the stream.
+
+    Every event carries a per-task sequence number. The counter is seeded from
+    the wall clock in microseconds, so a retried task reporting from a new
+    process keeps increasing past what an earlier attempt already sent.
+
+    Status reports are throttled: a running status is published only once
+    ``status_interval_s`` passed and progress moved by ``status_delta`` since
+    the last published one. The first status, state changes, terminal states
+    and full progress always go out; dropped reports are counted.
+    """
 
     def __init__(
         self,
         task_id: str,
         publisher: TaskEventPublisherRepository | None = None,
+        *,
+        status_interval_s: float = 0.0,
+        status_delta: float = 0.0,
     ) -> None:
         self._task_id = task_id
         self._publisher = publisher or cast(
             TaskEventPublisherRepository,
             inject.instance(TaskEventPublisherRepository),
         )
+        self._seq = time.time_ns() // 1000
+        self._status_interval_s = status_interval_s
+        self._status_delta = status_delta
+        self._last_status: tuple[TaskState, float, float] | None = None
+        self._suppressed_statuses = 0
+        # Chunk linger threads publish too; sequence numbers must follow publish order.
+        self._lock = threading.RLock()
+
+    @property
+    def suppressed_statuses(self) -> int:
+        """Return how many status reports were throttled away."""
+        return self._suppressed_statuses
 
     def report_status(self, status: TaskStatus) -> None:
-        event = TaskEvent.status(self._task_id, status)
-        self._publish(event)
+        now = time.monotonic()
+        if not self._should_report(status, now):
+            self._suppressed_statuses += 1
+            return
+        self._last_status = (status.state, status.progress.percentage or 0.0, now)
+        if status.state in _TERMINAL_STATES and self._suppressed_statuses:
+            logger.debug(
+                "Suppressed task status reports",
+                extra={"task_id": self._task_id, "count": self._suppressed_statuses},
+            )
+        with self._lock:
+            event = TaskEvent.status(self._task_id, status, seq=self._next_seq())
+            self._publish(event)
 
     def report_result(self, result_snapshot: dict[str, Any]) -> None:
-        event = TaskEvent.result(self._task_id, result_snapshot)
-        self._publish(event)
+        with self._lock:
+            event = TaskEvent.result(self._task_id, result_snapshot, seq=self._next_seq())
+            self._publish(event)
+
+    def report_result_chunk(
+        self,
+        batch_size: int = 1,
+        *,
+        max_bytes: int | None = None,
+        linger_s: float | None = None,
+    ) -> ResultChunkReporter:
+        return ResultChunkReporter(self, batch_size, max_bytes=max_bytes, linger_s=linger_s)
+
+    def _should_report(self, status: TaskStatus, now: float) -> bool:
+        if self._last_status is None:
+            return True
+        last_state, last_pct, last_ts = self._last_status
+        pct = status.progress.percentage or 0.0
+        if status.state != last_state or status.state in _TERMINAL_STATES or pct >= 1.0:
+            return True
+        return (
+            now - last_ts >= self._status_interval_s
+            and abs(pct - last_pct) >= self._status_delta
+        )
 
-    def report_result_chunk(self, batch_size: int = 1) -> ResultChunkReporter:
-        return ResultChunkReporter(self, batch_size)
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
 
-    def _publish(self, event: TaskEvent) -> None:
-        self._publisher.publish(event)
+    def _publish(self, events: TaskEvent | list[TaskEvent]) -> None:
+        self._publisher.publish(events)
 
 
 class ResultChunkReporter:
-    def __init__(self, reporter: TaskReporter, batch_size: int) -> None:
+    """
+    Group emitted items into result chunk events.
+
+    A chunk is published once it holds ``batch_size`` items, once its items
+    serialize to ``max_bytes`` or more, or once its oldest item waited
+    ``linger_s``; an item that would push a chunk past ``max_bytes`` starts a
+    new one. Count and size are checked as items arrive; with ``linger_s`` set,
+    a background thread also publishes a pending chunk once it lingered that
+    long, so a stalled producer does not hold it back.
+    """
+
+    def __init__(
+        self,
+        reporter: TaskReporter,
+        batch_size: int,
+        *,
+        max_bytes: int | None = None,
+        linger_s: float | None = None,
+    ) -> None:
         if batch_size <= 0:
             raise ValueError("batch_size must be a positive integer")
         self._reporter = reporter
         self._batch_size = batch_size
+        self._max_bytes = max_bytes
+        self._linger_s = linger_s
         self._chunk_index = 0
         self._batch: list[Any] = []
+        self._batch_bytes = 0
+        self._batch_started = 0.0
+        # Shares the reporter lock, so the linger thread never interleaves with other reports.
+        self._cond = threading.Condition(reporter._lock)
+        self._closed = False
+        self._linger_thread: threading.Thread | None = None
+        # Chunks the linger thread failed to publish; they go out ahead of the next chunks.
+        self._unpublished: list[TaskEvent] = []
 
     def emit(self, item: Any) -> None:
-        self._batch.append(item)
-        if len(self._batch) >= self._batch_size:
-            self._flush(is_last=False)
+        with self._cond:
+            self._publish_chunks(self._add(item))
 
     def extend(self, items: Iterable[Any]) -> None:
-        for item in items:
-            self.emit(item)
-        
+        # Chunks filled by one call go out in a single publish so they share a round-trip.
+        with self._cond:
+            chunks: list[TaskEvent] = []
+            for item in items:
+                chunks.extend(self._add(item))
+            self._publish_chunks(chunks)
+
+    def emit_bytes(self, data: bytes) -> None:
+        """Publish ``data`` as its own binary chunk, after any items still pending."""
+        with self._cond:
+            chunks = [self._take_chunk(is_last=False)] if self._batch else []
+            chunks.append(self._take_chunk(is_last=False, data=data))
+            self._publish_chunks(chunks)
+
+    def _publish_chunks(self, chunks: list[TaskEvent]) -> None:
+        """Publish chunks after any the linger thread failed to send; errors reach the caller."""
+        if self._unpublished:
+            chunks = [*self._unpublished, *chunks]
+            self._unpublished.clear()
+        if chunks:
+            self._reporter._publish(chunks)
+
+    def _add(self, item: Any) -> list[TaskEvent]:
+        """Append an item and return the chunks it completed."""
+        chunks: list[TaskEvent] = []
+        size = _item_size(item) if self._max_bytes is not None else 0
+        if (
+            self._batch
+            and self._max_bytes is not None
+            and self._batch_bytes + size > self._max_bytes
+        ):
+            chunks.append(self._take_chunk(is_last=False))
+        now = time.monotonic()
+        if not self._batch:
+            self._batch_started = now
+            self._arm_linger()
+        self._batch.append(item)
+        self._batch_bytes += size
+        if (
+            len(self._batch) >= self._batch_size
+            or (self._max_bytes is not None and self._batch_bytes >= self._max_bytes)
+            or (self._linger_s is not None and now - self._batch_started >= self._linger_s)
+        ):
+            chunks.append(self._take_chunk(is_last=False))
+        return chunks
+
+    def _arm_linger(self) -> None:
+        """Wake the linger thread for a new pending chunk, starting it on first use."""
+        if self._linger_s is None:
+            return
+        if self._linger_thread is None:
+            self._linger_thread = threading.Thread(
+                target=self._linger, name="result-chunk-linger", daemon=True
+            )
+            self._linger_thread.start()
+        self._cond.notify_all()
+
+    def _linger(self) -> None:
+        """Publish pending chunks whose oldest item waited ``linger_s``, until closed."""
+        assert self._linger_s is not None
+        with self._cond:
+            while not self._closed:
+                if not self._batch:
+                    self._cond.wait()
+                    continue
+                remaining = self._batch_started + self._linger_s - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                chunk = self._take_chunk(is_last=False)
+                try:
+                    self._reporter._publish(chunk)
+                except Exception:
+                    # Nobody waits on this thread, so the producer's next call retries
+                    # the chunk and surfaces a lasting failure to the task.
+                    logger.exception(
+                        "Failed to publish lingering result chunk",
+                        extra={"task_id": self._reporter._task_id},
+                    )
+                    self._unpublished.append(chunk)
 
     def _flush(self, is_last: bool) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            self._publish_chunks([self._take_chunk(is_last)])
+        if self._linger_thread is not None:
+            self._linger_thread.join()
+
+    def _take_chunk(self, is_last: bool, data: bytes | None = None) -> TaskEvent:
         event = TaskEvent.result_chunk(
             self._reporter._task_id,
             str(self._chunk_index),
-            list(self._batch),
+            list(self._batch) if data is None else data,
             is_last=is_last,
+            seq=self._reporter._next_seq(),
         )
-        self._reporter._publish(event)
-        if is_last:
-            return
-        self._chunk_index += 1
-        self._batch.clear()
+        if not is_last:
+            self._chunk_index += 1
+            self._batch.clear()
+            self._batch_bytes = 0
+        return event
 
     def __enter__(self) -> ResultChunkReporter:
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
         self._flush(is_last=True)
+
+
+def _item_size(item: Any) -> int:
+    """Approximate the serialized size of a chunk item in bytes."""
+    return len(json.dumps(item, default=str, separators=(",", ":")).encode("utf-8"))
@@ -22,14 +22,22 @@ def get_pi(digits: int) -> str:
 @celery_app.task(name="compute_pi", bind=True)
 def compute_pi(self, payload: dict) -> dict:
     """Compute pi and stream digits with periodic status updates."""
-    reporter = TaskReporter(self.request.id)
+    reporter = TaskReporter(
+        self.request.id,
+        status_interval_s=_settings.STATUS_MIN_INTERVAL_SEC,
+        status_delta=_settings.STATUS_MIN_DELTA,
+    )
     payload_data = payload["payload"]
     digits: int = payload_data["digits"]
     pi: str = get_pi(digits)
 
     total = len(pi)
     start_time = time.monotonic()
-    with reporter.report_result_chunk(batch_size=1) as chunks:
+    with reporter.report_result_chunk(
+        batch_size=_settings.RESULT_CHUNK_MAX_ITEMS,
+        max_bytes=_settings.RESULT_CHUNK_MAX_BYTES,
+        linger_s=_settings.RESULT_CHUNK_LINGER_SEC,
+    ) as chunks:
         for k, digit in enumerate(pi):
             sleep_time = random.uniform(0.1, 0.5)
             # Delay simulating heavy computation.
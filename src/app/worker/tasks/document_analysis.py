@@ -13,6 +13,7 @@ from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
 from src.app.infrastructure.celery.app import celery_app
 from src.app.worker.reporter import ResultChunkReporter, TaskReporter
+from src.setup.worker_config import get_worker_settings
 
 MIN_LINES_PER_CHUNK = 50
 MAX_LINES_PER_CHUNK = 300
@@ -21,6 +22,7 @@ MAX_SNIPPETS_PER_CHUNK = 2000
 DEFAULT_DOWNLOAD_DIR = "/data/books"
 
 logger = logging.getLogger(__name__)
+_settings = get_worker_settings()
 
 
 def _emit_snippet(
@@ -115,7 +117,11 @@ def _report_running_status(
 @celery_app.task(name="document_analysis", bind=True)
 def document_analysis(self, payload: dict) -> dict:
     """Scan a document for keywords and stream snippet hits."""
-    reporter = TaskReporter(self.request.id)
+    reporter = TaskReporter(
+        self.request.id,
+        status_interval_s=_settings.STATUS_MIN_INTERVAL_SEC,
+        status_delta=_settings.STATUS_MIN_DELTA,
+    )
     payload_data = payload.get("payload") or {}
     document_path = payload_data.get("document_path")
     document_url = payload_data.get("document_url")
@@ -154,7 +160,11 @@ def document_analysis(self, payload: dict) -> dict:
         )
     )
 
-    with reporter.report_result_chunk(batch_size=1) as chunks:
+    with reporter.report_result_chunk(
+        batch_size=_settings.RESULT_CHUNK_MAX_ITEMS,
+        max_bytes=_settings.RESULT_CHUNK_MAX_BYTES,
+        linger_s=_settings.RESULT_CHUNK_LINGER_SEC,
+    ) as chunks:
         with open(document_path, "rb") as handle:
             while True:
                 # Read a variable number of lines to simulate uneven workload.
@@ -6,5 +6,7 @@ class ApiSettings(BaseSettings):
     MAX_DIGITS: int = 2000
     APP_NAME: str = "asynctaskhub-pi"
     APP_VERSION: str = "0.1.0"
+    # WebSocket messages longer than this many characters go to zlib clients compressed.
+    WS_COMPRESS_THRESHOLD: int = 1024
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
@@ -1,10 +1,12 @@
 import inject
 
 from src.app.application.broadcaster import TaskStatusBroadcaster
+from src.app.application.storage_cache import CachedStorageRepository
 from src.app.domain.repositories import StorageRepository, TaskManagerRepository
 from src.app.infrastructure.celery.repositories import CeleryTaskManager
 from src.app.infrastructure.postgres.orm import PostgresOrm
 from src.app.infrastructure.postgres.repositories import PostgresStorageRepository
+from src.app.presentation.metrics import metrics_registry
 from src.app.presentation.websockets import WebSocketStatusBroadcaster, connection_manager
 from src.setup.db_config import DatabaseSettings
 
@@ -13,8 +15,17 @@ def _config(binder: inject.Binder) -> None:
     """Bind domain interfaces to concrete implementations."""
     db_settings = DatabaseSettings()  # type: ignore[call-arg]
     orm = PostgresOrm(db_settings.DATABASE_URL)
+    storage: StorageRepository = PostgresStorageRepository(orm)
+    if db_settings.STORAGE_CACHE_CAPACITY > 0:
+        cache = CachedStorageRepository(
+            storage,
+            capacity=db_settings.STORAGE_CACHE_CAPACITY,
+            ttl_s=db_settings.STORAGE_CACHE_TTL_SEC,
+        )
+        metrics_registry.register("storage_cache", cache.metrics)
+        storage = cache
     binder.bind(TaskManagerRepository, CeleryTaskManager())
-    binder.bind(StorageRepository, PostgresStorageRepository(orm))
+    binder.bind(StorageRepository, storage)
     binder.bind(TaskStatusBroadcaster, WebSocketStatusBroadcaster(connection_manager))
 
 
@@ -4,5 +4,9 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class DatabaseSettings(BaseSettings):
     """Configuration for database connectivity."""
     DATABASE_URL: str
+    # In-process cache of task statuses and results read by the API; 0 disables it.
+    STORAGE_CACHE_CAPACITY: int = 10000
+    # How long another process's writes can stay invisible to cached reads.
+    STORAGE_CACHE_TTL_SEC: float = 1.0
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
@@ -1,21 +1,35 @@
+import logging
+
 import inject
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from src.app.application.handlers import TaskEventHandler
 from src.app.domain.events.task_event import EventType
 from src.app.domain.repositories import TaskEventPublisherRepository
+from src.app.infrastructure.streams.background import BackgroundStreamsPublisher
 from src.app.infrastructure.streams.client import StreamsClient, SyncStreamsClient
 from src.app.infrastructure.streams.consumer import (
     GROUP_API,
     STREAM_TASK_EVENTS,
+    STREAM_TASK_EVENTS_DLQ,
     StreamsConsumer,
     consumer_name,
 )
+from src.app.infrastructure.streams.dedup import EventDeduplicator
+from src.app.infrastructure.streams.outbox import OutboxStreamsPublisher
 from src.app.infrastructure.streams.publisher import StreamsSyncPublisher
+from src.app.infrastructure.streams.retention import StreamRetention
 from src.app.infrastructure.streams.router import EventRouter
+from src.app.infrastructure.streams.sharding import ShardLeaseManager, shard_streams
+from src.app.presentation.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+StreamPublisher = StreamsSyncPublisher | BackgroundStreamsPublisher | OutboxStreamsPublisher
 
 _stream_consumer: StreamsConsumer | None = None
-_stream_publisher: StreamsSyncPublisher | None = None
+_stream_publisher: StreamPublisher | None = None
+_stream_retention: StreamRetention | None = None
 
 
 class StreamSettings(BaseSettings):
@@ -26,19 +40,71 @@ class StreamSettings(BaseSettings):
     CONSUMER_NAME: str | None = None
     BLOCK_MS: int = 5000
     COUNT: int = 10
-    RECLAIM_PENDING: bool = False
+    RECLAIM_PENDING: bool = True
     RECLAIM_IDLE_MS: int = 60000
+    RECLAIM_INTERVAL_MS: int = 30000
+    RECLAIM_COUNT: int = 100
+    MAX_DELIVERIES: int = 5
+    DLQ_STREAM_NAME: str = STREAM_TASK_EVENTS_DLQ
+    BUFFER_HIGH_WATERMARK: int = 1000
+    BUFFER_LOW_WATERMARK: int = 250
+    COALESCE_STATUS: bool = True
+    STREAM_SHARDS: int = 1
+    SHARD_LEASE_MS: int = 15000
+    STREAM_MAXLEN: int | None = None
+    # 1 = JSON fields, 2 = msgpack; consumers decode both, so switch once all replicas run this code.
+    STREAM_CODEC_VERSION: int = 1
+    # Event bodies larger than this many bytes are zlib-compressed; None disables compression.
+    STREAM_COMPRESS_THRESHOLD: int | None = None
+    # Events of one publish call packed into a single stream entry; 1 disables envelopes.
+    STREAM_ENVELOPE_SIZE: int = 1
+    # Workers queue events in memory and a background thread publishes them in batches.
+    PUBLISH_IN_BACKGROUND: bool = True
+    PUBLISH_QUEUE_SIZE: int = 10000
+    PUBLISH_BATCH_SIZE: int = 100
+    PUBLISH_LINGER_MS: int = 10
+    # Failed background batches are retried this often, backing off from PUBLISH_RETRY_MS.
+    PUBLISH_MAX_RETRIES: int = 5
+    PUBLISH_RETRY_MS: int = 200
+    # When set, workers append events to segment files here first and drain them to Redis.
+    PUBLISH_OUTBOX_DIR: str | None = None
+    PUBLISH_OUTBOX_MAX_BYTES: int = 256 * 1024 * 1024
+    PUBLISH_OUTBOX_SEGMENT_BYTES: int = 8 * 1024 * 1024
+    PUBLISH_OUTBOX_RETRY_MS: int = 1000
+    RETENTION_INTERVAL_MS: int = 60000
+    DEDUP_CAPACITY: int = 100000
+    DEDUP_SHARED: bool = False
+    DEDUP_TTL_SECONDS: int = 3600
+    DISPATCH_CONCURRENCY: int = 16
+    # Skip pydantic validation of events from our own workers until they are persisted.
+    TRUSTED_EVENTS: bool = False
+    # 0 writes buffered statuses at the end of each consumer batch; otherwise at most this often.
+    STATUS_FLUSH_INTERVAL_MS: int = 0
+    # Per-task handler state is capped and forgotten after this long without events.
+    TASK_STATE_CAPACITY: int = 100000
+    TASK_STATE_TTL_SEC: float | None = 3600.0
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
-def build_event_router() -> EventRouter:
+def build_event_router(settings: StreamSettings | None = None) -> EventRouter:
     """Build an event router wired to the task event handler."""
+    if settings is None:
+        settings = StreamSettings()
     router = EventRouter()
-    handler = TaskEventHandler()
+    handler = TaskEventHandler(
+        trusted_events=settings.TRUSTED_EVENTS,
+        status_flush_interval_s=settings.STATUS_FLUSH_INTERVAL_MS / 1000,
+        task_state_capacity=settings.TASK_STATE_CAPACITY,
+        task_state_ttl_s=settings.TASK_STATE_TTL_SEC,
+    )
     router.register(EventType.TASK_STATUS, handler.handle_status_event)
     router.register(EventType.TASK_RESULT, handler.handle_result_event)
     router.register(EventType.TASK_RESULT_CHUNK, handler.handle_result_chunk_event)
+    router.on_batch_end(handler.end_batch)
+    router.on_close(handler.close)
+    metrics_registry.register("status_writes", handler.status_writes.metrics)
+    metrics_registry.register("task_state", handler.task_state.metrics)
     return router
 
 
@@ -47,9 +113,25 @@ def build_stream_consumer(settings: StreamSettings | None = None) -> StreamsCons
     if settings is None:
         settings = StreamSettings()
     client = StreamsClient(settings.REDIS_URL)
-    router = build_event_router()
+    router = build_event_router(settings)
     # Consumer name is generated when not provided so multiple API instances can join the group.
     name = settings.CONSUMER_NAME or consumer_name()
+    lease_manager = None
+    if settings.STREAM_SHARDS > 1:
+        lease_manager = ShardLeaseManager(
+            client.redis,
+            stream=settings.STREAM_NAME,
+            shards=settings.STREAM_SHARDS,
+            owner=name,
+            lease_ms=settings.SHARD_LEASE_MS,
+        )
+    deduplicator = None
+    if settings.DEDUP_CAPACITY > 0:
+        deduplicator = EventDeduplicator(
+            capacity=settings.DEDUP_CAPACITY,
+            redis=client.redis if settings.DEDUP_SHARED else None,
+            ttl_seconds=settings.DEDUP_TTL_SECONDS,
+        )
     return StreamsConsumer(
         client,
         stream=settings.STREAM_NAME,
@@ -60,22 +142,79 @@ def build_stream_consumer(settings: StreamSettings | None = None) -> StreamsCons
         count=settings.COUNT,
         reclaim_pending=settings.RECLAIM_PENDING,
         reclaim_idle_ms=settings.RECLAIM_IDLE_MS,
+        dispatch_concurrency=settings.DISPATCH_CONCURRENCY,
+        reclaim_interval_ms=settings.RECLAIM_INTERVAL_MS,
+        reclaim_count=settings.RECLAIM_COUNT,
+        max_deliveries=settings.MAX_DELIVERIES,
+        dead_letter_stream=settings.DLQ_STREAM_NAME,
+        buffer_high_watermark=settings.BUFFER_HIGH_WATERMARK,
+        buffer_low_watermark=settings.BUFFER_LOW_WATERMARK,
+        coalesce_status=settings.COALESCE_STATUS,
+        lease_manager=lease_manager,
+        deduplicator=deduplicator,
+        trusted_events=settings.TRUSTED_EVENTS,
     )
 
 
-def build_stream_publisher(settings: StreamSettings | None = None) -> StreamsSyncPublisher:
-    """Create a sync streams publisher for worker-side event emission."""
+def build_stream_publisher(
+    settings: StreamSettings | None = None,
+) -> StreamPublisher:
+    """Create the publisher used for worker-side event emission."""
     if settings is None:
         settings = StreamSettings()
     client = SyncStreamsClient(settings.REDIS_URL)
-    return StreamsSyncPublisher(client, settings.STREAM_NAME)
+    publisher = StreamsSyncPublisher(
+        client,
+        settings.STREAM_NAME,
+        shards=settings.STREAM_SHARDS,
+        maxlen=settings.STREAM_MAXLEN,
+        codec_version=settings.STREAM_CODEC_VERSION,
+        compress_threshold=settings.STREAM_COMPRESS_THRESHOLD,
+        envelope_size=settings.STREAM_ENVELOPE_SIZE,
+    )
+    if settings.PUBLISH_OUTBOX_DIR:
+        return OutboxStreamsPublisher(
+            publisher,
+            directory=settings.PUBLISH_OUTBOX_DIR,
+            max_bytes=settings.PUBLISH_OUTBOX_MAX_BYTES,
+            segment_bytes=settings.PUBLISH_OUTBOX_SEGMENT_BYTES,
+            batch_size=settings.PUBLISH_BATCH_SIZE,
+            linger_ms=settings.PUBLISH_LINGER_MS,
+            retry_ms=settings.PUBLISH_OUTBOX_RETRY_MS,
+        )
+    if not settings.PUBLISH_IN_BACKGROUND:
+        return publisher
+    return BackgroundStreamsPublisher(
+        publisher,
+        max_queue=settings.PUBLISH_QUEUE_SIZE,
+        batch_size=settings.PUBLISH_BATCH_SIZE,
+        linger_ms=settings.PUBLISH_LINGER_MS,
+        max_retries=settings.PUBLISH_MAX_RETRIES,
+        retry_ms=settings.PUBLISH_RETRY_MS,
+    )
+
+
+def build_stream_retention(settings: StreamSettings | None = None) -> StreamRetention:
+    """Create the trimming loop for every task event stream shard."""
+    if settings is None:
+        settings = StreamSettings()
+    client = StreamsClient(settings.REDIS_URL, max_connections=2)
+    return StreamRetention(
+        client,
+        streams=shard_streams(settings.STREAM_NAME, settings.STREAM_SHARDS),
+        interval_ms=settings.RETENTION_INTERVAL_MS,
+    )
 
 
-def configure_stream_publisher(settings: StreamSettings | None = None) -> StreamsSyncPublisher:
+def configure_stream_publisher(
+    settings: StreamSettings | None = None,
+) -> StreamPublisher:
     """Create a singleton publisher and bind it into the DI container."""
     global _stream_publisher
     if _stream_publisher is None:
         _stream_publisher = build_stream_publisher(settings)
+        if isinstance(_stream_publisher, BackgroundStreamsPublisher):
+            metrics_registry.register("stream_publisher", _stream_publisher.metrics)
 
     if inject.is_configured():
         injector = inject.get_injector()
@@ -99,9 +238,53 @@ def configure_stream_publisher(settings: StreamSettings | None = None) -> Stream
     return _stream_publisher
 
 
+def flush_stream_publisher(timeout: float | None = None) -> None:
+    """Wait until events queued by this process were published, if a publisher exists."""
+    if _stream_publisher is not None and not _stream_publisher.flush(timeout):
+        logger.error(
+            "Task events were not all published (timed out or dropped)",
+            extra={"timeout": timeout},
+        )
+
+
+def sync_stream_publisher(timeout: float | None = None) -> None:
+    """
+    Make events reported by a finished task safe before the worker takes the next one.
+
+    The outbox only syncs its segment to disk, so a Redis outage does not stall
+    every task end; other publishers wait until their events were sent.
+    """
+    if isinstance(_stream_publisher, OutboxStreamsPublisher):
+        _stream_publisher.sync()
+        return
+    flush_stream_publisher(timeout)
+
+
+def close_stream_publisher(timeout: float | None = None) -> None:
+    """Flush and close the process-wide publisher."""
+    global _stream_publisher
+    if _stream_publisher is None:
+        return
+    flush_stream_publisher(timeout)
+    _stream_publisher.close()
+    _stream_publisher = None
+
+
 def configure_stream_consumer() -> StreamsConsumer:
     """Return the singleton streams consumer used by the API process."""
     global _stream_consumer
     if _stream_consumer is None:
         _stream_consumer = build_stream_consumer()
+        metrics_registry.register("stream_consumer", _stream_consumer.metrics)
+        if _stream_consumer.deduplicator is not None:
+            metrics_registry.register("event_dedup", _stream_consumer.deduplicator.metrics)
     return _stream_consumer
+
+
+def configure_stream_retention() -> StreamRetention:
+    """Return the singleton stream retention loop used by the API process."""
+    global _stream_retention
+    if _stream_retention is None:
+        _stream_retention = build_stream_retention()
+        metrics_registry.register("stream_retention", _stream_retention.metrics)
+    return _stream_retention
@@ -5,6 +5,13 @@ class WorkerSettings(BaseSettings):
     """Configuration for worker behavior in compute_pi tasks."""
     SLEEP_PER_DIGIT_SEC: float = 0.1
     ROUNDING_POLICY: str = "TRUNCATE"
+    # Running statuses are published at most this often and only after this much progress.
+    STATUS_MIN_INTERVAL_SEC: float = 0.25
+    STATUS_MIN_DELTA: float = 0.01
+    # A result chunk is published once it reaches any of these limits.
+    RESULT_CHUNK_MAX_ITEMS: int = 100
+    RESULT_CHUNK_MAX_BYTES: int = 64 * 1024
+    RESULT_CHUNK_LINGER_SEC: float = 0.5
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
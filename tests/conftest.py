@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import importlib
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 
 import pytest
 from fastapi import FastAPI
@@ -10,8 +10,11 @@ from fastapi.testclient import TestClient
 from src.app.domain.exceptions import TaskNotFoundError
 from datetime import datetime
 
+from src.app.domain.models.result_update import ResultUpdate
+from src.app.domain.models.status_update import StatusUpdate
 from src.app.domain.models.task import Task
 from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_page import TaskPage
 from src.app.domain.models.task_result import TaskResult
 from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
@@ -50,6 +53,8 @@ class StubStorageRepository(StorageRepository):
     def __init__(self) -> None:
         self.status_by_id: dict[str, TaskStatus] = {}
         self.results_by_id: dict[str, TaskResult] = {}
+        self.task_views: list[TaskView] = []
+        self.list_calls: list[dict[str, object]] = []
         self._counter = 0
 
     async def create_task(self, user_id: str, task: Task) -> str:
@@ -68,17 +73,24 @@ class StubStorageRepository(StorageRepository):
         task_type: TaskType | None = None,
         state: TaskState | None = None,
         limit: int = 50,
-        offset: int = 0,
-    ) -> list[TaskView]:
-        return []
+        cursor: str | None = None,
+    ) -> TaskPage:
+        self.list_calls.append(
+            {"task_type": task_type, "state": state, "limit": limit, "cursor": cursor}
+        )
+        return TaskPage(items=self.task_views[:limit])
 
     async def update_task_status(
         self,
         task_id: str,
         status: TaskStatus,
         metadata: TaskMetadata | None = None,
-    ) -> None:
-        return None
+        seq: int | None = None,
+    ) -> bool:
+        return True
+
+    async def update_task_statuses(self, updates: Sequence[StatusUpdate]) -> set[str]:
+        return {update.task_id for update in updates}
 
     async def set_task_result(
         self,
@@ -88,6 +100,9 @@ class StubStorageRepository(StorageRepository):
     ) -> None:
         return None
 
+    async def set_task_results(self, updates: Sequence[ResultUpdate]) -> set[str]:
+        return {update.task_id for update in updates}
+
     async def get_status(self, user_id: str, task_id: str) -> TaskStatus:
         if task_id not in self.status_by_id:
             raise TaskNotFoundError(task_id)
@@ -49,12 +49,19 @@ class StubStorage(StorageRepository):
         task_id: str,
         status: TaskStatus,
         metadata=None,
-    ) -> None:
-        return None
+        seq=None,
+    ) -> bool:
+        return True
+
+    async def update_task_statuses(self, updates) -> set[str]:
+        return {update.task_id for update in updates}
 
     async def set_task_result(self, task_id: str, result, finished_at=None) -> None:
         return None
 
+    async def set_task_results(self, updates) -> set[str]:
+        return {update.task_id for update in updates}
+
 
 def _build_app() -> FastAPI:
     app = FastAPI()
@@ -96,6 +103,8 @@ def test_compute_pi_streams_status_and_chunks(monkeypatch: pytest.MonkeyPatch) -
     monkeypatch.setattr(inject, "instance", fake_instance)
     compute_pi_module = importlib.import_module("src.app.worker.tasks.compute_pi")
     monkeypatch.setattr(compute_pi_module._settings, "SLEEP_PER_DIGIT_SEC", 0)
+    # Publish every status so the test can match one status per digit.
+    monkeypatch.setattr(compute_pi_module._settings, "STATUS_MIN_INTERVAL_SEC", 0)
 
     broadcaster = WebSocketStatusBroadcaster(connection_manager)
     handler = TaskEventHandler(storage=StubStorage(), broadcaster=broadcaster)
@@ -158,12 +167,12 @@ def test_compute_pi_streams_status_and_chunks(monkeypatch: pytest.MonkeyPatch) -
 
     assert len(statuses) == expected_count
     data_chunks = [chunk for chunk in chunks if chunk["payload"]["data"]]
-    assert len(data_chunks) == expected_count
-
     data_chunks.sort(key=lambda item: int(item["payload"]["chunk_id"]))
+    # Digits are grouped into chunks by count, size and linger time.
     received_digits = [
-        chunk["payload"]["data"][0]
+        digit
         for chunk in data_chunks
+        for digit in chunk["payload"]["data"]
     ]
     assert received_digits == list(expected_pi)
     assert any(chunk["payload"]["is_last"] is True for chunk in chunks)
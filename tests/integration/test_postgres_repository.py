@@ -4,9 +4,16 @@ from datetime import datetime, timezone
 
 import pytest
 import pytest_asyncio
+from sqlalchemy import event
 
-from src.app.domain.exceptions import TaskAccessDeniedError
+from src.app.domain.exceptions import (
+    InvalidCursorError,
+    TaskAccessDeniedError,
+    TaskNotFoundError,
+)
 from src.app.domain.models.payloads import ComputePiPayload
+from src.app.domain.models.result_update import ResultUpdate
+from src.app.domain.models.status_update import StatusUpdate
 from src.app.domain.models.task import Task
 from src.app.domain.models.task_metadata import TaskMetadata
 from src.app.domain.models.task_progress import TaskProgress
@@ -82,3 +89,238 @@ async def test_get_status_enforces_acl(repo: PostgresStorageRepository):
 
     with pytest.raises(TaskAccessDeniedError):
         await repo.get_status("other-user", task_id)
+
+
+@pytest.mark.asyncio
+async def test_update_task_status_rejects_stale_sequence(repo: PostgresStorageRepository):
+    task = Task(
+        task_type=TaskType.COMPUTE_PI,
+        payload=ComputePiPayload(digits=4),
+        status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+        metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+    )
+    task_id = await repo.create_task("user-1", task)
+
+    newer = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.8))
+    older = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.2))
+    assert await repo.update_task_status(task_id, newer, seq=20) is True
+    assert await repo.update_task_status(task_id, older, seq=19) is False
+
+    returned = await repo.get_status("user-1", task_id)
+    assert returned.progress.percentage == 0.8
+
+
+@pytest.mark.asyncio
+async def test_update_task_statuses_writes_batch_and_skips_stale(repo: PostgresStorageRepository):
+    task_ids = []
+    for digits in (5, 6):
+        task = Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=digits),
+            status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+            metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+        )
+        task_ids.append(await repo.create_task("user-1", task))
+    first, second = task_ids
+    await repo.update_task_status(
+        second, TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.9)), seq=30
+    )
+
+    applied = await repo.update_task_statuses(
+        [
+            StatusUpdate(
+                task_id=first,
+                status=TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.4)),
+                seq=10,
+            ),
+            StatusUpdate(
+                task_id=second,
+                status=TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.1)),
+                seq=29,
+            ),
+            StatusUpdate(
+                task_id="missing",
+                status=TaskStatus(state=TaskState.RUNNING, progress=TaskProgress()),
+            ),
+        ]
+    )
+
+    assert applied == {first}
+    assert (await repo.get_status("user-1", first)).progress.percentage == 0.4
+    assert (await repo.get_status("user-1", second)).progress.percentage == 0.9
+
+
+@pytest.mark.asyncio
+async def test_writes_for_unknown_task_raise_not_found(repo: PostgresStorageRepository):
+    status = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.1))
+
+    with pytest.raises(TaskNotFoundError):
+        await repo.update_task_status("missing", status, seq=1)
+    with pytest.raises(TaskNotFoundError):
+        await repo.set_task_result("missing", TaskResult(task_id="missing", data={"pi": "3"}))
+
+
+@pytest.mark.asyncio
+async def test_upserts_overwrite_only_given_metadata_fields(repo: PostgresStorageRepository):
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    task = Task(
+        task_type=TaskType.COMPUTE_PI,
+        payload=ComputePiPayload(digits=7),
+        status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+        metadata=TaskMetadata(created_at=created_at),
+    )
+    task_id = await repo.create_task("user-1", task)
+    finished_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+    await repo.update_task_status(
+        task_id,
+        TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5)),
+        TaskMetadata(started_at=created_at),
+    )
+    await repo.set_task_result(task_id, TaskResult(task_id=task_id, data={"pi": "3.1"}))
+    await repo.set_task_result(
+        task_id, TaskResult(task_id=task_id, data={"pi": "3.14"}), finished_at=finished_at
+    )
+
+    returned = await repo.get_result("user-1", task_id)
+    assert returned.data == {"pi": "3.14"}
+    assert returned.task_metadata.created_at == created_at.replace(tzinfo=None)
+    assert returned.task_metadata.started_at == created_at.replace(tzinfo=None)
+    assert returned.task_metadata.finished_at == finished_at.replace(tzinfo=None)
+
+
+@pytest.mark.asyncio
+async def test_set_task_results_writes_batch_and_skips_unknown(repo: PostgresStorageRepository):
+    task_ids = []
+    for digits in (8, 9):
+        task = Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=digits),
+            status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+            metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+        )
+        task_ids.append(await repo.create_task("user-1", task))
+    finished_at = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+    written = await repo.set_task_results(
+        [
+            ResultUpdate(
+                task_id=task_id,
+                result=TaskResult(task_id=task_id, data={"index": index}),
+                finished_at=finished_at,
+            )
+            for index, task_id in enumerate([*task_ids, "missing"])
+        ]
+    )
+
+    assert written == set(task_ids)
+    for index, task_id in enumerate(task_ids):
+        returned = await repo.get_result("user-1", task_id)
+        assert returned.data == {"index": index}
+        assert returned.task_metadata.finished_at == finished_at.replace(tzinfo=None)
+
+
+@pytest.mark.asyncio
+async def test_update_task_statuses_keeps_newest_update_per_task(repo: PostgresStorageRepository):
+    task = Task(
+        task_type=TaskType.COMPUTE_PI,
+        payload=ComputePiPayload(digits=3),
+        status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+        metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+    )
+    task_id = await repo.create_task("user-1", task)
+
+    applied = await repo.update_task_statuses(
+        [
+            StatusUpdate(
+                task_id=task_id,
+                status=TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.6)),
+                seq=6,
+            ),
+            StatusUpdate(
+                task_id=task_id,
+                status=TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5)),
+                seq=5,
+            ),
+        ]
+    )
+
+    assert applied == {task_id}
+    assert (await repo.get_status("user-1", task_id)).progress.percentage == 0.6
+
+
+@pytest.mark.asyncio
+async def test_status_and_result_reads_issue_one_query_each(repo: PostgresStorageRepository):
+    task = Task(
+        task_type=TaskType.COMPUTE_PI,
+        payload=ComputePiPayload(digits=3),
+        status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+        metadata=TaskMetadata(created_at=datetime.now(timezone.utc), custom={"k": 1}),
+    )
+    task_id = await repo.create_task("user-1", task)
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+        statements.append(statement)
+
+    engine = repo._orm.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        status = await repo.get_status("user-1", task_id)
+        result = await repo.get_result("user-1", task_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 2
+    assert status.state == TaskState.QUEUED
+    assert result.data is None
+    assert result.task_metadata.custom == {"k": 1}
+    with pytest.raises(TaskNotFoundError):
+        await repo.get_result("user-1", "missing")
+    with pytest.raises(TaskAccessDeniedError):
+        await repo.get_result("other-user", task_id)
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_pages_newest_first_with_cursor(repo: PostgresStorageRepository):
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    task_ids = []
+    for index in range(5):
+        task = Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=2),
+            status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+            # Two tasks share a timestamp, so the id has to break the tie.
+            metadata=TaskMetadata(created_at=created_at.replace(minute=min(index, 3))),
+        )
+        task_ids.append(await repo.create_task("user-1", task))
+    await repo.create_task(
+        "user-2",
+        Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=2),
+            status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+            metadata=TaskMetadata(created_at=created_at),
+        ),
+    )
+    await repo.update_task_status(
+        task_ids[0], TaskStatus(state=TaskState.COMPLETED, progress=TaskProgress())
+    )
+
+    listed: list[str] = []
+    cursor = None
+    while True:
+        page = await repo.list_tasks("user-1", limit=2, cursor=cursor)
+        listed.extend(view.id for view in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    newest = sorted(task_ids[3:], reverse=True)
+    assert listed == [*newest, task_ids[2], task_ids[1], task_ids[0]]
+    completed = await repo.list_tasks("user-1", state=TaskState.COMPLETED)
+    assert [view.id for view in completed.items] == [task_ids[0]]
+    assert completed.items[0].metadata.created_at is not None
+    assert completed.next_cursor is None
+    with pytest.raises(InvalidCursorError):
+        await repo.list_tasks("user-1", cursor="not-a-cursor")
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import zlib
+
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
@@ -10,6 +13,8 @@ from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
 from src.app.domain.repositories import StorageRepository
 from src.app.presentation.websockets import (
+    WS_FRAME_BINARY_CHUNK,
+    WS_FRAME_COMPRESSED_JSON,
     WebSocketStatusBroadcaster,
     connection_manager,
     router as ws_router,
@@ -32,12 +37,20 @@ class StubStorage(StorageRepository):
     async def list_tasks(self, user_id: str, **kwargs):  # pragma: no cover - not used
         raise NotImplementedError
 
-    async def update_task_status(self, task_id: str, status: TaskStatus, metadata=None) -> None:
-        return None
+    async def update_task_status(
+        self, task_id: str, status: TaskStatus, metadata=None, seq=None
+    ) -> bool:
+        return True
+
+    async def update_task_statuses(self, updates) -> set[str]:
+        return {update.task_id for update in updates}
 
     async def set_task_result(self, task_id: str, result, finished_at=None) -> None:
         return None
 
+    async def set_task_results(self, updates) -> set[str]:
+        return {update.task_id for update in updates}
+
 
 def _build_app() -> FastAPI:
     app = FastAPI()
@@ -74,3 +87,51 @@ def test_websocket_receives_status_and_chunks() -> None:
     assert chunk_msg["type"] == chunk_event.type.value
     assert chunk_msg["task_id"] == task_id
     assert chunk_msg["payload"] == chunk_event.payload
+
+
+def test_websocket_negotiated_compression_sends_large_messages_as_binary() -> None:
+    connection_manager._connections.clear()
+    app = _build_app()
+    broadcaster = WebSocketStatusBroadcaster(connection_manager)
+    handler = TaskEventHandler(storage=StubStorage(), broadcaster=broadcaster)
+    task_id = "task-doc-1"
+
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/ws/tasks/{task_id}?compression=zlib") as ws:
+            small_event = TaskEvent.result_chunk(task_id, "0", ["short"], is_last=False)
+            large_event = TaskEvent.result_chunk(task_id, "1", ["snippet"] * 500, is_last=True)
+
+            client.portal.call(handler.handle_result_chunk_event, small_event)
+            client.portal.call(handler.handle_result_chunk_event, large_event)
+
+            small_msg = ws.receive_json()
+            large_frame = ws.receive_bytes()
+
+    assert small_msg["payload"] == small_event.payload
+    assert large_frame[:1] == WS_FRAME_COMPRESSED_JSON
+    large_msg = json.loads(zlib.decompress(large_frame[1:]))
+    assert large_msg["payload"] == large_event.payload
+    assert len(large_frame) < len(json.dumps(large_msg))
+
+
+def test_websocket_binary_chunks_follow_their_header_as_chunk_frames() -> None:
+    connection_manager._connections.clear()
+    app = _build_app()
+    broadcaster = WebSocketStatusBroadcaster(connection_manager)
+    handler = TaskEventHandler(storage=StubStorage(), broadcaster=broadcaster)
+    task_id = "task-bin-1"
+    data = bytes(range(256)) * 8
+
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/ws/tasks/{task_id}?compression=zlib") as ws:
+            event = TaskEvent.result_chunk(task_id, "0", data, is_last=True)
+
+            client.portal.call(handler.handle_result_chunk_event, event)
+
+            header = ws.receive_json()
+            frame = ws.receive_bytes()
+
+    assert header["payload"]["encoding"] == "binary"
+    assert header["payload"]["size"] == len(data)
+    assert frame[:1] == WS_FRAME_BINARY_CHUNK
+    assert frame[1:] == data
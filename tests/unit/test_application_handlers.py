@@ -29,12 +29,23 @@ class StubStorage(StorageRepository):
     async def list_tasks(self, user_id: str, **kwargs):  # pragma: no cover - not used
         raise NotImplementedError
 
-    async def update_task_status(self, task_id: str, status: TaskStatus, metadata=None) -> None:
+    async def update_task_status(
+        self, task_id: str, status: TaskStatus, metadata=None, seq=None
+    ) -> bool:
         self.status_calls.append((task_id, status))
+        return True
+
+    async def update_task_statuses(self, updates) -> set[str]:
+        self.status_calls.extend((update.task_id, update.status) for update in updates)
+        return {update.task_id for update in updates}
 
     async def set_task_result(self, task_id: str, result, finished_at=None) -> None:
         self.result_calls.append((task_id, result))
 
+    async def set_task_results(self, updates) -> set[str]:
+        self.result_calls.extend((update.task_id, update.result) for update in updates)
+        return {update.task_id for update in updates}
+
 
 class StubBroadcaster(TaskStatusBroadcaster):
     def __init__(self) -> None:
@@ -62,6 +73,8 @@ async def test_handle_status_event_updates_storage() -> None:
     event = TaskEvent.status("task-1", status)
 
     await handler.handle_status_event(event)
+    assert storage.status_calls == []
+    await handler.end_batch()
 
     assert len(storage.status_calls) == 1
     task_id, stored_status = storage.status_calls[0]
@@ -106,3 +119,119 @@ async def test_handle_result_chunk_event_broadcasts() -> None:
 
     assert broadcaster.chunk_events == [event]
     assert storage.result_calls == []
+
+
+@pytest.mark.asyncio
+async def test_handle_status_event_skips_stale_sequence() -> None:
+    storage = StubStorage()
+    broadcaster = StubBroadcaster()
+    handler = TaskEventHandler(storage=storage, broadcaster=broadcaster)
+
+    newer = TaskEvent.status(
+        "task-4",
+        TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5)),
+        seq=11,
+    )
+    older = TaskEvent.status(
+        "task-4",
+        TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.1)),
+        seq=10,
+    )
+
+    await handler.handle_status_event(newer)
+    await handler.handle_status_event(older)
+    await handler.end_batch()
+
+    assert len(storage.status_calls) == 1
+    assert broadcaster.status_events == [newer]
+
+
+@pytest.mark.asyncio
+async def test_trusted_status_event_is_stamped_in_place() -> None:
+    storage = StubStorage()
+    broadcaster = StubBroadcaster()
+    handler = TaskEventHandler(storage=storage, broadcaster=broadcaster, trusted_events=True)
+
+    status = TaskStatus(
+        state=TaskState.RUNNING,
+        progress=TaskProgress(current=2, total=4, percentage=0.5),
+        metadata={"worker": "w1"},
+    )
+    event = TaskEvent.status("task-5", status)
+    status_payload = event.payload["status"]
+
+    await handler.handle_status_event(event)
+    await handler.end_batch()
+
+    assert event.payload["status"] is status_payload
+    assert status_payload["metadata"]["worker"] == "w1"
+    assert "server_sent_ts" in status_payload["metadata"]
+    _task_id, stored_status = storage.status_calls[0]
+    assert isinstance(stored_status, TaskStatus)
+    assert stored_status.progress.percentage == 0.5
+    assert broadcaster.status_events == [event]
+
+
+@pytest.mark.asyncio
+async def test_buffered_statuses_are_written_together_and_terminal_ones_at_once() -> None:
+    storage = StubStorage()
+    broadcaster = StubBroadcaster()
+    handler = TaskEventHandler(storage=storage, broadcaster=broadcaster, status_delta=0.0)
+
+    for task_id in ("task-6", "task-7"):
+        for seq, pct in enumerate((0.1, 0.2, 0.3), start=1):
+            status = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=pct))
+            await handler.handle_status_event(TaskEvent.status(task_id, status, seq=seq))
+    assert storage.status_calls == []
+
+    done = TaskStatus(state=TaskState.COMPLETED, progress=TaskProgress(percentage=1.0))
+    await handler.handle_status_event(TaskEvent.status("task-6", done, seq=4))
+
+    # The terminal status was written right away, in one call with the pending one of task-7.
+    written = {task_id: status for task_id, status in storage.status_calls}
+    assert len(storage.status_calls) == 2
+    assert written["task-6"].state == TaskState.COMPLETED
+    assert written["task-7"].progress.percentage == 0.3
+    assert len(broadcaster.status_events) == 7
+    assert handler.status_writes.metrics()["flushes_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_status_flush_interval_spans_batches_and_close_writes_the_rest() -> None:
+    storage = StubStorage()
+    handler = TaskEventHandler(
+        storage=storage,
+        broadcaster=StubBroadcaster(),
+        status_flush_interval_s=60.0,
+    )
+    status = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5))
+
+    await handler.handle_status_event(TaskEvent.status("task-8", status, seq=1))
+    await handler.end_batch()
+    assert storage.status_calls == []
+
+    await handler.close()
+    assert [task_id for task_id, _status in storage.status_calls] == ["task-8"]
+
+
+@pytest.mark.asyncio
+async def test_terminal_status_leaves_a_seq_tombstone() -> None:
+    broadcaster = StubBroadcaster()
+    handler = TaskEventHandler(storage=StubStorage(), broadcaster=broadcaster)
+    running = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5))
+    done = TaskStatus(state=TaskState.COMPLETED, progress=TaskProgress(percentage=1.0))
+
+    await handler.handle_status_event(TaskEvent.status("task-9", running, seq=1))
+    await handler.handle_result_chunk_event(TaskEvent.result_chunk("task-9", "0", [1]))
+    assert len(handler.task_state) == 1
+
+    await handler.handle_status_event(TaskEvent.status("task-9", done, seq=2))
+    tombstone = handler.task_state.get("task-9")
+    assert tombstone is not None
+    assert tombstone.seq == 2
+    assert tombstone.cpu_ms == 0.0
+
+    # Late and redelivered statuses of the finished task are not broadcast again.
+    await handler.handle_status_event(TaskEvent.status("task-9", running, seq=1))
+    await handler.handle_status_event(TaskEvent.status("task-9", done, seq=2))
+    assert [event.seq for event in broadcaster.status_events] == [1, 2]
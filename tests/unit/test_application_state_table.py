@@ -0,0 +1,43 @@
+from src.app.application.state_table import TaskStateTable
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_task_is_evicted_at_capacity() -> None:
+    table: TaskStateTable[int] = TaskStateTable(capacity=2, clock=FakeClock())
+
+    table.set("task-1", 1)
+    table.set("task-2", 2)
+    assert table.get("task-1") == 1
+    table.set("task-3", 3)
+
+    assert table.get("task-2") is None
+    assert table.get("task-1") == 1
+    assert table.get("task-3") == 3
+    assert table.metrics()["evictions_lru_total"] == 1
+
+
+def test_idle_tasks_expire_after_ttl() -> None:
+    clock = FakeClock()
+    table: TaskStateTable[int] = TaskStateTable(capacity=10, ttl_s=60.0, clock=clock)
+
+    table.set("task-1", 1)
+    table.set("task-2", 2)
+    clock.now = 50.0
+    assert table.get("task-2") == 2
+    clock.now = 70.0
+    table.set("task-3", 3)
+
+    assert len(table) == 2
+    assert table.get("task-1") is None
+    assert table.get("task-2") == 2
+    assert table.metrics()["evictions_ttl_total"] == 1
+    assert table.get_or_create("task-4", lambda: 4) == 4
+    assert table.pop("task-4") == 4
+    assert table.pop("task-4") is None
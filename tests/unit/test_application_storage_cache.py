@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+
+from src.app.application.storage_cache import CachedStorageRepository
+from src.app.domain.exceptions import TaskAccessDeniedError, TaskNotFoundError
+from src.app.domain.models.payloads import ComputePiPayload
+from src.app.domain.models.status_update import StatusUpdate
+from src.app.domain.models.task import Task
+from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_result import TaskResult
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.domain.models.task_type import TaskType
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingStorage:
+    def __init__(self) -> None:
+        self.owners: dict[str, str] = {}
+        self.statuses: dict[str, TaskStatus] = {}
+        self.results: dict[str, TaskResult] = {}
+        self.seqs: dict[str, int] = {}
+        self.reads: list[tuple[str, str]] = []
+        self.read_gate: asyncio.Event | None = None
+
+    async def create_task(self, user_id: str, task: Task) -> str:
+        task.id = f"task-{len(self.owners) + 1}"
+        self.owners[task.id] = user_id
+        self.statuses[task.id] = task.status
+        return task.id
+
+    async def _check(self, kind: str, user_id: str, task_id: str) -> None:
+        self.reads.append((kind, task_id))
+        if self.read_gate is not None:
+            await self.read_gate.wait()
+        if task_id not in self.owners:
+            raise TaskNotFoundError(task_id)
+        if self.owners[task_id] != user_id:
+            raise TaskAccessDeniedError(task_id, user_id)
+
+    async def get_status(self, user_id: str, task_id: str) -> TaskStatus:
+        await self._check("status", user_id, task_id)
+        return self.statuses[task_id]
+
+    async def get_result(self, user_id: str, task_id: str) -> TaskResult:
+        await self._check("result", user_id, task_id)
+        return self.results.get(task_id, TaskResult(task_id=task_id))
+
+    async def update_task_statuses(self, updates: Sequence[StatusUpdate]) -> set[str]:
+        applied = set()
+        for update in updates:
+            if update.seq is not None and update.seq <= self.seqs.get(update.task_id, -1):
+                continue
+            self.statuses[update.task_id] = update.status
+            if update.seq is not None:
+                self.seqs[update.task_id] = update.seq
+            applied.add(update.task_id)
+        return applied
+
+    async def set_task_result(self, task_id: str, result: TaskResult, finished_at=None) -> None:
+        self.results[task_id] = result
+
+
+def _status(state: TaskState, percentage: float = 0.0) -> TaskStatus:
+    return TaskStatus(state=state, progress=TaskProgress(percentage=percentage))
+
+
+async def _create(cache: CachedStorageRepository, user_id: str = "user-1") -> str:
+    return await cache.create_task(
+        user_id,
+        Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=3),
+            status=_status(TaskState.QUEUED),
+            metadata=TaskMetadata(),
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_status_is_served_from_cache_until_it_expires() -> None:
+    storage = CountingStorage()
+    clock = FakeClock()
+    cache = CachedStorageRepository(storage, ttl_s=1.0, clock=clock)  # type: ignore[arg-type]
+    task_id = await _create(cache)
+
+    assert (await cache.get_status("user-1", task_id)).state == TaskState.QUEUED
+    await cache.update_task_statuses(
+        [StatusUpdate(task_id=task_id, status=_status(TaskState.RUNNING, 0.5), seq=1)]
+    )
+    assert (await cache.get_status("user-1", task_id)).progress.percentage == 0.5
+    with pytest.raises(TaskAccessDeniedError):
+        await cache.get_status("user-2", task_id)
+    assert storage.reads == []
+
+    # A write by another process shows up once the entry expired.
+    storage.statuses[task_id] = _status(TaskState.RUNNING, 0.7)
+    clock.now = 1.5
+    assert (await cache.get_status("user-1", task_id)).progress.percentage == 0.7
+    assert storage.reads == [("status", task_id)]
+    metrics = cache.metrics()
+    assert metrics["hits_total"] == 2
+    assert metrics["misses_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_status_write_drops_the_cached_entry() -> None:
+    storage = CountingStorage()
+    cache = CachedStorageRepository(storage)  # type: ignore[arg-type]
+    task_id = await _create(cache)
+    storage.seqs[task_id] = 5
+
+    applied = await cache.update_task_statuses(
+        [StatusUpdate(task_id=task_id, status=_status(TaskState.RUNNING, 0.1), seq=3)]
+    )
+
+    assert applied == set()
+    assert (await cache.get_status("user-1", task_id)).state == TaskState.QUEUED
+    assert storage.reads == [("status", task_id)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_storage_read() -> None:
+    storage = CountingStorage()
+    storage.owners["task-1"] = "user-1"
+    storage.statuses["task-1"] = _status(TaskState.RUNNING)
+    storage.read_gate = asyncio.Event()
+    cache = CachedStorageRepository(storage)  # type: ignore[arg-type]
+
+    reads = [asyncio.create_task(cache.get_status("user-1", "task-1")) for _ in range(5)]
+    await asyncio.sleep(0)
+    storage.read_gate.set()
+    statuses = await asyncio.gather(*reads)
+
+    assert all(status.state == TaskState.RUNNING for status in statuses)
+    assert storage.reads == [("status", "task-1")]
+    assert cache.metrics()["coalesced_total"] == 4
+
+
+@pytest.mark.asyncio
+async def test_completed_results_stay_cached_and_writes_invalidate_them() -> None:
+    storage = CountingStorage()
+    clock = FakeClock()
+    cache = CachedStorageRepository(storage, ttl_s=1.0, clock=clock)  # type: ignore[arg-type]
+    task_id = await _create(cache)
+
+    assert (await cache.get_result("user-1", task_id)).data is None
+    await cache.set_task_result(task_id, TaskResult(task_id=task_id, data={"pi": "3.14"}))
+    assert (await cache.get_result("user-1", task_id)).data == {"pi": "3.14"}
+    clock.now = 3600.0
+    assert (await cache.get_result("user-1", task_id)).data == {"pi": "3.14"}
+
+    assert storage.reads == [("result", task_id), ("result", task_id)]
+
+
+@pytest.mark.asyncio
+async def test_writes_only_discard_in_flight_reads_of_their_own_task() -> None:
+    storage = CountingStorage()
+    for task_id in ("task-1", "task-2"):
+        storage.owners[task_id] = "user-1"
+        storage.statuses[task_id] = _status(TaskState.RUNNING, 0.1)
+    storage.read_gate = asyncio.Event()
+    cache = CachedStorageRepository(storage)  # type: ignore[arg-type]
+
+    reads = [asyncio.create_task(cache.get_status("user-1", t)) for t in ("task-1", "task-2")]
+    while len(storage.reads) < 2:
+        await asyncio.sleep(0)
+    storage.owners["task-3"] = "user-1"
+    await cache.update_task_statuses(
+        [
+            StatusUpdate(task_id="task-2", status=_status(TaskState.RUNNING, 0.5), seq=1),
+            StatusUpdate(task_id="task-3", status=_status(TaskState.RUNNING, 0.5), seq=1),
+        ]
+    )
+    storage.read_gate.set()
+    await asyncio.gather(*reads)
+    storage.read_gate = None
+
+    await cache.get_status("user-1", "task-1")
+    assert (await cache.get_status("user-1", "task-2")).progress.percentage == 0.5
+    assert storage.reads == [("status", "task-1"), ("status", "task-2"), ("status", "task-2")]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from src.app.domain.models.task_metadata import TaskMetadata
 from src.app.domain.models.task_progress import TaskProgress
 from src.app.domain.models.task_type import TaskType
 from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
+from src.app.domain.models.task_view import TaskView
 
 
 def test_calculate_pi_rejects_zero(api_client):
@@ -79,3 +81,33 @@ def test_check_progress_returns_404_for_missing_task(api_client):
 
     assert response.status_code == 404
     assert response.json()["detail"] == "Task with id 'missing' was not found."
+
+
+def test_list_tasks_returns_page_and_passes_filters(api_client):
+    client, _task_stub, storage_stub = api_client
+    storage_stub.task_views.append(
+        TaskView(
+            id="job-1",
+            task_type=TaskType.COMPUTE_PI,
+            status=TaskStatus(state=TaskState.RUNNING, progress=TaskProgress()),
+            metadata=TaskMetadata(),
+        )
+    )
+
+    response = client.get("/tasks", params={"state": "RUNNING", "limit": 10, "cursor": "abc"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == ["job-1"]
+    assert body["next_cursor"] is None
+    assert storage_stub.list_calls == [
+        {"task_type": None, "state": TaskState.RUNNING, "limit": 10, "cursor": "abc"}
+    ]
+
+
+def test_list_tasks_rejects_invalid_limit(api_client):
+    client, _task_stub, _storage_stub = api_client
+
+    response = client.get("/tasks", params={"limit": 0})
+
+    assert response.status_code == 422
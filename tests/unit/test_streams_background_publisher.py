@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+
+from src.app.domain.events.task_event import TaskEvent
+from src.app.infrastructure.streams.background import BackgroundStreamsPublisher
+
+
+class RecordingPublisher:
+    def __init__(self) -> None:
+        self.batches: list[list[TaskEvent]] = []
+        self.closed = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def publish(self, events: list[TaskEvent]) -> None:
+        self.release.wait()
+        self.batches.append(list(events))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _chunks(count: int) -> list[TaskEvent]:
+    return [TaskEvent.result_chunk("task-1", str(index), [index]) for index in range(count)]
+
+
+def test_flush_sends_queued_events_in_order_and_in_batches() -> None:
+    inner = RecordingPublisher()
+    publisher = BackgroundStreamsPublisher(
+        inner,  # type: ignore[arg-type]
+        batch_size=2,
+        linger_ms=10_000,
+    )
+    events = _chunks(5)
+
+    for event in events:
+        publisher.publish(event)
+    assert publisher.flush(timeout=5) is True
+
+    assert all(len(batch) <= 2 for batch in inner.batches)
+    sent = [event for batch in inner.batches for event in batch]
+    assert [event.event_id for event in sent] == [event.event_id for event in events]
+    publisher.close(timeout=5)
+    assert inner.closed is True
+
+
+def test_publish_only_enqueues_while_the_stream_is_slow() -> None:
+    inner = RecordingPublisher()
+    inner.release.clear()
+    publisher = BackgroundStreamsPublisher(
+        inner,  # type: ignore[arg-type]
+        batch_size=10,
+        linger_ms=1,
+    )
+
+    publisher.publish(_chunks(3))
+
+    assert inner.batches == []
+    assert publisher.flush(timeout=0.05) is False
+    inner.release.set()
+    assert publisher.flush(timeout=5) is True
+    assert sum(len(batch) for batch in inner.batches) == 3
+    publisher.close(timeout=5)
+
+
+class FlakyPublisher(RecordingPublisher):
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+
+    def publish(self, events: list[TaskEvent]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("redis down")
+        super().publish(events)
+
+
+def test_failed_batches_are_retried_before_they_are_sent() -> None:
+    inner = FlakyPublisher(failures=2)
+    publisher = BackgroundStreamsPublisher(
+        inner,  # type: ignore[arg-type]
+        linger_ms=1,
+        max_retries=3,
+        retry_ms=1,
+    )
+
+    publisher.publish(_chunks(3))
+
+    assert publisher.flush(timeout=5) is True
+    assert sum(len(batch) for batch in inner.batches) == 3
+    assert publisher.metrics()["publish_retries_total"] == 2
+    assert publisher.dropped == 0
+    publisher.close(timeout=5)
+
+
+def test_flush_reports_events_dropped_after_retries_run_out() -> None:
+    inner = FlakyPublisher(failures=2)
+    publisher = BackgroundStreamsPublisher(
+        inner,  # type: ignore[arg-type]
+        linger_ms=1,
+        max_retries=1,
+        retry_ms=1,
+    )
+
+    publisher.publish(_chunks(3))
+
+    assert publisher.flush(timeout=5) is False
+    assert publisher.dropped == 3
+    assert publisher.metrics()["events_dropped_total"] == 3
+    publisher.publish(_chunks(1))
+    assert publisher.flush(timeout=5) is True
+    publisher.close(timeout=5)
@@ -0,0 +1,477 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.app.domain.events.task_event import EventType, TaskEvent
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.infrastructure.streams.consumer import StreamsConsumer
+from src.app.infrastructure.streams.dedup import EventDeduplicator
+from src.app.infrastructure.streams.router import EventRouter
+from src.app.infrastructure.streams.serializers import encode_event, encode_events
+
+
+class StubPipeline:
+    def __init__(self, redis: StubRedis) -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, tuple]] = []
+
+    async def __aenter__(self) -> StubPipeline:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    def xadd(self, stream: str, fields: dict) -> None:
+        self._commands.append(("xadd", (stream, fields)))
+
+    def xack(self, stream: str, group: str, *ids: str) -> None:
+        self._commands.append(("xack", (stream, group, *ids)))
+
+    async def execute(self) -> list:
+        results = []
+        for name, args in self._commands:
+            results.append(await getattr(self._redis, name)(*args))
+        return results
+
+
+class StubRedis:
+    def __init__(self) -> None:
+        self.acked: list[tuple[str, str, tuple[str, ...]]] = []
+        self.added: list[tuple[str, dict]] = []
+        self.pending: list[dict] = []
+        self.entries: dict[str, dict] = {}
+
+    async def xack(self, stream: str, group: str, *ids: str) -> int:
+        self.acked.append((stream, group, ids))
+        return len(ids)
+
+    async def xadd(self, stream: str, fields: dict) -> str:
+        self.added.append((stream, fields))
+        return f"{len(self.added)}-0"
+
+    async def xpending_range(self, stream: str, group: str, **kwargs) -> list[dict]:
+        return list(self.pending)
+
+    async def xclaim(self, stream: str, group: str, consumer: str, **kwargs) -> list:
+        return [(message_id, self.entries.get(message_id)) for message_id in kwargs["message_ids"]]
+
+    def pipeline(self, transaction: bool = True) -> StubPipeline:
+        return StubPipeline(self)
+
+
+class StubClient:
+    def __init__(self) -> None:
+        self.redis = StubRedis()
+        self.raw_redis = self.redis
+
+
+def _status_event(task_id: str, current: int, state: TaskState = TaskState.RUNNING) -> TaskEvent:
+    status = TaskStatus(
+        state=state,
+        progress=TaskProgress(current=current, total=10, percentage=current / 10),
+    )
+    return TaskEvent.status(task_id, status)
+
+
+def _entries(events: list[TaskEvent]) -> list[tuple[str, dict]]:
+    return [(f"{index}-0", encode_event(event)) for index, event in enumerate(events)]
+
+
+def _consumer(
+    client: StubClient, router: EventRouter, count: int = 10, **kwargs
+) -> StreamsConsumer:
+    return StreamsConsumer(
+        client,  # type: ignore[arg-type]
+        stream="tasks:events",
+        group="api",
+        consumer_name="test",
+        router=router,
+        block_ms=10,
+        count=count,
+        reclaim_pending=False,
+        reclaim_idle_ms=1000,
+        **kwargs,
+    )
+
+
+def _acked_ids(client: StubClient) -> list[str]:
+    return [message_id for _stream, _group, ids in client.redis.acked for message_id in ids]
+
+
+async def _drain(consumer: StreamsConsumer) -> None:
+    dispatcher = asyncio.create_task(consumer._dispatch_buffered())
+    try:
+        for _ in range(100):
+            if consumer.metrics()["buffer_depth"] == 0 and not consumer._local_refs:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        dispatcher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_lanes_run_tasks_concurrently_and_keep_task_order() -> None:
+    client = StubClient()
+    router = EventRouter()
+    seen: list[tuple[str, int]] = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handle_status(event: TaskEvent) -> None:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        seen.append((event.task_id, event.payload["status"]["progress"]["current"]))
+        in_flight -= 1
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    consumer = _consumer(client, router, dispatch_concurrency=2)
+    events = [_status_event(task_id, step) for step in range(3) for task_id in ("a", "b", "c")]
+
+    await consumer._handle_entries("tasks:events", _entries(events))
+
+    assert max_in_flight == 2
+    for task_id in ("a", "b", "c"):
+        assert [step for seen_id, step in seen if seen_id == task_id] == [0, 1, 2]
+    assert sorted(_acked_ids(client)) == sorted(f"{index}-0" for index in range(9))
+
+
+@pytest.mark.asyncio
+async def test_failed_events_are_not_acknowledged() -> None:
+    client = StubClient()
+    router = EventRouter()
+
+    async def handle_status(event: TaskEvent) -> None:
+        if event.task_id == "bad":
+            raise RuntimeError("boom")
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    consumer = _consumer(client, router, dispatch_concurrency=4)
+
+    await consumer._handle_entries("tasks:events", _entries([_status_event("ok", 1), _status_event("bad", 1)]))
+
+    assert _acked_ids(client) == ["0-0"]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_acknowledged_with_one_xack() -> None:
+    client = StubClient()
+    router = EventRouter()
+
+    async def handle_status(event: TaskEvent) -> None:
+        return None
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    consumer = _consumer(client, router)
+
+    await consumer._handle_entries("tasks:events", _entries([_status_event("a", step) for step in range(5)]))
+
+    assert client.redis.acked == [
+        ("tasks:events", "api", ("0-0", "1-0", "2-0", "3-0", "4-0")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reclaim_redispatches_and_dead_letters_exhausted_entries() -> None:
+    client = StubClient()
+    router = EventRouter()
+    handled: list[str] = []
+
+    async def handle_status(event: TaskEvent) -> None:
+        handled.append(event.task_id)
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    consumer = _consumer(client, router, max_deliveries=3)
+    client.redis.entries = {
+        "1-0": encode_event(_status_event("retry", 1)),
+        "2-0": encode_event(_status_event("poison", 1)),
+    }
+    client.redis.pending = [
+        {"message_id": "1-0", "consumer": "gone", "time_since_delivered": 5000, "times_delivered": 1},
+        {"message_id": "2-0", "consumer": "gone", "time_since_delivered": 5000, "times_delivered": 3},
+    ]
+
+    await consumer._reclaim()
+    # Reclaimed entries go through the ingest buffer like freshly read ones.
+    assert handled == []
+    assert consumer.metrics()["buffer_depth"] == 1
+    await _drain(consumer)
+
+    assert handled == ["retry"]
+    assert len(client.redis.added) == 1
+    dlq_stream, dlq_fields = client.redis.added[0]
+    assert dlq_stream == "tasks:events:dlq"
+    assert dlq_fields["task_id"] == "poison"
+    assert dlq_fields["dlq_message_id"] == "2-0"
+    assert dlq_fields["dlq_deliveries"] == 3
+    assert sorted(_acked_ids(client)) == ["1-0", "2-0"]
+
+
+@pytest.mark.asyncio
+async def test_reads_pause_above_high_watermark_until_low_watermark() -> None:
+    client = StubClient()
+    router = EventRouter()
+
+    async def handle_status(event: TaskEvent) -> None:
+        return None
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    consumer = _consumer(client, router, buffer_high_watermark=4, buffer_low_watermark=1)
+    events = [_status_event("a", step) for step in range(4)]
+    consumer._buffer_response([("tasks:events", _entries(events))])
+
+    waiter = asyncio.create_task(consumer._wait_for_capacity())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    assert consumer.metrics()["paused"] == 1
+
+    dispatcher = asyncio.create_task(consumer._dispatch_buffered())
+    try:
+        await asyncio.wait_for(waiter, timeout=1)
+    finally:
+        dispatcher.cancel()
+
+    metrics = consumer.metrics()
+    assert metrics["paused"] == 0
+    assert metrics["pause_count"] == 1
+    assert metrics["buffer_depth"] == 0
+    assert metrics["paused_seconds_total"] > 0
+    assert _acked_ids(client) == ["0-0", "1-0", "2-0", "3-0"]
+
+
+@pytest.mark.asyncio
+async def test_coalescing_keeps_latest_status_transitions_and_chunks() -> None:
+    client = StubClient()
+    router = EventRouter()
+    handled: list[tuple[str, object]] = []
+
+    async def handle(event: TaskEvent) -> None:
+        if event.type == EventType.TASK_STATUS:
+            status = event.payload["status"]
+            handled.append((event.task_id, (status["state"], status["progress"]["current"])))
+        else:
+            handled.append((event.task_id, event.payload["chunk_id"]))
+
+    router.register(EventType.TASK_STATUS, handle)
+    router.register(EventType.TASK_RESULT_CHUNK, handle)
+    consumer = _consumer(client, router, coalesce_status=True)
+    events = [
+        _status_event("a", 0, TaskState.QUEUED),
+        _status_event("a", 1),
+        TaskEvent.result_chunk("a", "0", ["3"]),
+        _status_event("b", 1),
+        _status_event("a", 2),
+        TaskEvent.result_chunk("a", "1", ["1"]),
+        _status_event("a", 3),
+        _status_event("a", 3, TaskState.COMPLETED),
+        _status_event("b", 2),
+    ]
+
+    await consumer._handle_entries("tasks:events", _entries(events))
+
+    assert handled == [
+        ("a", ("QUEUED", 0)),
+        ("a", "0"),
+        ("a", "1"),
+        ("a", ("RUNNING", 3)),
+        ("a", ("COMPLETED", 3)),
+        ("b", ("RUNNING", 2)),
+    ]
+    assert sorted(_acked_ids(client)) == sorted(f"{index}-0" for index in range(9))
+    assert consumer.metrics()["status_events_coalesced_total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_redelivered_events_are_acked_without_dispatch() -> None:
+    client = StubClient()
+    router = EventRouter()
+    handled: list[str] = []
+
+    async def handle_status(event: TaskEvent) -> None:
+        handled.append(event.event_id)
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    deduplicator = EventDeduplicator(capacity=10)
+    consumer = _consumer(client, router, deduplicator=deduplicator)
+    first, second = _status_event("a", 1), _status_event("a", 2)
+
+    await consumer._handle_entries("tasks:events", _entries([first, first]))
+    await consumer._handle_entries("tasks:events", _entries([first, second]))
+
+    assert handled == [first.event_id, second.event_id]
+    assert len(_acked_ids(client)) == 4
+    metrics = deduplicator.metrics()
+    assert metrics["hits_total"] == 1
+    assert metrics["misses_total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_coalesced_events_are_marked_as_seen() -> None:
+    client = StubClient()
+    router = EventRouter()
+    handled: list[str] = []
+
+    async def handle_status(event: TaskEvent) -> None:
+        handled.append(event.event_id)
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    deduplicator = EventDeduplicator(capacity=10)
+    consumer = _consumer(client, router, coalesce_status=True, deduplicator=deduplicator)
+    first, second = _status_event("a", 1), _status_event("a", 2)
+
+    await consumer._handle_entries("tasks:events", _entries([first, second]))
+    await consumer._handle_entries("tasks:events", _entries([first]))
+
+    assert handled == [second.event_id]
+    assert await deduplicator.seen([first.event_id]) == {first.event_id}
+    assert len(_acked_ids(client)) == 3
+
+
+@pytest.mark.asyncio
+async def test_envelope_entries_are_acked_only_when_every_event_is_handled() -> None:
+    client = StubClient()
+    router = EventRouter()
+    handled: list[str] = []
+
+    async def handle_status(event: TaskEvent) -> None:
+        if event.task_id == "bad":
+            raise RuntimeError("boom")
+        handled.append(event.task_id)
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    consumer = _consumer(client, router, dispatch_concurrency=4)
+    entries = [
+        ("0-0", encode_events([_status_event("a", 1), _status_event("b", 1)])),
+        ("1-0", encode_events([_status_event("c", 1), _status_event("bad", 1)])),
+    ]
+
+    await consumer._handle_entries("tasks:events", entries)
+
+    assert sorted(handled) == ["a", "b", "c"]
+    assert _acked_ids(client) == ["0-0"]
+
+
+@pytest.mark.asyncio
+async def test_envelope_larger_than_buffer_headroom_is_buffered() -> None:
+    client = StubClient()
+    router = EventRouter()
+    consumer = _consumer(client, router, buffer_high_watermark=4, buffer_low_watermark=1)
+    envelope = encode_events([_status_event("a", step) for step in range(10)])
+
+    consumer._buffer_response([("tasks:events", [("0-0", envelope)])])
+    consumer._buffer_response([("tasks:events", [("1-0", encode_event(_status_event("b", 1)))])])
+
+    assert consumer.metrics()["buffer_depth"] == 11
+
+
+@pytest.mark.asyncio
+async def test_reclaim_skips_entries_still_buffered_locally() -> None:
+    client = StubClient()
+    router = EventRouter()
+    handled: list[str] = []
+
+    async def handle_status(event: TaskEvent) -> None:
+        handled.append(event.task_id)
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    consumer = _consumer(client, router)
+    buffered = encode_event(_status_event("slow", 1))
+    consumer._buffer_response([("tasks:events", [("1-0", buffered)])])
+    client.redis.entries = {"1-0": buffered}
+    client.redis.pending = [
+        {"message_id": "1-0", "consumer": "test", "time_since_delivered": 5000, "times_delivered": 1},
+    ]
+
+    await consumer._reclaim()
+    assert handled == []
+
+    dispatcher = asyncio.create_task(consumer._dispatch_buffered())
+    try:
+        for _ in range(100):
+            if _acked_ids(client):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        dispatcher.cancel()
+
+    assert handled == ["slow"]
+    assert _acked_ids(client) == ["1-0"]
+    assert not consumer._local_refs
+
+
+class StubLeaseManager:
+    def __init__(self, draining: list[str]) -> None:
+        self.draining_streams = draining
+        self.released: list[str] = []
+
+    async def release(self, streams: list[str]) -> None:
+        self.released.extend(streams)
+        self.draining_streams = [s for s in self.draining_streams if s not in streams]
+
+
+@pytest.mark.asyncio
+async def test_draining_shard_is_released_only_after_its_events_are_handled() -> None:
+    client = StubClient()
+    router = EventRouter()
+
+    async def handle_status(event: TaskEvent) -> None:
+        return None
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    lease_manager = StubLeaseManager(["tasks:events:1"])
+    consumer = _consumer(client, router, lease_manager=lease_manager)
+    events = [_status_event("a", step) for step in range(2)]
+    consumer._buffer_response([("tasks:events:1", _entries(events))])
+
+    await consumer._release_drained()
+    assert lease_manager.released == []
+
+    dispatcher = asyncio.create_task(consumer._dispatch_buffered())
+    try:
+        for _ in range(100):
+            if len(_acked_ids(client)) == 2:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        dispatcher.cancel()
+
+    await consumer._release_drained()
+    assert lease_manager.released == ["tasks:events:1"]
+
+
+@pytest.mark.asyncio
+async def test_envelope_split_across_batches_is_acked_only_after_its_last_event() -> None:
+    client = StubClient()
+    router = EventRouter()
+    handled: list[int] = []
+
+    async def handle_status(event: TaskEvent) -> None:
+        step = event.payload["status"]["progress"]["current"]
+        if event.task_id == "bad" and step == 6:
+            raise RuntimeError("boom")
+        handled.append(step)
+
+    router.register(EventType.TASK_STATUS, handle_status)
+    consumer = _consumer(client, router, count=5)
+    consumer._buffer_response(
+        [
+            (
+                "tasks:events",
+                [
+                    ("0-0", encode_events([_status_event("good", step) for step in range(8)])),
+                    ("1-0", encode_events([_status_event("bad", step) for step in range(8)])),
+                ],
+            )
+        ]
+    )
+
+    await _drain(consumer)
+
+    assert len(handled) == 15
+    assert _acked_ids(client) == ["0-0"]
+    assert not consumer._failed_refs
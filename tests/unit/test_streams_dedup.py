@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from src.app.infrastructure.streams.dedup import DEDUP_KEY_PREFIX, EventDeduplicator
+
+
+class StubPipeline:
+    def __init__(self, values: dict[str, object]) -> None:
+        self._values = values
+
+    async def __aenter__(self) -> StubPipeline:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    def set(self, key: str, value: object, ex: int | None = None) -> None:
+        self._values[key] = value
+
+    async def execute(self) -> list:
+        return []
+
+
+class StubRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, object] = {}
+
+    async def mget(self, keys: list[str]) -> list[object | None]:
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> StubPipeline:
+        return StubPipeline(self.values)
+
+
+@pytest.mark.asyncio
+async def test_local_window_evicts_least_recently_seen_ids() -> None:
+    deduplicator = EventDeduplicator(capacity=2)
+
+    await deduplicator.mark(["a", "b"])
+    assert await deduplicator.seen(["a"]) == {"a"}
+    await deduplicator.mark(["c"])
+
+    assert await deduplicator.seen(["a", "b", "c"]) == {"a", "c"}
+
+
+@pytest.mark.asyncio
+async def test_shared_window_is_visible_to_other_replicas() -> None:
+    redis = StubRedis()
+    first = EventDeduplicator(capacity=10, redis=redis)  # type: ignore[arg-type]
+    second = EventDeduplicator(capacity=10, redis=redis)  # type: ignore[arg-type]
+
+    await first.mark(["event-1"])
+
+    assert f"{DEDUP_KEY_PREFIX}event-1" in redis.values
+    assert await second.seen(["event-1", "event-2"]) == {"event-1"}
+    assert second.metrics()["hits_total"] == 1
+    assert second.metrics()["misses_total"] == 1
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from src.app.domain.events.task_event import TaskEvent
+from src.app.infrastructure.streams.outbox import OutboxStreamsPublisher
+
+
+class FlakyPublisher:
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.batches: list[list[TaskEvent]] = []
+        self.closed = False
+
+    def publish(self, events: list[TaskEvent]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("redis unavailable")
+        self.batches.append(list(events))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _chunks(count: int) -> list[TaskEvent]:
+    return [TaskEvent.result_chunk("task-1", str(index), [index], seq=index) for index in range(count)]
+
+
+def _sent(inner: FlakyPublisher) -> list[TaskEvent]:
+    return [event for batch in inner.batches for event in batch]
+
+
+def test_events_drain_in_order_after_redis_failures(tmp_path: Path) -> None:
+    inner = FlakyPublisher(failures=2)
+    outbox = OutboxStreamsPublisher(
+        inner,  # type: ignore[arg-type]
+        directory=str(tmp_path),
+        segment_bytes=128,
+        max_bytes=4096,
+        batch_size=3,
+        linger_ms=1,
+        retry_ms=1,
+    )
+    events = _chunks(10)
+
+    for event in events:
+        outbox.publish(event)
+    assert outbox.flush(timeout=5) is True
+
+    sent = _sent(inner)
+    assert [event.event_id for event in sent] == [event.event_id for event in events]
+    assert [event.seq for event in sent] == list(range(10))
+    assert all(len(batch) <= 3 for batch in inner.batches)
+    outbox.close(timeout=5)
+    assert inner.closed is True
+    # Only the last, still active segment may remain, and it was fully drained.
+    assert len(list(tmp_path.iterdir())) <= 1
+
+
+def test_undrained_segments_of_a_dead_process_are_adopted(tmp_path: Path) -> None:
+    # A short-lived child process plays the crashed worker: its pid is gone once it exits.
+    child = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        check=True,
+    )
+    dead_pid = int(child.stdout)
+    stalled = FlakyPublisher(failures=10**6)
+    writer = OutboxStreamsPublisher(
+        stalled,  # type: ignore[arg-type]
+        directory=str(tmp_path),
+        linger_ms=1,
+        retry_ms=10_000,
+    )
+    events = _chunks(4)
+    writer.publish(events)
+    writer.close(timeout=0.05)
+    (segment,) = tmp_path.iterdir()
+    segment.rename(tmp_path / f"{dead_pid}-00000000.seg")
+    # Simulate a crash in the middle of appending one more record.
+    with open(tmp_path / f"{dead_pid}-00000000.seg", "ab") as handle:
+        handle.write(b"\x00\x00\x01")
+
+    inner = FlakyPublisher()
+    outbox = OutboxStreamsPublisher(
+        inner,  # type: ignore[arg-type]
+        directory=str(tmp_path),
+        linger_ms=1,
+    )
+    outbox.publish(TaskEvent.result_chunk("task-1", "last", [4], is_last=True))
+    assert outbox.flush(timeout=5) is True
+
+    sent = _sent(inner)
+    assert [event.event_id for event in sent[:4]] == [event.event_id for event in events]
+    assert sent[4].payload["is_last"] is True
+    assert not any(name.startswith(f"{dead_pid}-") for name in os.listdir(tmp_path))
+    outbox.close(timeout=5)
+
+
+def test_sync_makes_events_durable_without_waiting_for_redis(tmp_path: Path) -> None:
+    inner = FlakyPublisher(failures=10**6)
+    outbox = OutboxStreamsPublisher(
+        inner,  # type: ignore[arg-type]
+        directory=str(tmp_path),
+        segment_bytes=4096,
+        max_bytes=65536,
+        batch_size=3,
+        linger_ms=1,
+        retry_ms=1,
+    )
+    events = _chunks(3)
+    for event in events:
+        outbox.publish(event)
+
+    outbox.sync()
+
+    assert inner.batches == []
+    stored = b"".join(path.read_bytes() for path in tmp_path.iterdir())
+    assert all(event.event_id.encode() in stored for event in events)
+    assert outbox.flush(timeout=0.05) is False
+    inner.failures = 0
+    outbox.close(timeout=5)
+    assert [event.event_id for event in _sent(inner)] == [event.event_id for event in events]
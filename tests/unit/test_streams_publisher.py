@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from src.app.domain.events.task_event import TaskEvent
+from src.app.infrastructure.streams.publisher import StreamsSyncPublisher
+from src.app.infrastructure.streams.serializers import decode_events
+
+
+class StubSyncPipeline:
+    def __init__(self, redis: StubSyncRedis) -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, dict]] = []
+
+    def __enter__(self) -> StubSyncPipeline:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def xadd(self, stream: str, fields: dict, **kwargs) -> None:
+        self._commands.append((stream, fields))
+
+    def execute(self) -> list:
+        self._redis.round_trips += 1
+        self._redis.added.extend(self._commands)
+        return [f"{index}-0" for index, _ in enumerate(self._commands)]
+
+
+class StubSyncRedis:
+    def __init__(self) -> None:
+        self.added: list[tuple[str, dict]] = []
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> StubSyncPipeline:
+        return StubSyncPipeline(self)
+
+
+class StubSyncClient:
+    def __init__(self) -> None:
+        self.redis = StubSyncRedis()
+
+
+def _chunks(task_id: str, count: int) -> list[TaskEvent]:
+    return [TaskEvent.result_chunk(task_id, str(index), [index]) for index in range(count)]
+
+
+def test_batch_is_sent_in_one_round_trip() -> None:
+    client = StubSyncClient()
+    publisher = StreamsSyncPublisher(client, "tasks:events")  # type: ignore[arg-type]
+
+    publisher.publish(_chunks("task-1", 5))
+
+    assert client.redis.round_trips == 1
+    assert len(client.redis.added) == 5
+
+
+def test_envelopes_pack_events_per_stream_in_order() -> None:
+    client = StubSyncClient()
+    publisher = StreamsSyncPublisher(
+        client,  # type: ignore[arg-type]
+        "tasks:events",
+        envelope_size=4,
+    )
+    events = _chunks("task-1", 6)
+
+    publisher.publish(events)
+
+    assert client.redis.round_trips == 1
+    assert len(client.redis.added) == 2
+    unpacked = [event for _stream, fields in client.redis.added for event in decode_events(fields)]
+    assert [event.event_id for event in unpacked] == [event.event_id for event in events]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from src.app.infrastructure.streams.retention import StreamRetention
+
+
+class StubRedis:
+    def __init__(self, groups: list[dict], pending_min: dict[str, str]) -> None:
+        self._groups = groups
+        self._pending_min = pending_min
+        self.trims: list[tuple[str, str]] = []
+
+    async def xinfo_groups(self, stream: str) -> list[dict]:
+        return self._groups
+
+    async def xpending(self, stream: str, group: str) -> dict:
+        return {"pending": 1, "min": self._pending_min[group], "max": self._pending_min[group]}
+
+    async def xtrim(self, stream: str, minid: str, approximate: bool) -> int:
+        self.trims.append((stream, minid))
+        return 7
+
+    async def xlen(self, stream: str) -> int:
+        return 3
+
+    async def memory_usage(self, stream: str) -> int:
+        return 2048
+
+
+class StubClient:
+    def __init__(self, redis: StubRedis) -> None:
+        self.redis = redis
+
+
+@pytest.mark.asyncio
+async def test_trims_to_oldest_entry_still_needed_by_any_group() -> None:
+    redis = StubRedis(
+        groups=[
+            {"name": "api", "pending": 2, "last-delivered-id": "1700-9"},
+            {"name": "audit", "pending": 0, "last-delivered-id": "1500-2"},
+            {"name": "idle", "pending": 1, "last-delivered-id": "1900-0"},
+        ],
+        pending_min={"api": "1600-0", "idle": "1500-10"},
+    )
+    retention = StreamRetention(
+        StubClient(redis),  # type: ignore[arg-type]
+        streams=["tasks:events:0", "tasks:events:1"],
+        interval_ms=1000,
+    )
+
+    await retention.trim_once()
+
+    assert redis.trims == [("tasks:events:0", "1500-2"), ("tasks:events:1", "1500-2")]
+    metrics = retention.metrics()
+    assert metrics["trimmed_entries_total"] == 14
+    assert metrics["stream_length"] == 6
+    assert metrics["stream_memory_bytes"] == 4096
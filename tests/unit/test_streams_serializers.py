@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pytest
+
+from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.infrastructure.streams.serializers import (
+    CODEC_JSON,
+    CODEC_MSGPACK,
+    decode_event,
+    encode_event,
+)
+
+
+def _event() -> TaskEvent:
+    status = TaskStatus(
+        state=TaskState.RUNNING,
+        progress=TaskProgress(current=3, total=10, percentage=0.3),
+    )
+    return TaskEvent.status("task-1", status, seq=42)
+
+
+def _as_raw(fields: dict) -> dict[bytes, bytes]:
+    """Mimic what a non-decoding Redis client returns for an entry."""
+    return {
+        key.encode(): value if isinstance(value, bytes) else str(value).encode()
+        for key, value in fields.items()
+    }
+
+
+@pytest.mark.parametrize("version", [CODEC_JSON, CODEC_MSGPACK])
+def test_codecs_round_trip_raw_stream_fields(version: int) -> None:
+    event = _event()
+
+    decoded = decode_event(_as_raw(encode_event(event, version)))
+
+    assert decoded.version == version
+    assert decoded.model_dump(exclude={"version"}) == event.model_dump(exclude={"version"})
+
+
+def test_mixed_and_legacy_entries_decode() -> None:
+    event = _event()
+    legacy = encode_event(event, CODEC_JSON)
+    legacy.pop("version")
+
+    decoded = [
+        decode_event(fields)
+        for fields in (legacy, _as_raw(encode_event(event, CODEC_MSGPACK)))
+    ]
+
+    assert [item.event_id for item in decoded] == [event.event_id, event.event_id]
+
+
+def test_unknown_codec_version_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        decode_event({"version": "99", "data": b""})
+
+
+@pytest.mark.parametrize("version", [CODEC_JSON, CODEC_MSGPACK])
+def test_trusted_decode_matches_validated_decode(version: int) -> None:
+    fields = _as_raw(encode_event(_event(), version))
+
+    assert decode_event(fields, trusted=True).model_dump() == decode_event(fields).model_dump()
+
+
+@pytest.mark.parametrize("version", [CODEC_JSON, CODEC_MSGPACK])
+def test_large_bodies_are_compressed_and_flagged(version: int) -> None:
+    event = TaskEvent.result("task-1", {"data": {"pi": "3." + "1415926535" * 200}}, seq=7)
+    small = TaskEvent.result("task-1", {"data": {"pi": "3.14"}}, seq=8)
+
+    fields = encode_event(event, version, compress_threshold=256)
+    small_fields = encode_event(small, version, compress_threshold=256)
+
+    assert fields["compression"] == "zlib"
+    assert "compression" not in small_fields
+    assert decode_event(_as_raw(fields)).payload == event.payload
+
+
+@pytest.mark.parametrize("version", [CODEC_JSON, CODEC_MSGPACK])
+def test_binary_chunks_travel_as_raw_bytes(version: int) -> None:
+    data = bytes(range(256)) * 4
+    event = TaskEvent.result_chunk("task-1", "0", data, seq=9)
+
+    fields = encode_event(event, version)
+    decoded = decode_event(_as_raw(fields))
+
+    assert event.payload == {
+        "chunk_id": "0",
+        "data": None,
+        "is_last": False,
+        "encoding": "binary",
+        "size": len(data),
+    }
+    if version == CODEC_JSON:
+        assert fields["binary"] == data
+    assert decoded.binary == data
+    assert decoded.payload == event.payload
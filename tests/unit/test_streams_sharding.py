@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+
+from src.app.infrastructure.streams.sharding import (
+    ShardLeaseManager,
+    shard_index,
+    shard_streams,
+    stream_for_task,
+)
+
+
+class StubLeaseRedis:
+    """In-memory subset of Redis used by the lease manager (no expiry)."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.members: dict[str, dict[str, float]] = {}
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        self.members.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zremrangebyscore(self, key: str, low: str, high: float) -> int:
+        members = self.members.get(key, {})
+        expired = [member for member, score in members.items() if score <= high]
+        for member in expired:
+            members.pop(member)
+        return len(expired)
+
+    async def zcard(self, key: str) -> int:
+        return len(self.members.get(key, {}))
+
+    async def zrem(self, key: str, member: str) -> int:
+        return 1 if self.members.get(key, {}).pop(member, None) is not None else 0
+
+    async def set(self, key: str, value: str, nx: bool = False, px: int | None = None) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def eval(self, script: str, numkeys: int, key: str, owner: str, *args) -> int:
+        if self.values.get(key) != owner:
+            return 0
+        if "del" in script:
+            self.values.pop(key)
+        return 1
+
+
+def test_tasks_map_to_stable_shard_streams() -> None:
+    assert shard_streams("tasks:events", 1) == ["tasks:events"]
+    assert shard_streams("tasks:events", 3) == ["tasks:events:0", "tasks:events:1", "tasks:events:2"]
+    assert stream_for_task("tasks:events", "task-1", 1) == "tasks:events"
+    index = shard_index("task-1", 4)
+    assert stream_for_task("tasks:events", "task-1", 4) == f"tasks:events:{index}"
+    assert all(shard_index("task-1", 4) == index for _ in range(3))
+
+
+@pytest.mark.asyncio
+async def test_replicas_split_shards_without_overlap() -> None:
+    redis = StubLeaseRedis()
+    first = ShardLeaseManager(redis, stream="s", shards=4, owner="a", lease_ms=1000)  # type: ignore[arg-type]
+    second = ShardLeaseManager(redis, stream="s", shards=4, owner="b", lease_ms=1000)  # type: ignore[arg-type]
+
+    assert await first.refresh() == ["s:0", "s:1", "s:2", "s:3"]
+
+    # The newcomer gets nothing until the first replica drained and released its surplus.
+    assert await second.refresh() == []
+    assert await first.refresh() == ["s:0", "s:1"]
+    assert first.draining_streams == ["s:2", "s:3"]
+    assert await second.refresh() == []
+    await first.release(["s:3"])
+    assert await second.refresh() == ["s:3"]
+    await first.release(first.draining_streams)
+    assert await second.refresh() == ["s:2", "s:3"]
+
+    await first.release_all()
+    assert await second.refresh() == ["s:0", "s:1", "s:2", "s:3"]
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.worker.reporter import TaskReporter
+
+
+class RecordingPublisher:
+    def __init__(self) -> None:
+        self.events: list[TaskEvent] = []
+
+    def publish(self, events: TaskEvent | list[TaskEvent]) -> None:
+        self.events.extend([events] if isinstance(events, TaskEvent) else events)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        return True
+
+
+class FailingOncePublisher(RecordingPublisher):
+    def __init__(self) -> None:
+        super().__init__()
+        self.failed = threading.Event()
+
+    def publish(self, events: TaskEvent | list[TaskEvent]) -> None:
+        if not self.failed.is_set():
+            self.failed.set()
+            raise ConnectionError("redis unavailable")
+        super().publish(events)
+
+
+def _status(state: TaskState, percentage: float) -> TaskStatus:
+    return TaskStatus(state=state, progress=TaskProgress(percentage=percentage))
+
+
+def test_status_reports_are_throttled_but_key_updates_always_sent() -> None:
+    publisher = RecordingPublisher()
+    reporter = TaskReporter(
+        "task-1",
+        publisher,  # type: ignore[arg-type]
+        status_interval_s=60.0,
+        status_delta=0.1,
+    )
+
+    reporter.report_status(_status(TaskState.QUEUED, 0.0))
+    reporter.report_status(_status(TaskState.RUNNING, 0.01))
+    for step in range(2, 50):
+        reporter.report_status(_status(TaskState.RUNNING, step / 100))
+    reporter.report_status(_status(TaskState.COMPLETED, 1.0))
+
+    states = [event.payload["status"]["state"] for event in publisher.events]
+    assert states == ["QUEUED", "RUNNING", "COMPLETED"]
+    assert reporter.suppressed_statuses == 48
+    seqs = [event.seq for event in publisher.events]
+    assert seqs == sorted(seqs)
+
+
+def test_result_chunks_flush_on_count_and_size() -> None:
+    publisher = RecordingPublisher()
+    reporter = TaskReporter("task-1", publisher)  # type: ignore[arg-type]
+
+    with reporter.report_result_chunk(batch_size=3, max_bytes=20) as chunks:
+        chunks.extend(["a", "b", "c", "d"])
+        # "x" * 16 serializes to 18 bytes and fits in no chunk with another item.
+        chunks.emit("x" * 16)
+        chunks.emit("e")
+        chunks.emit("f")
+
+    data = [event.payload["data"] for event in publisher.events]
+    assert data == [["a", "b", "c"], ["d"], ["x" * 16], ["e", "f"]]
+    assert [event.payload["is_last"] for event in publisher.events] == [False] * 3 + [True]
+    assert [event.payload["chunk_id"] for event in publisher.events] == ["0", "1", "2", "3"]
+
+
+def test_lingering_chunk_is_published_without_another_item() -> None:
+    publisher = RecordingPublisher()
+    reporter = TaskReporter("task-1", publisher)  # type: ignore[arg-type]
+
+    with reporter.report_result_chunk(batch_size=100, linger_s=0.05) as chunks:
+        chunks.emit("a")
+        deadline = time.monotonic() + 5
+        while not publisher.events and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [event.payload["data"] for event in publisher.events] == [["a"]]
+        assert publisher.events[0].payload["is_last"] is False
+
+    assert [event.payload["is_last"] for event in publisher.events] == [False, True]
+
+
+def test_binary_chunks_follow_pending_items() -> None:
+    publisher = RecordingPublisher()
+    reporter = TaskReporter("task-1", publisher)  # type: ignore[arg-type]
+
+    with reporter.report_result_chunk(batch_size=10) as chunks:
+        chunks.emit("a")
+        chunks.emit_bytes(b"\x00\xff")
+
+    first, binary, last = publisher.events
+    assert first.payload["data"] == ["a"]
+    assert binary.binary == b"\x00\xff"
+    assert binary.payload["data"] is None
+    assert binary.payload["encoding"] == "binary"
+    assert binary.payload["size"] == 2
+    assert [event.payload["chunk_id"] for event in publisher.events] == ["0", "1", "2"]
+    assert last.payload["is_last"] is True
+
+
+def test_lingering_chunk_that_failed_to_publish_goes_out_with_the_next_one() -> None:
+    publisher = FailingOncePublisher()
+    reporter = TaskReporter("task-1", publisher)  # type: ignore[arg-type]
+
+    with reporter.report_result_chunk(batch_size=100, linger_s=0.01) as chunks:
+        chunks.emit("a")
+        assert publisher.failed.wait(timeout=5)
+        with chunks._cond:
+            assert publisher.events == []
+
+    assert [event.payload["data"] for event in publisher.events] == [["a"], []]
+    seqs = [event.seq for event in publisher.events]
+    assert seqs == sorted(seqs)